@@ -747,8 +747,8 @@ ipcMain.handle('settings:testWatch', async (event, macAddress) => {
     const { spawn } = require('child_process');
 
     return new Promise((resolve) => {
-        // watch-send.py 파일 실행
-        const scriptPath = path.join(__dirname, 'watch-send.py');
+        // watch-send.py(.pyc) 파일 실행
+        const scriptPath = watchNotifier.getScriptPath();
 
         const python = spawn('python', [
             scriptPath,
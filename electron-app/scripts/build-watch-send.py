@@ -0,0 +1,61 @@
+"""
+watch-send.py 미리 컴파일
+- 기본: watch-send.pyc (python watch-send.pyc ... 로 바로 실행, 매번 소스 컴파일 안 함)
+- --zipapp: watch-send.pyz (파일 하나로 배포할 때, zipimport 비용이 조금 더 듦)
+- watch-notifier.js는 watch-send.pyc가 있고 소스 해시(watch-send.pyc.sha256)가
+  지금 watch-send.py와 같을 때만 .pyc 실행 (빌드 후 소스를 고치면 .py로 돌아감, watch-script.js)
+  (.pyc는 빌드한 Python 버전에서만 동작하므로 배포 PC의 Python으로 빌드할 것)
+
+사용법: python scripts/build-watch-send.py [--zipapp]
+"""
+import argparse
+import hashlib
+import os
+import py_compile
+import tempfile
+import zipapp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "watch-send.py")
+
+MANIFEST_SUFFIX = ".sha256"  # watch-script.js와 같은 이름 규칙
+
+ZIPAPP_MAIN = "import sys\nimport watch_send\nsys.exit(watch_send.main(sys.argv[1:]))\n"
+
+
+def source_hash() -> str:
+    with open(SOURCE, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def compile_pyc(target: str):
+    # .pyc를 직접 실행하면 Python은 소스와 비교하지 않음 (CHECKED_HASH도 마찬가지)
+    # -> 소스 비교는 실행하는 쪽에서 manifest로
+    py_compile.compile(SOURCE, cfile=target, doraise=True,
+                       invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+
+
+def build_pyc() -> str:
+    target = os.path.join(ROOT, "watch-send.pyc")
+    compile_pyc(target)
+    with open(target + MANIFEST_SUFFIX, "w", encoding="utf-8") as f:
+        f.write(source_hash() + "\n")
+    return target
+
+
+def build_zipapp() -> str:
+    target = os.path.join(ROOT, "watch-send.pyz")
+    with tempfile.TemporaryDirectory() as tmp:
+        compile_pyc(os.path.join(tmp, "watch_send.pyc"))  # 모듈 이름에는 '-' 불가
+        with open(os.path.join(tmp, "__main__.py"), "w", encoding="utf-8") as f:
+            f.write(ZIPAPP_MAIN)
+        zipapp.create_archive(tmp, target)
+    return target
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="watch-send.py 미리 컴파일")
+    parser.add_argument("--zipapp", action="store_true", help="watch-send.pyz 생성")
+    args = parser.parse_args()
+
+    print(f"✅ {build_zipapp() if args.zipapp else build_pyc()}")
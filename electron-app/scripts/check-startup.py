@@ -0,0 +1,134 @@
+"""
+watch-send.py 시작 시간 예산 검사 (CI용)
+- Electron이 실제로 실행하는 경로로 측정: --dedup-key <키> <MAC> <메시지>
+  가짜 런타임 소켓(P5S_RUNTIME)을 열어 두고 보내므로 BLE 없이 끝까지 실행됨
+  (인자 파싱 -> 중복 방지 sqlite -> 런타임 요청, asyncio/bleak 없이)
+- python -X importtime 기준 스크립트가 끌어오는 import 시간 합 (인터프리터 기본 import 제외)
+  + 전체 실행 시간에서 빈 인터프리터(python -c pass) 시간을 뺀 값
+- 실패 (exit 1): import 예산 초과 / 실행 예산 초과 / bleak 등 BLE 백엔드가 import됨
+  / 측정된 import가 없음 (측정 경로가 잘못된 것 -> 통과로 치지 않음)
+- --dry-run(패킷만 출력) 경로는 asyncio까지 import되면 안 됨
+- 기본 예산은 느린 CI에서도 흔들리지 않을 만큼 (sqlite3/json/socket만 ~60ms),
+  asyncio(+130ms)나 bleak이 전송 경로에 끼면 넘음
+
+사용법: python scripts/check-startup.py [--budget-ms 100] [--wall-budget-ms 200] [--runs 5] [--target watch-send.pyc]
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 런타임 경유 전송 전에는 import되면 안 되는 모듈
+FORBIDDEN_SEND = ("bleak", "dbus_fast", "winrt")
+# 패킷만 만드는 --dry-run은 asyncio도 안 됨
+FORBIDDEN_DRY_RUN = ("bleak", "asyncio", "dbus_fast")
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+ADDRESS = "00:00:00:00:00:00"
+
+
+class FakeRuntime:
+    """timer_runtime 제어 소켓 흉내: 요청 한 줄마다 {"ok": true}"""
+
+    def __init__(self):
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.endpoint = "127.0.0.1:%d" % self.server.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            with conn, conn.makefile("rb") as reader:
+                if reader.readline():
+                    conn.sendall(json.dumps({"ok": True}).encode("utf-8") + b"\n")
+
+    def close(self):
+        self.server.close()
+
+
+def parse_imports(stderr: str) -> tuple[float, list[str]]:
+    """-X importtime 출력 -> (site 이후 최상위 import 누적 ms, import된 모듈 전체)"""
+    modules, script_us, after_site = [], 0, False
+    for line in stderr.splitlines():
+        m = IMPORT_LINE.match(line)
+        if not m:
+            continue
+        cumulative, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        modules.append(name)
+        if indent == 1 and name == "site":
+            after_site = True  # 여기까지는 인터프리터 기본 비용
+        elif after_site and indent == 1:
+            script_us += cumulative
+    return script_us / 1000, modules
+
+
+def run(cmd: list[str], env: dict) -> tuple[float, subprocess.CompletedProcess]:
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", env=env)
+    return (time.perf_counter() - start) * 1000, proc
+
+
+def measure(target: str, env: dict, args: list[str]) -> tuple[float, float, list[str]]:
+    """(스크립트 import ms, 전체 실행 ms, import된 모듈 목록)"""
+    wall_ms, proc = run([sys.executable, "-X", "importtime", target, *args], env)
+    if proc.returncode != 0 or "OK" not in proc.stdout:
+        sys.exit(f"실행 실패: {proc.stdout}{proc.stderr[-2000:]}")
+    import_ms, modules = parse_imports(proc.stderr)
+    return import_ms, wall_ms, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="watch-send.py 시작 시간 예산 검사")
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get("WATCH_SEND_IMPORT_BUDGET_MS", 100)),
+                        help="전송 경로 import 시간 예산")
+    parser.add_argument("--wall-budget-ms", type=float,
+                        default=float(os.environ.get("WATCH_SEND_WALL_BUDGET_MS", 200)),
+                        help="빈 인터프리터 대비 추가 실행 시간 예산")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", default=os.path.join(ROOT, "watch-send.py"))
+    args = parser.parse_args()
+
+    runtime = FakeRuntime()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "P5S_RUNTIME": runtime.endpoint, "P5S_DEDUP": os.path.join(tmp, "dedup.sqlite3"),
+               "P5S_CAPTURE": "off", "P5S_GATT_CACHE": "off", "PYTHONDONTWRITEBYTECODE": "1"}
+        send = [measure(args.target, env, ["--dedup-key", f"startup-{i}", ADDRESS, "시작 시간 테스트"])
+                for i in range(args.runs)]
+        dry = measure(args.target, env, ["--dry-run", ADDRESS, "시작 시간 테스트"])
+        baseline = statistics.median(run([sys.executable, "-c", "pass"], env)[0] for _ in range(args.runs))
+    runtime.close()
+
+    import_ms = statistics.median(r[0] for r in send)
+    extra_ms = statistics.median(r[1] for r in send) - baseline
+    loaded = {name.split('.')[0] for name in send[0][2]}
+    dry_loaded = {name.split('.')[0] for name in dry[2]}
+
+    print(f"전송 경로 import: {import_ms:.1f}ms (예산 {args.budget_ms:.0f}ms) / "
+          f"실행: 빈 인터프리터 +{extra_ms:.0f}ms (예산 {args.wall_budget_ms:.0f}ms)")
+    if import_ms <= 0:
+        sys.exit("❌ 전송 경로에서 측정된 import가 없음 - 측정 경로가 잘못됨")
+    bad = sorted(loaded & set(FORBIDDEN_SEND))
+    if bad:
+        sys.exit(f"❌ 런타임 경유 전송에 BLE 모듈이 import됨: {', '.join(bad)}")
+    bad = sorted(dry_loaded & set(FORBIDDEN_DRY_RUN))
+    if bad:
+        sys.exit(f"❌ --dry-run에서 무거운 모듈이 import됨: {', '.join(bad)}")
+    if import_ms > args.budget_ms:
+        sys.exit(f"❌ import 예산 초과: {import_ms:.1f}ms > {args.budget_ms:.0f}ms")
+    if extra_ms > args.wall_budget_ms:
+        sys.exit(f"❌ 실행 시간 예산 초과: +{extra_ms:.0f}ms > {args.wall_budget_ms:.0f}ms")
+    print("✅ 시작 시간 예산 통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""scripts/check-startup.py: 실제 전송 경로를 재고, 예산을 넘으면 실제로 실패하는지"""
+import importlib.util
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHECK = os.path.join(ROOT, "scripts", "check-startup.py")
+
+
+def _load():
+    spec = importlib.util.spec_from_file_location("check_startup", CHECK)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def check(*args: str) -> subprocess.CompletedProcess:
+    env = {k: v for k, v in os.environ.items() if not k.startswith("WATCH_SEND_")}
+    return subprocess.run([sys.executable, CHECK, "--runs", "1", *args], capture_output=True, text=True,
+                          encoding="utf-8", env=env)
+
+
+def test_generous_budget_passes():
+    result = check("--budget-ms", "100000", "--wall-budget-ms", "100000")
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "예산 통과" in result.stdout
+
+
+def test_import_budget_can_fail():
+    result = check("--budget-ms", "0.001", "--wall-budget-ms", "100000")
+    assert result.returncode == 1
+    assert "import 예산 초과" in result.stderr
+
+
+def test_wall_budget_can_fail():
+    result = check("--budget-ms", "100000", "--wall-budget-ms", "-1000")
+    assert result.returncode == 1
+    assert "실행 시간 예산 초과" in result.stderr
+
+
+def test_parse_imports_counts_only_after_site():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       500 |        500 |   _io",
+        "import time:       900 |       2000 | site",
+        "import time:      1000 |       3000 | sqlite3",
+        "import time:       400 |       1500 |   sqlite3.dbapi2",
+        "import time:       700 |        700 | json",
+    ])
+    ms, modules = _load().parse_imports(stderr)
+    assert ms == 3.7
+    assert modules == ["_io", "site", "sqlite3", "sqlite3.dbapi2", "json"]
+
+
+def test_default_budget_catches_eager_asyncio(tmp_path):
+    """기본 예산 그대로: 전송 경로에서 asyncio를 미리 import하는 스크립트는 실패"""
+    target = tmp_path / "eager-send.py"
+    target.write_text("import sys\nif '--dry-run' not in sys.argv:\n    import asyncio\nprint('OK')\n",
+                      encoding="utf-8")
+    result = check("--target", str(target))
+    assert result.returncode == 1
+    assert "예산 초과" in result.stderr
@@ -0,0 +1,50 @@
+"""watch-notifier.js: 몰린 알림은 sendBatch 한 번으로, 하나면 그냥 전송 (electron은 가짜로)"""
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NODE = shutil.which("node")
+
+pytestmark = pytest.mark.skipif(NODE is None, reason="node 없음")
+
+SCRIPT = r"""
+const Module = require('module');
+const load = Module._load;
+Module._load = function (request, ...rest) {
+    return request === 'electron' ? { app: { isPackaged: false } } : load.call(this, request, ...rest);
+};
+const watch = require(process.argv[1]);
+watch.updateConfig({ enabled: true, macAddress: 'AA:BB:CC:DD:EE:FF' });
+const calls = [];
+watch.sendNotification = async (message, dedupKey) => {
+    calls.push({ single: message, dedupKey });
+    return { success: true };
+};
+watch.sendBatch = async (items) => {
+    calls.push({ batch: items.map(i => i.message), keys: items.map(i => i.dedupKey) });
+    return { success: false, results: [{ id: 0, status: 'ok' }, { id: 1, status: 'skipped' },
+                                        { id: 2, status: 'error', error: 'write failed' }] };
+};
+(async () => {
+    const burst = await Promise.all([watch.notifyWarning('a'), watch.notifyWarning('b'), watch.notifyOvertime('c')]);
+    const alone = await watch.notifyWarning('d');
+    console.log(JSON.stringify({ burst, alone, calls }));
+})();
+"""
+
+
+def test_burst_goes_through_one_batch():
+    out = subprocess.run([NODE, "-e", SCRIPT, os.path.join(ROOT, "watch-notifier.js")], check=True,
+                         capture_output=True, text=True, encoding="utf-8").stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    assert result["calls"][0] == {"batch": ["a 5분 전!", "b 5분 전!", "c 수업 종료!"],
+                                  "keys": ["msg:AA:BB:CC:DD:EE:FF:a 5분 전!", "msg:AA:BB:CC:DD:EE:FF:b 5분 전!",
+                                           "msg:AA:BB:CC:DD:EE:FF:c 수업 종료!"]}
+    assert result["burst"] == [{"success": True}, {"success": True, "skipped": True},
+                               {"success": False, "error": "write failed"}]
+    assert result["calls"][1] == {"single": "d 5분 전!", "dedupKey": "msg:AA:BB:CC:DD:EE:FF:d 5분 전!"}
+    assert result["alone"] == {"success": True}
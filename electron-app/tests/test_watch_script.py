@@ -0,0 +1,71 @@
+"""미리 컴파일한 watch-send.pyc가 소스보다 오래되면 watch-script.js가 .py로 돌아가는지"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NODE = shutil.which("node")
+
+
+@pytest.fixture
+def app_dir(tmp_path):
+    """watch-send.py + 빌드 스크립트 복사본 (실제 폴더의 .pyc는 건드리지 않음)"""
+    shutil.copy(os.path.join(ROOT, "watch-send.py"), tmp_path)
+    shutil.copy(os.path.join(ROOT, "watch-script.js"), tmp_path)
+    (tmp_path / "scripts").mkdir()
+    shutil.copy(os.path.join(ROOT, "scripts", "build-watch-send.py"), tmp_path / "scripts")
+    return tmp_path
+
+
+def build(app_dir):
+    subprocess.run([sys.executable, str(app_dir / "scripts" / "build-watch-send.py")], check=True,
+                   capture_output=True)
+
+
+def resolve(app_dir) -> dict:
+    script = "console.log(JSON.stringify(require(process.argv[1]).resolveScriptPath(process.argv[2])))"
+    out = subprocess.run([NODE, "-e", script, str(app_dir / "watch-script.js"), str(app_dir)],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def dry_run(path: str) -> str:
+    return subprocess.run([sys.executable, path, "--dry-run", "00:00:00:00:00:00", "테스트"],
+                          check=True, capture_output=True, text=True, encoding="utf-8").stdout
+
+
+pytestmark = pytest.mark.skipif(NODE is None, reason="node 없음")
+
+
+def test_fresh_pyc_is_used(app_dir):
+    build(app_dir)
+    assert (app_dir / "watch-send.pyc.sha256").exists()
+    assert resolve(app_dir) == {"path": str(app_dir / "watch-send.pyc"), "stale": False}
+
+
+def test_edited_source_falls_back_to_py(app_dir):
+    build(app_dir)
+    source = app_dir / "watch-send.py"
+    edited = source.read_text(encoding="utf-8").replace('print("OK")\n        return 0',
+                                                            'print("OK-EDITED")\n        return 0')
+    assert edited != source.read_text(encoding="utf-8")
+    source.write_text(edited, encoding="utf-8")
+
+    script = resolve(app_dir)
+    assert script == {"path": str(source), "stale": True}
+    assert "OK-EDITED" in dry_run(script["path"])  # 고친 코드가 실제로 실행됨
+    assert "OK-EDITED" not in dry_run(str(app_dir / "watch-send.pyc"))  # .pyc는 옛 코드
+
+
+def test_pyc_without_manifest_is_not_trusted(app_dir):
+    build(app_dir)
+    (app_dir / "watch-send.pyc.sha256").unlink()
+    assert resolve(app_dir)["path"] == str(app_dir / "watch-send.py")
+
+
+def test_no_pyc_uses_source(app_dir):
+    assert resolve(app_dir) == {"path": str(app_dir / "watch-send.py"), "stale": False}
@@ -0,0 +1,60 @@
+"""watch-send.py의 BLE 캡처는 wear-os-app/ble_capture.py를 그대로 씀 (같은 형식, MTU는 연결마다 한 번)"""
+import asyncio
+import importlib.util
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+def load(name: str, path: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+watch_send = load("watch_send", os.path.join(ROOT, "watch-send.py"))
+ble_capture = load("ble_capture_reader", os.path.join(os.path.dirname(ROOT), "wear-os-app", "ble_capture.py"))
+
+
+class FakeClient:
+    mtu_size = 247
+    is_connected = True
+
+    async def connect(self, **kwargs):
+        return True
+
+    async def disconnect(self):
+        pass
+
+    async def write_gatt_char(self, char, data, response=None):
+        pass
+
+
+def test_capture_off_returns_client(monkeypatch):
+    monkeypatch.setenv("P5S_CAPTURE", "off")
+    client = FakeClient()
+    assert watch_send._capture_client(client, ADDRESS) is client
+
+
+def test_capture_uses_ble_capture_format(monkeypatch, tmp_path):
+    monkeypatch.setenv("P5S_CAPTURE", str(tmp_path))
+    client = watch_send._capture_client(FakeClient(), ADDRESS)
+    assert type(client).__name__ == "CaptureClient"
+
+    async def send():
+        await client.connect()
+        for _ in range(5):
+            client.mtu_size
+        await client.write_gatt_char("0000ff02-0000-1000-8000-00805f9b34fb", b"\x02\x11", response=True)
+        await client.disconnect()
+
+    asyncio.run(send())
+    client._capture.close()
+
+    [name] = os.listdir(tmp_path)
+    parsed = ble_capture.read_capture(str(tmp_path / name))
+    assert parsed.address == ADDRESS
+    assert [r.text for r in parsed.records if r.kind == ble_capture.EVENT] == ["connect", "mtu 247", "disconnect"]
+    assert [r.data for r in parsed.records if r.kind == ble_capture.WRITE] == [b"\x02\x11"]
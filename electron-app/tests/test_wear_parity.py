@@ -0,0 +1,116 @@
+"""watch-send.py는 시작 시간 때문에 wear-os-app 모듈을 import하지 않고 따로 구현 -> 패킷/레이아웃/캐시/중복 방지 형식이 같은지"""
+import asyncio
+import importlib.util
+import os
+import sqlite3
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEAR = os.path.join(os.path.dirname(ROOT), "wear-os-app")
+sys.path.insert(0, WEAR)
+
+import dedup_store  # noqa: E402
+import frame_layout  # noqa: E402
+import gatt_cache  # noqa: E402
+
+spec = importlib.util.spec_from_file_location("watch_send", os.path.join(ROOT, "watch-send.py"))
+watch_send = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(watch_send)
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+MESSAGES = ["", "안녕", "⏰ 김철수 5분 전!", "x" * 7, "x" * 8, "ㆍ" * 200, "📶" * 40 + "abc" * 30]
+ENTRY = {"firmware": "1.2",
+         "services": [{"uuid": watch_send.SERVICE_UUID, "handle": 10,
+                       "chars": [{"uuid": watch_send.WRITE_CHAR, "handle": 12, "props": ["write"]},
+                                 {"uuid": watch_send.NOTIFY_CHAR, "handle": 14, "props": ["notify"]}]}],
+         "framing": {"firmware": "1.2", "mtu": 185, "first": 169, "next": 178}}
+
+
+def test_constants_match():
+    assert (watch_send.WRITE_CHAR, watch_send.NOTIFY_CHAR, watch_send.FIRMWARE_CHAR) == (
+        gatt_cache.WRITE_CHAR, gatt_cache.NOTIFY_CHAR, gatt_cache.FIRMWARE_CHAR)
+    assert watch_send.LEGACY_MTU == frame_layout.LEGACY_MTU
+    assert watch_send.LEGACY_LAYOUT == (frame_layout.LEGACY.first, frame_layout.LEGACY.next)
+    assert watch_send.DEFAULT_COOLDOWN == dedup_store.COOLDOWN_SECONDS
+
+
+@pytest.mark.parametrize("mtu", [23, 64, 131, 185, 247, 517])
+def test_packets_and_layouts_match(mtu):
+    layout = frame_layout.FrameLayout.for_mtu(mtu)
+    assert watch_send.layout_for_mtu(mtu) == (layout.first, layout.next)
+    for message in MESSAGES:
+        for notify_type in (255, 1):
+            assert watch_send.build_packet(message, notify_type, (layout.first, layout.next)) == \
+                frame_layout.build_frame(message, notify_type, layout)
+
+
+def test_cached_layout_matches_choose_layout():
+    cache = gatt_cache.GattCache("")
+    cache.entries[ADDRESS] = ENTRY
+    for firmware in ("1.2", "1.3"):
+        for mtu in (23, 185, 247):
+            found = cache.layout(ADDRESS, firmware, mtu) if mtu > frame_layout.LEGACY_MTU else None
+            expected = found or frame_layout.LEGACY
+            assert watch_send._cached_layout(ENTRY, firmware, mtu) == (expected.first, expected.next)
+    for uuid in (watch_send.WRITE_CHAR, watch_send.NOTIFY_CHAR, watch_send.FIRMWARE_CHAR):
+        assert watch_send._cached_handle(ENTRY, uuid) == gatt_cache.cached_handle(ENTRY, uuid)
+
+
+def test_gatt_cache_file_round_trips(tmp_path):
+    path = str(tmp_path / "gatt-cache.json")
+    watch_send._save_gatt_cache(path, {ADDRESS: ENTRY})
+    assert gatt_cache.GattCache(path).entry(ADDRESS) == ENTRY
+    cache = gatt_cache.GattCache(path)
+    cache.store("11:22:33:44:55:66", "2.0", ENTRY["services"])
+    assert watch_send._load_gatt_cache(path) == cache.entries
+
+
+class MtuClient:
+    def __init__(self, mtu, acquire=None):
+        self.mtu_size = mtu
+        if acquire is not None:
+            self._backend = type("Backend", (), {"_acquire_mtu": staticmethod(acquire)})()
+
+
+def test_negotiated_mtu_matches():
+    async def fail():
+        raise OSError("no mtu")
+
+    async def ok():
+        pass
+
+    async def both(client):
+        return await watch_send._negotiated_mtu(client), await frame_layout.negotiated_mtu(client)
+
+    for client in (MtuClient(185), MtuClient(0), MtuClient(None), MtuClient(247, ok), MtuClient(100, fail)):
+        a, b = asyncio.run(both(client))
+        assert a == b
+
+
+def schema(path: str) -> list:
+    db = sqlite3.connect(path)
+    try:
+        return db.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall()
+    finally:
+        db.close()
+
+
+def test_dedup_schema_and_claims_are_shared(tmp_path, monkeypatch):
+    ours, theirs = str(tmp_path / "send.sqlite3"), str(tmp_path / "store.sqlite3")
+    monkeypatch.setenv("P5S_DEDUP", ours)
+    sender = watch_send._open_dedup()
+    store = dedup_store.DedupStore(theirs)
+    assert schema(ours) == schema(theirs)
+
+    # 같은 파일을 같이 쓰면 한쪽이 잡은 키는 다른 쪽이 못 잡음
+    shared = dedup_store.DedupStore(ours)
+    key = dedup_store.cooldown_key(ADDRESS, "15:00 수업")
+    assert sender.claim(key, 300)
+    assert not shared.claim(key, 300)
+    sender.release(key)
+    assert shared.claim(key, 300)
+    assert not sender.claim(key, 300)
+    store.close()
+    shared.close()
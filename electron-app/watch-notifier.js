@@ -6,6 +6,7 @@ const { spawn } = require('child_process');
 const path = require('path');
 const fs = require('fs');
 const { app } = require('electron');
+const { resolveScriptPath } = require('./watch-script');
 
 class WatchNotifier {
     constructor() {
@@ -17,9 +18,18 @@ class WatchNotifier {
         this.writeChar = "0000ff02-0000-1000-8000-00805f9b34fb";
 
         // 알림 중복 방지 (같은 알림 5분간 재전송 안함)
+        // - Map은 이 프로세스 안의 빠른 확인용
+        // - 실제 기준은 ~/.p5s/dedup.sqlite3 (watch-send.py --dedup-key, Python 타이머와 공유)
         this.sentNotifications = new Map();
         this.NOTIFICATION_COOLDOWN = 5 * 60 * 1000; // 5분
 
+        // 알림 모아 보내기: 짧은 시간 안에 몰린 알림(여러 수업이 같이 끝날 때)은
+        // watch-send.py --batch 한 번으로 (연결/구독 한 번), 하나면 그냥 전송
+        this.BATCH_WINDOW = 300; // ms
+        this.pending = [];
+        this.flushTimer = null;
+        this.sending = Promise.resolve(); // 전송 프로세스는 한 번에 하나 (워치 연결 하나)
+
         // 설정 파일 로드
         this.loadConfig();
     }
@@ -67,6 +77,20 @@ class WatchNotifier {
         }
     }
 
+    /**
+     * 전송 스크립트 경로 (미리 컴파일된 watch-send.pyc가 소스와 같으면 우선)
+     * - 빌드: python scripts/build-watch-send.py
+     * - 빌드 후 watch-send.py를 고쳤으면 .py로 실행 (경고는 한 번만)
+     */
+    getScriptPath() {
+        const script = resolveScriptPath(__dirname);
+        if (script.stale && !this.warnedStaleScript) {
+            this.warnedStaleScript = true;
+            console.warn('[Watch] watch-send.pyc가 watch-send.py보다 오래됨 - .py로 실행 (다시 빌드: npm run build:watch-send)');
+        }
+        return script.path;
+    }
+
     /**
      * 알림 전송 가능 여부 확인
      */
@@ -95,8 +119,8 @@ class WatchNotifier {
             }
         }
 
-        // 알림 전송
-        const result = await this.sendNotification(message);
+        // 알림 전송 (다른 프로세스가 이미 보냈으면 watch-send.py가 SKIPPED)
+        const result = await this.enqueue(message, this.getDedupKey(message));
 
         if (result.success) {
             this.sentNotifications.set(key, now);
@@ -105,20 +129,79 @@ class WatchNotifier {
         return result;
     }
 
+    /**
+     * 알림을 큐에 넣고 BATCH_WINDOW 뒤 한꺼번에 전송
+     * @returns {Promise<{success: boolean, skipped?: boolean, error?: string}>} 이 알림의 결과
+     */
+    enqueue(message, dedupKey = null) {
+        return new Promise((resolve) => {
+            this.pending.push({ message, dedupKey, resolve });
+            if (!this.flushTimer) {
+                this.flushTimer = setTimeout(() => this.flush(), this.BATCH_WINDOW);
+            }
+        });
+    }
+
+    /**
+     * 쌓인 알림 전송 (앞 전송이 끝난 뒤에)
+     */
+    flush() {
+        const items = this.pending;
+        this.pending = [];
+        this.flushTimer = null;
+        this.sending = this.sending.then(() => this.sendQueued(items));
+        return this.sending;
+    }
+
+    async sendQueued(items) {
+        if (items.length === 1) {
+            const [item] = items;
+            item.resolve(await this.sendNotification(item.message, item.dedupKey));
+            return;
+        }
+        const batch = await this.sendBatch(items);
+        items.forEach((item, id) => {
+            const record = batch.results.find(r => r.id === id);
+            if (!record) {
+                item.resolve({ success: false, error: batch.error || '결과 없음' });
+            } else if (record.status === 'skipped') {
+                console.log(`[Watch] 쿨다운 중 (다른 프로세스에서 전송됨): ${item.message}`);
+                item.resolve({ success: true, skipped: true });
+            } else if (record.status === 'ok') {
+                item.resolve({ success: true });
+            } else {
+                item.resolve({ success: false, error: record.error });
+            }
+        });
+    }
+
+    /**
+     * 공용 중복 방지 키 (wear-os-app/dedup_store.py cooldown_key와 같은 형식)
+     */
+    getDedupKey(message) {
+        return `msg:${this.config.macAddress.toUpperCase()}:${message}`;
+    }
+
     /**
      * 실제 알림 전송 (Python 스크립트 실행)
+     * @param {string} message
+     * @param {string|null} dedupKey 있으면 쿨다운 안에 같은 키는 전송 안 함
      */
-    sendNotification(message) {
+    sendNotification(message, dedupKey = null) {
         if (!this.config.macAddress) {
             return Promise.resolve({ success: false, error: 'MAC 주소 미설정' });
         }
 
         return new Promise((resolve) => {
-            // watch-send.py 파일 실행
-            const scriptPath = path.join(__dirname, 'watch-send.py');
+            // watch-send.py(.pyc) 파일 실행
+            const scriptPath = this.getScriptPath();
 
+            const dedupArgs = dedupKey
+                ? ['--dedup-key', dedupKey, '--cooldown', String(this.NOTIFICATION_COOLDOWN / 1000)]
+                : [];
             const python = spawn('python', [
                 scriptPath,
+                ...dedupArgs,
                 this.config.macAddress,
                 message
             ], {
@@ -137,7 +220,10 @@ class WatchNotifier {
             });
 
             python.on('close', (code) => {
-                if (output.includes('OK')) {
+                if (output.includes('SKIPPED')) {
+                    console.log(`[Watch] 쿨다운 중 (다른 프로세스에서 전송됨): ${message}`);
+                    resolve({ success: true, skipped: true });
+                } else if (output.includes('OK')) {
                     console.log(`[Watch] 알림 전송 성공: ${message}`);
                     resolve({ success: true });
                 } else {
@@ -153,6 +239,76 @@ class WatchNotifier {
         });
     }
 
+    /**
+     * 여러 알림을 연결 한 번으로 전송 (watch-send.py --batch, notify()의 큐가 사용)
+     * @param {Array<string|{message: string, dedupKey?: string}>} messages
+     * @returns {Promise<{success: boolean, results: object[], error?: string}>} results[].id는 messages 순서
+     */
+    sendBatch(messages) {
+        if (!this.config.macAddress) {
+            return Promise.resolve({ success: false, results: [], error: 'MAC 주소 미설정' });
+        }
+
+        return new Promise((resolve) => {
+            const python = spawn('python', [
+                this.getScriptPath(),
+                '--batch',
+                this.config.macAddress,
+                '-'
+            ], {
+                timeout: 20000 + messages.length * 2000
+            });
+
+            let output = '';
+            let error = '';
+
+            python.stdout.on('data', (data) => {
+                output += data.toString();
+            });
+
+            python.stderr.on('data', (data) => {
+                error += data.toString();
+            });
+
+            python.on('close', () => {
+                const results = [];
+                let summary = null;
+                for (const line of output.split('\n')) {
+                    if (!line.trim().startsWith('{')) continue;
+                    try {
+                        const record = JSON.parse(line);
+                        if (record.summary) {
+                            summary = record;
+                        } else {
+                            results.push(record);
+                        }
+                    } catch (e) {
+                        // JSON이 아닌 줄은 무시
+                    }
+                }
+                const success = !!summary && summary.failed === 0;
+                console.log(`[Watch] 배치 전송: ${results.filter(r => r.status === 'ok').length}/${messages.length}`);
+                resolve({ success, results, error: success ? undefined : (error || output) });
+            });
+
+            python.on('error', (err) => {
+                console.error(`[Watch] Python 실행 오류: ${err.message}`);
+                resolve({ success: false, results: [], error: err.message });
+            });
+
+            messages.forEach((item, id) => {
+                const { message, dedupKey } = typeof item === 'string' ? { message: item } : item;
+                const line = { id, message };
+                if (dedupKey) {
+                    line.dedup_key = dedupKey;
+                    line.cooldown = this.NOTIFICATION_COOLDOWN / 1000;
+                }
+                python.stdin.write(JSON.stringify(line) + '\n');
+            });
+            python.stdin.end();
+        });
+    }
+
     /**
      * 수업 종료 N분 전 알림
      */
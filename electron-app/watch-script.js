@@ -0,0 +1,46 @@
+/**
+ * watch-send 실행 파일 고르기 (electron 없이 node로도 불러올 수 있게 분리)
+ * - watch-send.pyc는 빌드할 때의 watch-send.py 해시를 watch-send.pyc.sha256에 남김
+ * - 지금 watch-send.py와 해시가 같을 때만 .pyc 사용, 다르면(빌드 후 수정됨) .py로 실행
+ * - .py가 없으면(배포본에서 뺀 경우) .pyc 그대로
+ */
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+
+const SOURCE = 'watch-send.py';
+const COMPILED = 'watch-send.pyc';
+const MANIFEST = 'watch-send.pyc.sha256';
+
+function sha256(file) {
+    return crypto.createHash('sha256').update(fs.readFileSync(file)).digest('hex');
+}
+
+function readManifest(file) {
+    try {
+        return fs.readFileSync(file, 'utf-8').trim();
+    } catch (e) {
+        return '';
+    }
+}
+
+/**
+ * @param {string} dir watch-send.py가 있는 폴더
+ * @returns {{path: string, stale: boolean}} stale이면 .pyc가 있지만 소스와 달라서 .py를 고름
+ */
+function resolveScriptPath(dir) {
+    const source = path.join(dir, SOURCE);
+    const compiled = path.join(dir, COMPILED);
+    if (!fs.existsSync(compiled)) {
+        return { path: source, stale: false };
+    }
+    if (!fs.existsSync(source)) {
+        return { path: compiled, stale: false };
+    }
+    if (readManifest(path.join(dir, MANIFEST)) === sha256(source)) {
+        return { path: compiled, stale: false };
+    }
+    return { path: source, stale: true };
+}
+
+module.exports = { resolveScriptPath, SOURCE, COMPILED, MANIFEST };
@@ -1,14 +1,62 @@
 """
 P5S 워치 알림 전송 스크립트
 사용법: python watch-send.py <MAC주소> <메시지>
+       python watch-send.py --dry-run [--mtu N] <MAC주소> <메시지>   (BLE 없이 패킷만 출력)
+       python watch-send.py --batch <MAC주소> [메시지 ...] [--file 경로] [-]
+       python watch-send.py --dedup-key <키> [--cooldown 초] <MAC주소> <메시지>
+
+배치 모드 (--batch): 연결/Notify 구독 한 번으로 여러 메시지 전송
+- 메시지: 인자 하나당 하나, --file 파일의 줄마다 하나, '-'면 stdin 줄마다 하나
+- 줄이 '{'로 시작하면 JSON ({"id": ..., "message": ...})
+- stdin은 들어오는 대로 바로 전송 (스트리밍)
+- 결과는 메시지마다 JSON 한 줄: {"index", "id", "status": "ok"|"error", "packets", "legacy_packets", "ms"}
+  마지막 줄: {"summary": true, "ok": N, "failed": M, "connect_ms", "first_write_ms", "gatt_cached",
+             "mtu", "layout": [첫 패킷, 후속 패킷 데이터 바이트]}
+
+GATT 캐시: ff02/ff03 특성은 연결마다 한 번만 조회, 서비스 테이블은 기기별로
+~/.p5s/gatt-cache.json에 저장 (wear-os-app/gatt_cache.py와 같은 형식)
+- 캐시가 있으면 Windows에서 OS 캐시 서비스를 사용해 재탐색 생략
+- 캐시 핸들로 조회 실패 시 캐시 폐기 후 전체 탐색으로 재연결
+- P5S_GATT_CACHE=off 이면 캐시 사용 안 함 (전/후 비교용)
+
+패킷 크기: 협상된 MTU와 같은 캐시 항목의 "framing"(펌웨어/MTU별 프로브 결과)을 보고 결정
+- 프로브는 wear-os-app 보정 명령으로만 (python frame_layout.py probe <MAC>)
+- 프로브 결과가 없거나 펌웨어/MTU가 다르면 기존 7/16바이트 형식
+
+중복 방지 (--dedup-key): ~/.p5s/dedup.sqlite3를 Python 타이머들과 같이 사용
+(wear-os-app/dedup_store.py와 같은 테이블)
+- 키가 쿨다운(기본 300초) 안에 이미 있으면 연결 없이 SKIPPED 출력
+- 전송 실패 시 키를 되돌려 다음에 다시 보낼 수 있게 함
+- 배치 모드: JSON 줄에 "dedup_key"가 있으면 같은 방식, 결과 status "skipped"
+- P5S_DEDUP으로 파일 변경, "off"면 사용 안 함
+
+BLE 캡처: P5S_CAPTURE=<폴더> 이면 write / notify / 연결 이벤트를 바이너리 로그로 기록
+- 기록은 wear-os-app/ble_capture.py의 CaptureClient 그대로 (같은 파일 형식, 캡처할 때만 로드)
+  watch-send.py 옆의 ble_capture.py -> ../wear-os-app/ble_capture.py 순서로 찾음
+- 확인: python ble_capture.py index|show|replay <폴더>/<주소>-<시각>-<pid>.p5scap
+
+런타임 경유: wear-os-app/timer_runtime.py가 실행 중이면 (P5S_RUNTIME, 기본 127.0.0.1:8767)
+워치에 직접 연결하지 않고 런타임에 전송을 요청 (P5S는 중앙 장치를 하나만 받음)
+- 런타임이 없으면 지금처럼 직접 연결, P5S_RUNTIME=off 이면 항상 직접 연결
+- 배치 요약에 "runtime": 주소
+
+알림마다 새 프로세스로 실행되므로 시작 시간이 중요함
+- 인자 파싱/패킷 생성은 표준 라이브러리 최소 import만 사용
+  (그래서 패킷/GATT 캐시/중복 방지 테이블은 wear-os-app 모듈을 import하지 않고 따로 구현,
+   같은 형식인지는 tests/test_wear_parity.py가 검사)
+- asyncio / bleak(dbus-fast 등 백엔드 포함)는 실제 전송 직전에 import (런타임 경유면 import 안 함)
+- scripts/build-watch-send.py로 미리 컴파일된 watch-send.pyc 생성 가능
+- scripts/check-startup.py가 런타임 경유 전송 경로의 import/실행 시간 예산을 검사
 """
 import sys
-import asyncio
-from bleak import BleakClient, BleakScanner
 
 SERVICE_UUID = "000001ff-3c17-d293-8e48-14fe2e4da212"
 WRITE_CHAR = "0000ff02-0000-1000-8000-00805f9b34fb"
 NOTIFY_CHAR = "0000ff03-0000-1000-8000-00805f9b34fb"
+FIRMWARE_CHAR = "00002a26-0000-1000-8000-00805f9b34fb"
+DEFAULT_COOLDOWN = 300.0  # 초 (watch-notifier.js NOTIFICATION_COOLDOWN과 같음)
+LEGACY_MTU = 23
+LEGACY_LAYOUT = (7, 16)  # 첫 패킷 / 후속 패킷 데이터 바이트 (MTU 23 기준)
 
 
 def notification_handler(sender, data):
@@ -16,18 +64,21 @@ def notification_handler(sender, data):
     pass  # 응답 받음
 
 
-def build_packet(message: str, notify_type: int = 255) -> list:
-    """알림 패킷 생성 (p5s_notification_send.py와 동일)"""
+def build_packet(message: str, notify_type: int = 255, layout: tuple = LEGACY_LAYOUT) -> list:
+    """알림 패킷 생성 (wear-os-app/frame_layout.py build_frame과 동일)
+    layout: (첫 패킷 데이터 바이트, 후속 패킷 데이터 바이트) - 기본 7/16
+    """
     if len(message) > 128:
         message = message[:125] + "..."
 
     content = message.encode('utf-8')
     length = len(content)
+    first_len, next_len = layout
 
     packets = []
 
-    # 첫 번째 패킷 (최대 7바이트 데이터)
-    first_data_len = min(7, length)
+    # 첫 번째 패킷 (기본 최대 7바이트 데이터)
+    first_data_len = min(first_len, length)
 
     packet = bytearray()
     packet.append(0x02)  # 명령 헤더
@@ -55,11 +106,11 @@ def build_packet(message: str, notify_type: int = 255) -> list:
 
     packets.append(bytes(packet))
 
-    # 후속 패킷들 (16바이트씩)
-    offset = 7
+    # 후속 패킷들 (기본 16바이트씩)
+    offset = first_data_len
     seq = 1
     while offset < length:
-        chunk_len = min(16, length - offset)
+        chunk_len = min(next_len, length - offset)
 
         packet = bytearray()
         packet.append(0x02)
@@ -69,48 +120,533 @@ def build_packet(message: str, notify_type: int = 255) -> list:
         packet.extend(content[offset:offset + chunk_len])
 
         packets.append(bytes(packet))
-        offset += 16
+        offset += next_len
         seq += 1
 
     return packets
 
 
-async def send_notification(mac_address: str, message: str):
-    """알림 전송"""
+def layout_for_mtu(mtu: int) -> tuple:
+    """MTU가 허용하는 최대 레이아웃 (첫 패킷 헤더 13바이트, 후속 4바이트, 데이터 길이 필드 1바이트)"""
+    payload = mtu - 3
+    return min(payload - 13, 255), payload - 4
+
+
+class _Link:
+    """연결 하나: client + 조회해 둔 특성 객체 + 타이밍"""
+
+    def __init__(self, client, write_char, cached: bool, started: float,
+                 mtu: int = LEGACY_MTU, layout: tuple = LEGACY_LAYOUT):
+        import time
+        self.client = client
+        self.write_char = write_char
+        self.cached = cached
+        self.mtu = mtu
+        self.layout = layout
+        self.started = started
+        self.connect_ms = round((time.perf_counter() - started) * 1000)
+        self.first_write_ms = None
+
+    def mark_write(self):
+        if self.first_write_ms is None:
+            import time
+            self.first_write_ms = round((time.perf_counter() - self.started) * 1000)
+
+
+def _gatt_cache_path():
+    import os
+    path = os.environ.get("P5S_GATT_CACHE")
+    if path == "off":
+        return None
+    return path or os.path.join(os.path.expanduser("~"), ".p5s", "gatt-cache.json")
+
+
+def _load_gatt_cache(path) -> dict:
+    import json
     try:
-        # Windows에서 BLE Random 주소 직접 연결 불가 - 스캔 필요
-        device = await BleakScanner.find_device_by_address(mac_address, timeout=10.0)
-        if not device:
-            print(f"ERROR: Device {mac_address} not found in scan")
-            return
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_gatt_cache(path, entries: dict):
+    import json
+    import os
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+
+def _cached_handle(entry, uuid: str):
+    for service in (entry or {}).get("services", []):
+        for char in service["chars"]:
+            if char["uuid"] == uuid:
+                return char["handle"]
+    return None
+
+
+def _resolve(client, uuid: str, expected_handle=None):
+    char = client.services.get_characteristic(uuid)
+    if char is None or (expected_handle is not None and char.handle != expected_handle):
+        raise LookupError(f"GATT characteristic not found: {uuid}")
+    return char
+
+
+class _Dedup:
+    """공용 중복 방지 저장소 (sqlite3는 --dedup-key가 있을 때만 import)"""
+
+    def __init__(self):
+        import os
+        import sqlite3
+        path = os.environ.get("P5S_DEDUP") or os.path.join(os.path.expanduser("~"), ".p5s", "dedup.sqlite3")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, isolation_level=None, timeout=1.0)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS dedup (key TEXT PRIMARY KEY, expires REAL NOT NULL) WITHOUT ROWID")
+        self.db.execute("CREATE INDEX IF NOT EXISTS dedup_expires ON dedup (expires)")
+
+    def claim(self, key: str, ttl: float) -> bool:
+        import time
+        now = time.time()
+        self.db.execute("DELETE FROM dedup WHERE expires <= ?", (now,))
+        cursor = self.db.execute("""
+            INSERT INTO dedup (key, expires) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET expires = excluded.expires WHERE dedup.expires <= ?
+        """, (key, now + ttl, now))
+        return cursor.rowcount == 1
+
+    def release(self, key: str):
+        self.db.execute("DELETE FROM dedup WHERE key = ?", (key,))
+
+
+def _open_dedup():
+    import os
+    if os.environ.get("P5S_DEDUP") == "off":
+        return None
+    try:
+        return _Dedup()
+    except Exception:
+        return None  # 저장소 문제로 알림을 막지는 않음
+
+
+def _cached_layout(entry, firmware: str, mtu: int) -> tuple:
+    """frame_layout.py 프로브 결과 (같은 펌웨어/MTU일 때만, 없으면 기존 7/16)"""
+    framing = (entry or {}).get("framing")
+    if mtu > LEGACY_MTU and framing and framing.get("firmware") == firmware and framing.get("mtu") == mtu:
+        return framing["first"], framing["next"]
+    return LEGACY_LAYOUT
+
+
+async def _negotiated_mtu(client) -> int:
+    # BlueZ 백엔드는 실제 값을 한 번 받아 와야 mtu_size가 맞음
+    acquire = getattr(getattr(client, "_backend", None), "_acquire_mtu", None)
+    if acquire is not None:
+        try:
+            await acquire()
+        except Exception:
+            pass
+    try:
+        return int(client.mtu_size) or LEGACY_MTU
+    except Exception:
+        return LEGACY_MTU
+
+
+def _runtime_endpoint():
+    import os
+    value = os.environ.get("P5S_RUNTIME", "127.0.0.1:8767")
+    if value == "off":
+        return None
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def _runtime_request(endpoint, payload: dict, timeout: float = 60.0):
+    """실행 중인 wear-os-app/timer_runtime.py에 요청 하나 (런타임이 없으면 None)"""
+    import json
+    import socket
+    try:
+        sock = socket.create_connection(endpoint, timeout=0.5)
+    except OSError:
+        return None
+    try:
+        with sock:
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+            line = sock.makefile("rb").readline()
+        return json.loads(line or b"{}")
+    except (OSError, ValueError) as e:
+        return {"ok": False, "error": str(e)}
+
+
+def _load_ble_capture():
+    """wear-os-app/ble_capture.py (watch-send.py 옆에 있으면 그것) - 캡처 형식/기록은 한 곳에서만"""
+    import importlib.util
+    import os
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    for folder in (here, os.path.join(os.path.dirname(here), "wear-os-app")):
+        path = os.path.join(folder, "ble_capture.py")
+        if os.path.exists(path):
+            spec = importlib.util.spec_from_file_location("ble_capture", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            return module
+    return None
+
+
+def _capture_client(client, address: str):
+    """P5S_CAPTURE가 켜져 있으면 ble_capture.CaptureClient로 감싸기 (꺼져 있으면 import도 안 함)"""
+    import os
+    if os.environ.get("P5S_CAPTURE", "").lower() in ("", "off"):
+        return client
+    ble_capture = _load_ble_capture()
+    if ble_capture is None:
+        print("WARNING: P5S_CAPTURE: ble_capture.py를 찾지 못함 - 캡처 안 함", file=sys.stderr)
+        return client
+    return ble_capture.capture_client(client, address)
+
+
+def _client_kwargs(use_cache: bool) -> dict:
+    # OS 서비스 캐시 선택은 WinRT 백엔드만 지원 (BlueZ는 자체 캐시)
+    return {"winrt": {"use_cached_services": use_cache}} if sys.platform == "win32" else {}
 
-        async with BleakClient(device) as client:
-            # Notify 구독
-            await client.start_notify(NOTIFY_CHAR, notification_handler)
 
-            # 패킷 생성 및 전송
-            packets = build_packet(message)
+async def _send_frame(link: _Link, message: str, packet_delay: float = 0.1) -> int:
+    """메시지 하나를 연결된 client로 전송 -> 패킷 수"""
+    import asyncio
 
-            for packet in packets:
-                await client.write_gatt_char(WRITE_CHAR, packet, response=True)
-                await asyncio.sleep(0.1)  # 패킷 간 딜레이
+    packets = build_packet(message, layout=link.layout)
+    for packet in packets:
+        await link.client.write_gatt_char(link.write_char, packet, response=True)
+        link.mark_write()
+        await asyncio.sleep(packet_delay)  # 패킷 간 딜레이
+    return len(packets)
 
-            # 응답 대기 (중요!)
-            await asyncio.sleep(2)
 
-            await client.stop_notify(NOTIFY_CHAR)
+async def _open_client(device, use_cache: bool):
+    from bleak import BleakClient
 
-            print("OK")
+    client = _capture_client(BleakClient(device, **_client_kwargs(use_cache)), device.address)
+    await client.connect()
+    return client
+
+
+async def _connect(mac_address: str):
+    """스캔 후 연결 + 특성 조회 + Notify 구독 (실패하면 에러 문자열)"""
+    import time
+    from bleak import BleakScanner
+
+    started = time.perf_counter()
+    # Windows에서 BLE Random 주소 직접 연결 불가 - 스캔 필요
+    device = await BleakScanner.find_device_by_address(mac_address, timeout=10.0)
+    if not device:
+        return None, f"Device {mac_address} not found in scan"
+
+    cache_path = _gatt_cache_path()
+    entries = _load_gatt_cache(cache_path) if cache_path else {}
+    entry = entries.get(mac_address.upper())
+
+    client = await _open_client(device, entry is not None)
+    try:
+        write_char = None
+        if entry is not None:
+            try:
+                write_char = _resolve(client, WRITE_CHAR, _cached_handle(entry, WRITE_CHAR))
+                _resolve(client, NOTIFY_CHAR, _cached_handle(entry, NOTIFY_CHAR))
+            except LookupError:
+                # 펌웨어가 바뀜 -> 캐시 폐기 후 전체 탐색으로 재연결
+                entries.pop(mac_address.upper(), None)
+                _save_gatt_cache(cache_path, entries)
+                await client.disconnect()
+                client = await _open_client(device, False)
+
+        cached = write_char is not None
+        if not cached:
+            write_char = _resolve(client, WRITE_CHAR)
+            _resolve(client, NOTIFY_CHAR)
+            firmware = await _read_firmware(client)
+            if cache_path:
+                framing = (entry or {}).get("framing")
+                entry = {
+                    "firmware": firmware,
+                    "services": [{
+                        "uuid": svc.uuid,
+                        "handle": svc.handle,
+                        "chars": [{"uuid": c.uuid, "handle": c.handle, "props": c.properties}
+                                  for c in svc.characteristics],
+                    } for svc in client.services],
+                    "saved": time.time(),
+                }
+                if framing and framing.get("firmware") == firmware:
+                    entry["framing"] = framing
+                entries[mac_address.upper()] = entry
+                _save_gatt_cache(cache_path, entries)
+        else:
+            firmware = entry.get("firmware", "unknown")
+
+        mtu = await _negotiated_mtu(client)
+        await client.start_notify(NOTIFY_CHAR, notification_handler)
+    except Exception:
+        await client.disconnect()
+        raise
+    return _Link(client, write_char, cached, started, mtu, _cached_layout(entry, firmware, mtu)), None
+
+
+async def _read_firmware(client) -> str:
+    if client.services.get_characteristic(FIRMWARE_CHAR) is None:
+        return "unknown"
+    try:
+        return (await client.read_gatt_char(FIRMWARE_CHAR)).decode("utf-8", errors="replace").strip("\0 ")
+    except Exception:
+        return "unknown"
+
+
+async def _close(link: _Link):
+    import asyncio
+
+    try:
+        # 응답 대기 (중요!)
+        await asyncio.sleep(2)
+        await link.client.stop_notify(NOTIFY_CHAR)
+    finally:
+        await link.client.disconnect()
+
+
+def send_via_runtime(mac_address: str, message: str):
+    """실행 중인 런타임으로 전송 (동기 소켓, asyncio 불필요) -> 성공 여부, 런타임이 없으면 None"""
+    endpoint = _runtime_endpoint()
+    reply = _runtime_request(endpoint, {"op": "send", "address": mac_address, "message": message}) \
+        if endpoint else None
+    if reply is None:
+        return None
+    # 런타임이 워치 연결을 갖고 있음 -> 직접 연결하면 서로 연결을 뺏음
+    print("OK" if reply.get("ok") else f"ERROR: runtime: {reply.get('error', 'send failed')}")
+    return bool(reply.get("ok"))
+
+
+async def send_notification(mac_address: str, message: str, try_runtime: bool = True) -> bool:
+    """알림 전송 (런타임이 있으면 그쪽으로, 없으면 직접 연결)"""
+    via_runtime = send_via_runtime(mac_address, message) if try_runtime else None
+    if via_runtime is not None:
+        return via_runtime
+    try:
+        link, error = await _connect(mac_address)
+        if error:
+            print(f"ERROR: {error}")
+            return False
+        try:
+            await _send_frame(link, message)
+        finally:
+            await _close(link)
+        print("OK")
+        return True
     except Exception as e:
         print(f"ERROR: {e}")
+        return False
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("ERROR: 사용법: python watch-send.py <MAC주소> <메시지>")
-        sys.exit(1)
+def _parse_item(line: str, index: int) -> dict:
+    """배치 입력 한 줄 -> {"id", "message"}"""
+    line = line.strip()
+    if line.startswith('{'):
+        import json
+        item = json.loads(line)
+        return {"id": item.get("id", index), "message": str(item["message"]),
+                "dedup_key": item.get("dedup_key"), "cooldown": item.get("cooldown")}
+    return {"id": index, "message": line}
+
+
+async def _batch_items(messages: list, files: list, use_stdin: bool):
+    """인자 -> 파일 -> stdin 순서로 메시지 생성 (stdin은 들어오는 대로)"""
+    import asyncio
 
-    mac_address = sys.argv[1]
-    message = " ".join(sys.argv[2:])
+    index = 0
+    for message in messages:
+        yield {"id": index, "message": message}
+        index += 1
+    for path in files:
+        with open(path, encoding="utf-8-sig") as f:
+            for line in f:
+                if line.strip():
+                    yield _parse_item(line, index)
+                    index += 1
+    if use_stdin:
+        loop = asyncio.get_running_loop()
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                break
+            if line.strip():
+                yield _parse_item(line, index)
+                index += 1
 
-    asyncio.run(send_notification(mac_address, message))
+
+def _emit(record: dict):
+    import json
+    print(json.dumps(record, ensure_ascii=False), flush=True)
+
+
+async def send_batch(mac_address: str, messages: list, files: list, use_stdin: bool) -> int:
+    """배치 전송 (연결 하나 재사용) -> 실패 건수"""
+    import time
+
+    import asyncio
+
+    ok = failed = skipped = 0
+    link = timing = dedup = None
+    error = None
+    runtime = _runtime_endpoint()
+    if runtime is not None and _runtime_request(runtime, {"op": "status"}, timeout=2.0) is None:
+        runtime = None
+    if runtime is None:
+        try:
+            link, error = await _connect(mac_address)
+        except Exception as e:
+            error = str(e)
+    else:
+        timing = {"runtime": "%s:%d" % runtime}
+
+    index = 0
+    async for item in _batch_items(messages, files, use_stdin):
+        record = {"index": index, "id": item["id"]}
+        index += 1
+        key = item.get("dedup_key")
+        if key:
+            dedup = dedup or _open_dedup()
+            if dedup is not None and not dedup.claim(key, float(item.get("cooldown") or DEFAULT_COOLDOWN)):
+                record["status"] = "skipped"
+                skipped += 1
+                _emit(record)
+                continue
+            if dedup is None:
+                key = None
+        if runtime is not None:
+            # 실행 중인 런타임의 연결로 전송 (워치 연결 하나를 같이 씀)
+            start = time.perf_counter()
+            reply = await asyncio.get_running_loop().run_in_executor(None, _runtime_request, runtime, {
+                "op": "send", "address": mac_address, "message": item["message"]})
+            if reply and reply.get("ok"):
+                record["status"] = "ok"
+                ok += 1
+            else:
+                record.update(status="error", error=(reply or {}).get("error", "runtime unavailable"))
+                failed += 1
+                if key:
+                    dedup.release(key)
+            record["ms"] = round((time.perf_counter() - start) * 1000)
+            _emit(record)
+            continue
+        if link is None:
+            record.update(status="error", error=error)
+            failed += 1
+            if key:
+                dedup.release(key)
+            _emit(record)
+            continue
+
+        start = time.perf_counter()
+        try:
+            record["packets"] = await _send_frame(link, item["message"])
+            record["legacy_packets"] = len(build_packet(item["message"]))
+            record["status"] = "ok"
+            ok += 1
+        except Exception as e:
+            record.update(status="error", error=str(e))
+            failed += 1
+            if key:
+                dedup.release(key)
+            if not link.client.is_connected:  # 연결이 끊기면 나머지는 모두 실패 처리
+                link, error = None, f"disconnected: {e}"
+        record["ms"] = round((time.perf_counter() - start) * 1000)
+        if link is not None and timing is None:
+            timing = {"connect_ms": link.connect_ms, "first_write_ms": link.first_write_ms,
+                      "gatt_cached": link.cached, "mtu": link.mtu, "layout": list(link.layout)}
+        _emit(record)
+
+    if link is not None:
+        try:
+            await _close(link)
+        except Exception:
+            pass
+    _emit({"summary": True, "ok": ok, "failed": failed, "skipped": skipped, **(timing or {})})
+    return failed
+
+
+def _parse_batch_args(argv: list):
+    """--batch 인자 -> (MAC, 메시지들, 파일들, stdin 사용 여부)"""
+    mac_address, messages, files, use_stdin = None, [], [], False
+    args = iter(argv)
+    for arg in args:
+        if arg == "--file":
+            files.append(next(args))
+        elif arg == "-":
+            use_stdin = True
+        elif mac_address is None:
+            mac_address = arg
+        else:
+            messages.append(arg)
+    return mac_address, messages, files, use_stdin
+
+
+def _pop_option(argv: list, name: str):
+    """argv에서 '--name 값'을 빼서 값 반환"""
+    if name in argv:
+        i = argv.index(name)
+        value = argv[i + 1] if i + 1 < len(argv) else None
+        del argv[i:i + 2]
+        return value
+    return None
+
+
+def main(argv: list) -> int:
+    argv = list(argv)
+    if argv and argv[0] == "--batch":
+        mac_address, messages, files, use_stdin = _parse_batch_args(argv[1:])
+        if not mac_address or not (messages or files or use_stdin):
+            print("ERROR: 사용법: python watch-send.py --batch <MAC주소> [메시지 ...] [--file 경로] [-]")
+            return 1
+        import asyncio
+        return 1 if asyncio.run(send_batch(mac_address, messages, files, use_stdin)) else 0
+
+    dedup_key = _pop_option(argv, "--dedup-key")
+    mtu = int(_pop_option(argv, "--mtu") or LEGACY_MTU)
+    cooldown = float(_pop_option(argv, "--cooldown") or DEFAULT_COOLDOWN)
+    dry_run = bool(argv) and argv[0] == "--dry-run"
+    if dry_run:
+        argv = argv[1:]
+
+    if len(argv) < 2:
+        print("ERROR: 사용법: python watch-send.py [--dry-run] <MAC주소> <메시지>")
+        return 1
+
+    mac_address = argv[0]
+    message = " ".join(argv[1:])
+
+    if dry_run:
+        packets = build_packet(message, layout=layout_for_mtu(mtu) if mtu > LEGACY_MTU else LEGACY_LAYOUT)
+        for packet in packets:
+            print(packet.hex())
+        if mtu > LEGACY_MTU:
+            print(f"# MTU {mtu}: {len(build_packet(message))} -> {len(packets)} packets")
+        print("OK")
+        return 0
+
+    dedup = _open_dedup() if dedup_key else None
+    if dedup is not None and not dedup.claim(dedup_key, cooldown):
+        print("SKIPPED")  # 쿨다운 중 (다른 프로세스가 이미 보냄)
+        return 0
+
+    ok = send_via_runtime(mac_address, message)  # 런타임 경유면 asyncio/bleak import 없이 끝남
+    if ok is None:
+        import asyncio
+        ok = asyncio.run(send_notification(mac_address, message, try_runtime=False))
+    if not ok and dedup is not None:
+        dedup.release(dedup_key)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
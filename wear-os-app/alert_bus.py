@@ -0,0 +1,261 @@
+"""
+알림 버스: 알림 하나를 등록된 싱크(워치, 데스크톱 알림, 소리, 로그 파일) 모두에 동시에
+- 싱크마다 크기 제한 큐 + 워커 태스크 하나
+  -> 스케줄러는 큐에 넣기만 하고, 멈춘 BLE 쓰기나 느린 싱크가 다른 싱크를 막지 않음
+- 큐가 가득 차면 가장 오래된 알림을 버림 (밀린 옛 알림보다 새 알림이 중요)
+- 전달마다 제한 시간, 싱크별 전달/실패/오류/시간 초과/버림 수
+- 싱크는 name과 async deliver(alert) -> bool만 있으면 됨
+
+P5S_SINKS=desktop,sound,log 로 워치 외 싱크 추가
+  sound:효과음파일, log:경로 (기본 ~/.p5s/alerts.jsonl)
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from clock import SYSTEM_CLOCK
+from dedup_store import COOLDOWN_SECONDS, cooldown_key
+from delivery_latency import TRACKER
+
+SINK_QUEUE = 64         # 싱크별로 밀려 있을 수 있는 알림 수
+SINK_TIMEOUT = 10.0     # 전달 하나 제한 시간 (초)
+WATCH_TIMEOUT = 60.0    # 워치는 재연결/재전송/흐름 제어 대기까지 포함
+CLOSE_TIMEOUT = 5.0     # 종료 시 남은 알림을 보내려고 기다리는 최대 시간
+ALERT_LOG = os.path.expanduser("~/.p5s/alerts.jsonl")
+
+log = logging.getLogger("p5s.bus")
+
+
+@dataclass(frozen=True)
+class Alert:
+    name: str               # 학생 / 타이머 이름
+    message: str
+    deadline: datetime      # 워치에 도착해야 할 시각
+    source: str = "schedule"  # schedule / timer
+
+
+class SinkWorker:
+    """싱크 하나의 큐 + 워커 (태스크는 첫 알림 때 시작)"""
+
+    def __init__(self, sink, size: int = SINK_QUEUE, timeout: float = SINK_TIMEOUT):
+        self.sink = sink
+        self.name = getattr(sink, "name", type(sink).__name__)
+        self.timeout = timeout
+        self.queue: asyncio.Queue = asyncio.Queue(size)
+        self.task: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.failed = 0     # deliver가 False
+        self.errors = 0     # 예외
+        self.timeouts = 0
+        self.dropped = 0    # 큐가 가득 차서 버림
+
+    def put(self, alert: Alert):
+        if self.queue.full():
+            old = self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+            log.warning(f"  🗑️ {self.name} 싱크 밀림 - 버림: {old.message}",
+                        extra={"event": "sink_dropped", "sink": self.name})
+        self.queue.put_nowait(alert)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name=f"p5s-sink-{self.name}")
+
+    async def _run(self):
+        while True:
+            alert = await self.queue.get()
+            try:
+                if await asyncio.wait_for(self.sink.deliver(alert), self.timeout):
+                    self.delivered += 1
+                else:
+                    self.failed += 1
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                log.warning(f"  ⏱️ {self.name} 싱크 {self.timeout:g}초 초과: {alert.message}",
+                            extra={"event": "sink_timeout", "sink": self.name})
+            except Exception as e:
+                self.errors += 1
+                log.warning(f"  ❌ {self.name} 싱크 오류: {e}", extra={"event": "sink_error", "sink": self.name})
+            finally:
+                self.queue.task_done()
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+
+    def status(self) -> dict:
+        return {"sink": self.name, "queued": self.queue.qsize(), "delivered": self.delivered,
+                "failed": self.failed, "errors": self.errors, "timeouts": self.timeouts, "dropped": self.dropped}
+
+
+class AlertBus:
+    """알림 -> 모든 싱크 (publish는 기다리지 않음)"""
+
+    def __init__(self):
+        self.workers: list[SinkWorker] = []
+
+    def add(self, sink, size: int = SINK_QUEUE, timeout: float = SINK_TIMEOUT) -> SinkWorker:
+        worker = SinkWorker(sink, size, timeout)
+        self.workers.append(worker)
+        return worker
+
+    def publish(self, alert: Alert):
+        for worker in self.workers:
+            worker.put(alert)
+
+    async def close(self, timeout: float = CLOSE_TIMEOUT):
+        """남은 알림을 timeout초까지 보내 보고 워커 정지 (여러 번 불러도 됨)"""
+        # 큐가 비었어도 꺼내서 보내는 중인 알림이 있을 수 있음 -> 워커가 살아 있으면 join (task_done까지)
+        pending = [w.queue.join() for w in self.workers if w.task is not None and not w.task.done()]
+        if pending:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(asyncio.gather(*pending), timeout)
+        for worker in self.workers:
+            await worker.stop()
+
+    def status(self) -> list[dict]:
+        return [worker.status() for worker in self.workers]
+
+    def report(self) -> str:
+        lines = ["📣 알림 싱크:"]
+        for s in self.status():
+            lines.append(f"  {s['sink']}: 전달 {s['delivered']}, 실패 {s['failed']}, 오류 {s['errors']}, "
+                         f"시간 초과 {s['timeouts']}, 버림 {s['dropped']}")
+        return "\n".join(lines)
+
+
+# ========== 싱크 ==========
+
+class WatchSink:
+    """워치 (같은 문구는 쿨다운 동안 한 번, 보낸 뒤 도착 지연 기록)"""
+    name = "watch"
+
+    def __init__(self, notifier, clock=SYSTEM_CLOCK, latency=TRACKER, dedup=None):
+        self.notifier = notifier
+        self.clock = clock
+        self.latency = latency
+        self.dedup = dedup
+
+    async def deliver(self, alert: Alert) -> bool:
+        address = getattr(self.notifier, "address", "")
+        key = cooldown_key(address, alert.message)
+        if self.dedup is not None and not self.dedup.claim(key, COOLDOWN_SECONDS):
+            log.info(f"  ⏭️ 쿨다운 중: {alert.message}", extra={"event": "cooldown", "student": alert.name})
+            return True
+        send = getattr(self.notifier, "send_notification", None) or self.notifier.send
+        ok = False
+        try:
+            ok = await send(alert.message)  # 예외는 워커가 오류로 셈
+        finally:
+            # 실패/예외/취소(시간 초과, 종료)면 다음에(재시작 후에도) 다시 보낼 수 있게
+            if not ok and self.dedup is not None:
+                self.dedup.release(key)
+        if ok:
+            self.latency.record_arrival(address, alert.deadline, self.clock.now())
+        return ok
+
+
+async def _run_command(*command: str) -> bool:
+    process = await asyncio.create_subprocess_exec(*command, stdout=asyncio.subprocess.DEVNULL,
+                                                   stderr=asyncio.subprocess.DEVNULL)
+    try:
+        return await process.wait() == 0
+    except asyncio.CancelledError:
+        with contextlib.suppress(ProcessLookupError):
+            process.kill()
+        raise
+
+
+class DesktopSink:
+    """데스크톱 알림 (리눅스 notify-send, macOS osascript)"""
+    name = "desktop"
+
+    def __init__(self, title: str = "P5S 타이머"):
+        self.title = title
+
+    @staticmethod
+    def available() -> bool:
+        return bool(shutil.which("notify-send") or shutil.which("osascript"))
+
+    async def deliver(self, alert: Alert) -> bool:
+        if shutil.which("notify-send"):
+            return await _run_command("notify-send", self.title, alert.message)
+        script = f"display notification {json.dumps(alert.message)} with title {json.dumps(self.title)}"
+        return await _run_command("osascript", "-e", script)
+
+
+class SoundSink:
+    """효과음 (paplay / afplay, 없으면 터미널 벨)"""
+    name = "sound"
+    SOUNDS = {"paplay": "/usr/share/sounds/freedesktop/stereo/complete.oga",
+              "afplay": "/System/Library/Sounds/Glass.aiff"}
+
+    def __init__(self, path: str = ""):
+        self.player = next((p for p in self.SOUNDS if shutil.which(p)), None)
+        self.path = path or (self.SOUNDS[self.player] if self.player else "")
+
+    async def deliver(self, alert: Alert) -> bool:
+        if self.player and os.path.exists(self.path):
+            return await _run_command(self.player, self.path)
+        sys.stderr.write("\a")
+        sys.stderr.flush()
+        return True
+
+
+class LogSink:
+    """알림 기록 파일 (JSON 한 줄씩, 파일 쓰기는 스레드에서)"""
+    name = "log"
+
+    def __init__(self, path: str = ALERT_LOG):
+        self.path = path
+
+    def _append(self, line: str):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    async def deliver(self, alert: Alert) -> bool:
+        line = json.dumps({"ts": round(time.time(), 3), "name": alert.name, "message": alert.message,
+                           "deadline": alert.deadline.isoformat(timespec="seconds"), "source": alert.source},
+                          ensure_ascii=False)
+        await asyncio.to_thread(self._append, line)
+        return True
+
+
+def sinks_from_env(spec: Optional[str] = None) -> list:
+    """P5S_SINKS=desktop,sound,log:경로 -> 싱크 목록 (워치 제외)"""
+    spec = os.environ.get("P5S_SINKS", "") if spec is None else spec
+    sinks = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        kind, _, arg = item.partition(":")
+        if kind == "desktop":
+            if DesktopSink.available():
+                sinks.append(DesktopSink())
+            else:
+                log.warning("  ⚠️ 데스크톱 알림 명령(notify-send/osascript)이 없음 - desktop 싱크 생략")
+        elif kind == "sound":
+            sinks.append(SoundSink(arg))
+        elif kind == "log":
+            sinks.append(LogSink(arg or ALERT_LOG))
+        else:
+            log.warning(f"  ⚠️ 알 수 없는 싱크: {kind}")
+    return sinks
+
+
+def default_bus(notifier, clock=SYSTEM_CLOCK, latency=TRACKER, dedup=None, sinks: Optional[list] = None) -> AlertBus:
+    """워치 + sinks (None이면 P5S_SINKS 싱크들, 시뮬레이션은 []로 실제 싱크를 안 건드림)"""
+    bus = AlertBus()
+    bus.add(WatchSink(notifier, clock, latency, dedup), timeout=WATCH_TIMEOUT)
+    for sink in sinks_from_env() if sinks is None else sinks:
+        bus.add(sink)
+    return bus
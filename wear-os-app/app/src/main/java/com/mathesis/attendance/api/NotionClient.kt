@@ -16,7 +16,7 @@ import java.util.concurrent.TimeUnit
 class NotionClient(
     private val apiKey: String,
     private val databaseId: String
-) {
+) : StudentSource {
     private val api: NotionApi
 
     init {
@@ -38,7 +38,7 @@ class NotionClient(
 
     suspend fun getTodayStudents(): Result<List<Student>> = getStudentsByDay(getTodayDayKorean())
 
-    suspend fun getStudentsByDay(day: String): Result<List<Student>> = withContext(Dispatchers.IO) {
+    override suspend fun getStudentsByDay(day: String): Result<List<Student>> = withContext(Dispatchers.IO) {
         try {
             val response = api.queryDatabase(databaseId, authorization)
 
@@ -155,7 +155,7 @@ class NotionClient(
         }
     }
 
-    suspend fun recordCheckIn(studentId: String): Result<Boolean> = withContext(Dispatchers.IO) {
+    override suspend fun recordCheckIn(studentId: String): Result<Boolean> = withContext(Dispatchers.IO) {
         try {
             val now = SimpleDateFormat("yyyy-MM-dd HH:mm", Locale.getDefault())
                 .format(Date())
@@ -186,7 +186,7 @@ class NotionClient(
         }
     }
 
-    suspend fun recordCheckOut(studentId: String): Result<Boolean> = withContext(Dispatchers.IO) {
+    override suspend fun recordCheckOut(studentId: String): Result<Boolean> = withContext(Dispatchers.IO) {
         try {
             val now = SimpleDateFormat("yyyy-MM-dd HH:mm", Locale.getDefault())
                 .format(Date())
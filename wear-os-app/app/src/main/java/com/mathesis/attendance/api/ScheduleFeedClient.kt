@@ -0,0 +1,140 @@
+package com.mathesis.attendance.api
+
+import com.google.gson.Gson
+import com.google.gson.JsonObject
+import com.mathesis.attendance.data.Student
+import com.mathesis.attendance.util.TimeUtils
+import kotlinx.coroutines.Dispatchers
+import kotlinx.coroutines.withContext
+import okhttp3.MediaType.Companion.toMediaType
+import okhttp3.OkHttpClient
+import okhttp3.Request
+import okhttp3.RequestBody.Companion.toRequestBody
+import java.io.File
+import java.util.concurrent.TimeUnit
+
+/**
+ * 타이머 런타임의 시간표 피드 (schedule_feed.py)
+ * - 마지막으로 받은 버전을 보내고 변경분만 받음 (gzip은 OkHttp가 알아서 풂)
+ * - 받은 행은 파일에 저장해서 앱을 다시 켜도 이어받음
+ * - 입실/퇴실은 런타임의 출석 아웃박스로 (Notion 업로드는 런타임이)
+ */
+class ScheduleFeedClient(
+    baseUrl: String,
+    private val cacheFile: File
+) : StudentSource {
+    private val baseUrl = baseUrl.trimEnd('/')
+    private val gson = Gson()
+    private val jsonType = "application/json; charset=utf-8".toMediaType()
+
+    private val client = OkHttpClient.Builder()
+        .connectTimeout(5, TimeUnit.SECONDS)
+        .readTimeout(5, TimeUnit.SECONDS)
+        .build()
+
+    // 버전 + 열 이름 + 행 (id -> 값 목록)
+    private class Snapshot(
+        var v: String = "",
+        var cols: List<String> = emptyList(),
+        var rows: MutableMap<String, List<String>> = mutableMapOf()
+    )
+
+    override suspend fun getStudentsByDay(day: String): Result<List<Student>> = withContext(Dispatchers.IO) {
+        try {
+            val snapshot = refresh()
+            val students = snapshot.rows.values
+                .map { toStudent(snapshot.cols, it) }
+                .filter { it.day.contains(day) }
+                .sortedBy { it.startTime }
+            Result.success(students)
+        } catch (e: Exception) {
+            Result.failure(e)
+        }
+    }
+
+    private fun refresh(): Snapshot {
+        val snapshot = loadSnapshot()
+        val since = if (snapshot.v.isNotEmpty()) "?since=${snapshot.v}" else ""
+        val request = Request.Builder().url("$baseUrl/schedule$since").build()
+
+        client.newCall(request).execute().use { response ->
+            if (response.code == 304) return snapshot
+            if (!response.isSuccessful) throw Exception("Feed Error: ${response.code}")
+
+            val body = gson.fromJson(response.body?.string() ?: "", JsonObject::class.java)
+                ?: throw Exception("Empty response")
+            val cols = body.getAsJsonArray("cols").map { it.asString }
+            val idIndex = cols.indexOf("id")
+
+            if (body.has("rows")) {
+                snapshot.rows.clear()
+            }
+            if (body.has("del")) {
+                body.getAsJsonArray("del").forEach { snapshot.rows.remove(it.asString) }
+            }
+            val rows = body.getAsJsonArray(if (body.has("rows")) "rows" else "put")
+            for (row in rows) {
+                val values = row.asJsonArray.map { it.asString }
+                snapshot.rows[values[idIndex]] = values
+            }
+            snapshot.v = body.get("v").asString
+            snapshot.cols = cols
+        }
+
+        saveSnapshot(snapshot)
+        return snapshot
+    }
+
+    private fun toStudent(cols: List<String>, row: List<String>): Student {
+        fun get(key: String) = row.getOrNull(cols.indexOf(key)) ?: ""
+        return Student(
+            id = get("id"),
+            name = get("name"),
+            grade = "",
+            subject = get("room"),
+            day = get("days"),
+            startTime = get("start"),
+            endTime = get("end")
+        )
+    }
+
+    private fun loadSnapshot(): Snapshot {
+        return try {
+            gson.fromJson(cacheFile.readText(), Snapshot::class.java) ?: Snapshot()
+        } catch (e: Exception) {
+            Snapshot()
+        }
+    }
+
+    private fun saveSnapshot(snapshot: Snapshot) {
+        try {
+            cacheFile.writeText(gson.toJson(snapshot))
+        } catch (e: Exception) {
+            // 캐시 저장 실패 -> 다음에 전체를 다시 받으면 됨
+        }
+    }
+
+    override suspend fun recordCheckIn(studentId: String): Result<Boolean> =
+        postAttendance(studentId, "checkIn")
+
+    override suspend fun recordCheckOut(studentId: String): Result<Boolean> =
+        postAttendance(studentId, "checkOut")
+
+    private suspend fun postAttendance(studentId: String, field: String): Result<Boolean> = withContext(Dispatchers.IO) {
+        try {
+            val body = JsonObject().apply {
+                addProperty("id", studentId)
+                addProperty(field, TimeUtils.formatTime(System.currentTimeMillis()))
+            }
+            val request = Request.Builder()
+                .url("$baseUrl/attendance")
+                .post(body.toString().toRequestBody(jsonType))
+                .build()
+            client.newCall(request).execute().use { response ->
+                Result.success(response.isSuccessful)
+            }
+        } catch (e: Exception) {
+            Result.failure(e)
+        }
+    }
+}
@@ -0,0 +1,10 @@
+package com.mathesis.attendance.api
+
+import com.mathesis.attendance.data.Student
+
+// 학생 목록 + 입실/퇴실 기록 (Notion 직접 / 타이머 런타임 시간표 피드)
+interface StudentSource {
+    suspend fun getStudentsByDay(day: String): Result<List<Student>>
+    suspend fun recordCheckIn(studentId: String): Result<Boolean>
+    suspend fun recordCheckOut(studentId: String): Result<Boolean>
+}
@@ -28,6 +28,7 @@ class SettingsActivity : ComponentActivity() {
         lifecycleScope.launch {
             binding.apiKeyInput.setText(preferencesManager.getApiKey())
             binding.dbIdInput.setText(preferencesManager.getDatabaseId())
+            binding.feedUrlInput.setText(preferencesManager.getFeedUrl())
         }
     }
 
@@ -35,8 +36,10 @@ class SettingsActivity : ComponentActivity() {
         binding.saveButton.setOnClickListener {
             val apiKey = binding.apiKeyInput.text.toString().trim()
             val dbId = binding.dbIdInput.text.toString().trim()
+            val feedUrl = binding.feedUrlInput.text.toString().trim()
 
-            if (apiKey.isEmpty() || dbId.isEmpty()) {
+            // 피드 주소가 있으면 Notion 설정 없이도 동작
+            if (feedUrl.isEmpty() && (apiKey.isEmpty() || dbId.isEmpty())) {
                 Toast.makeText(this, "모든 필드를 입력하세요", Toast.LENGTH_SHORT).show()
                 return@setOnClickListener
             }
@@ -44,6 +47,7 @@ class SettingsActivity : ComponentActivity() {
             lifecycleScope.launch {
                 preferencesManager.saveApiKey(apiKey)
                 preferencesManager.saveDatabaseId(dbId)
+                preferencesManager.saveFeedUrl(feedUrl)
                 Toast.makeText(this@SettingsActivity, "저장됨", Toast.LENGTH_SHORT).show()
                 finish()
             }
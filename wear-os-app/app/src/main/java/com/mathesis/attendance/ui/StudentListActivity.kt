@@ -15,18 +15,21 @@ import androidx.recyclerview.widget.LinearLayoutManager
 import androidx.recyclerview.widget.RecyclerView
 import com.mathesis.attendance.R
 import com.mathesis.attendance.api.NotionClient
+import com.mathesis.attendance.api.ScheduleFeedClient
+import com.mathesis.attendance.api.StudentSource
 import com.mathesis.attendance.data.Student
 import com.mathesis.attendance.databinding.ActivityStudentListBinding
 import com.mathesis.attendance.databinding.ItemStudentBinding
 import com.mathesis.attendance.util.PreferencesManager
 import com.mathesis.attendance.util.TimeUtils
 import kotlinx.coroutines.launch
+import java.io.File
 
 class StudentListActivity : ComponentActivity() {
 
     private lateinit var binding: ActivityStudentListBinding
     private lateinit var preferencesManager: PreferencesManager
-    private lateinit var notionClient: NotionClient
+    private lateinit var source: StudentSource
     private val students = mutableListOf<StudentState>()
     private var selectedDay: String = ""
     private lateinit var adapter: StudentAdapter
@@ -80,18 +83,22 @@ class StudentListActivity : ComponentActivity() {
             binding.emptyText.visibility = View.GONE
             binding.studentRecyclerView.visibility = View.GONE
 
+            val feedUrl = preferencesManager.getFeedUrl()
             val apiKey = preferencesManager.getApiKey()
             val dbId = preferencesManager.getDatabaseId()
 
-            if (apiKey.isBlank() || dbId.isBlank()) {
+            if (feedUrl.isNotBlank()) {
+                // 타이머 런타임의 시간표 피드 (변경분만 받음)
+                source = ScheduleFeedClient(feedUrl, File(filesDir, "schedule_feed.json"))
+            } else if (apiKey.isBlank() || dbId.isBlank()) {
                 binding.loadingProgress.visibility = View.GONE
                 binding.emptyText.text = "설정에서 API 키를 입력하세요"
                 binding.emptyText.visibility = View.VISIBLE
                 return@launch
+            } else {
+                source = NotionClient(apiKey, dbId)
             }
-
-            notionClient = NotionClient(apiKey, dbId)
-            val result = notionClient.getStudentsByDay(selectedDay)
+            val result = source.getStudentsByDay(selectedDay)
 
             binding.loadingProgress.visibility = View.GONE
 
@@ -118,7 +125,7 @@ class StudentListActivity : ComponentActivity() {
 
     private fun performCheckIn(state: StudentState) {
         lifecycleScope.launch {
-            val result = notionClient.recordCheckIn(state.student.id)
+            val result = source.recordCheckIn(state.student.id)
             result.fold(
                 onSuccess = {
                     state.status = StudentState.Status.IN_PROGRESS
@@ -136,7 +143,7 @@ class StudentListActivity : ComponentActivity() {
 
     private fun performCheckOut(state: StudentState) {
         lifecycleScope.launch {
-            val result = notionClient.recordCheckOut(state.student.id)
+            val result = source.recordCheckOut(state.student.id)
             result.fold(
                 onSuccess = {
                     state.status = StudentState.Status.COMPLETED
@@ -217,7 +224,8 @@ class StudentListActivity : ComponentActivity() {
             val context = holder.itemView.context
 
             // 이름, 시간 표시
-            holder.binding.nameText.text = "${student.name} (${student.grade})"
+            holder.binding.nameText.text =
+                if (student.grade.isNotBlank()) "${student.name} (${student.grade})" else student.name
             holder.binding.timeText.text = "${student.startTime} - ${student.endTime}"
 
             // 상태에 따른 UI 설정
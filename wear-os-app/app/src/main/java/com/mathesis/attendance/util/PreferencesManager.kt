@@ -17,6 +17,7 @@ class PreferencesManager(private val context: Context) {
     companion object {
         private val API_KEY = stringPreferencesKey("notion_api_key")
         private val DATABASE_ID = stringPreferencesKey("notion_database_id")
+        private val FEED_URL = stringPreferencesKey("schedule_feed_url")
 
         // 테스트용 하드코딩 값 (실제 사용 시 여기에 입력)
         private const val HARDCODED_API_KEY = "YOUR_NOTION_API_KEY_HERE"
@@ -43,6 +44,11 @@ class PreferencesManager(private val context: Context) {
         // return context.dataStore.data.first()[DATABASE_ID] ?: ""
     }
 
+    // 타이머 런타임의 시간표 피드 (예: http://192.168.0.10:8768), 비어 있으면 Notion 직접 조회
+    suspend fun getFeedUrl(): String {
+        return context.dataStore.data.first()[FEED_URL] ?: ""
+    }
+
     suspend fun saveApiKey(apiKey: String) {
         context.dataStore.edit { preferences ->
             preferences[API_KEY] = apiKey
@@ -55,6 +61,12 @@ class PreferencesManager(private val context: Context) {
         }
     }
 
+    suspend fun saveFeedUrl(feedUrl: String) {
+        context.dataStore.edit { preferences ->
+            preferences[FEED_URL] = feedUrl
+        }
+    }
+
     suspend fun isConfigured(): Boolean {
         // 테스트용 하드코딩 사용 시 항상 true
         return true
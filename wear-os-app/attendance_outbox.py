@@ -0,0 +1,304 @@
+"""
+출석 이벤트 아웃박스 + 배치 업로더
+- 타이머는 수업 시작/종료를 로컬 SQLite 아웃박스에 쓰기만 함 (알림 경로는 기다리지 않음)
+- 같은 수업(날짜 + 이름 + 예정시간)의 이벤트는 한 행으로 합침
+  (시작 -> 체크인, 종료 -> 체크아웃/수업시간, 올리기 전에 여러 번 바뀌어도 한 번만 전송)
+- 업로더가 백그라운드에서 배치로 전송, 토큰 버킷으로 초당 3회 제한 (Notion API 제한)
+- 실패하면 지수 백오프로 재시도, 프로그램을 껐다 켜도 아웃박스에 남아 있음
+- 레코드 필드는 Electron 앱 addAttendanceToNotion과 같음 (학년은 타이머가 모르므로 없음)
+  {studentName, date, checkIn, checkOut, duration, scheduledTime}
+
+오프라인 테스트용 서버:
+    python attendance_outbox.py serve --port 8765 [--fail-rate 0.2]
+    P5S_ATTENDANCE_URL=http://127.0.0.1:8765/attendance/batch python student_timer.py
+    python attendance_outbox.py status
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+OUTBOX_PATH = os.environ.get("P5S_OUTBOX", os.path.join(os.path.expanduser("~"), ".p5s", "outbox.sqlite3"))
+
+RATE_PER_SEC = 3.0      # 업로드 요청 수 제한
+BATCH_SIZE = 50
+BASE_BACKOFF = 2.0      # 실패 시 2, 4, 8 ... 초 후 재시도
+MAX_BACKOFF = 300.0
+IDLE_POLL = 5.0         # 새 이벤트 알림이 없어도 이 간격으로 확인 (재시도 대기분)
+
+log = logging.getLogger("p5s.attendance")
+
+
+def attendance_event(name: str, scheduled: datetime, check_in: Optional[datetime] = None,
+                     check_out: Optional[datetime] = None, duration: Optional[int] = None) -> tuple[str, dict]:
+    """수업 하나의 이벤트 -> (아웃박스 키, 바뀐 필드)"""
+    fields = {"studentName": name, "date": f"{scheduled:%Y-%m-%d}", "scheduledTime": f"{scheduled:%H:%M}"}
+    if check_in is not None:
+        fields["checkIn"] = f"{check_in:%H:%M}"
+    if check_out is not None:
+        fields["checkOut"] = f"{check_out:%H:%M}"
+    if duration is not None:
+        fields["duration"] = duration
+    return f"{fields['date']}_{name}_{fields['scheduledTime']}", fields
+
+
+class Outbox:
+    """로컬 SQLite 아웃박스 (키 = 수업 하나)"""
+
+    def __init__(self, path: str = OUTBOX_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")  # 커밋마다 fsync 안 함 (WAL이라 손상은 없음)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                key TEXT PRIMARY KEY,
+                record TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 1,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_try REAL NOT NULL DEFAULT 0,
+                error TEXT
+            )""")
+        self.db.commit()
+        self.on_add: Optional[Callable[[], None]] = None  # 업로더 깨우기
+
+    def add(self, key: str, fields: dict):
+        """이벤트 추가 (같은 키가 아직 안 올라갔으면 필드만 합침)"""
+        row = self.db.execute("SELECT record FROM outbox WHERE key = ?", (key,)).fetchone()
+        record = {**json.loads(row[0]), **fields} if row else fields
+        self.db.execute("""
+            INSERT INTO outbox (key, record) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET record = excluded.record, version = version + 1
+        """, (key, json.dumps(record, ensure_ascii=False)))
+        self.db.commit()
+        if self.on_add:
+            self.on_add()
+
+    def due(self, now: float, limit: int = BATCH_SIZE) -> list[tuple[str, dict, int]]:
+        """지금 보낼 것 [(key, record, version), ...]"""
+        rows = self.db.execute(
+            "SELECT key, record, version FROM outbox WHERE next_try <= ? ORDER BY next_try, rowid LIMIT ?",
+            (now, limit)).fetchall()
+        return [(key, json.loads(record), version) for key, record, version in rows]
+
+    def ack(self, items: list[tuple[str, int]]):
+        """업로드 성공 (올리는 중에 다시 바뀐 행은 남겨서 다음에 또 보냄)"""
+        self.db.executemany("DELETE FROM outbox WHERE key = ? AND version = ?", items)
+        self.db.commit()
+
+    def retry(self, keys: list[str], error: str, now: float, delay: Optional[float] = None):
+        """실패 -> 백오프 후 재시도 (delay가 있으면 그 시간 후)"""
+        self.db.executemany("""
+            UPDATE outbox SET attempts = attempts + 1, error = ?,
+                next_try = ? + coalesce(?, min(?, ? * (1 << min(attempts, 16))))
+            WHERE key = ?
+        """, [(error, now, delay, MAX_BACKOFF, BASE_BACKOFF, key) for key in keys])
+        self.db.commit()
+
+    def next_due(self) -> Optional[float]:
+        row = self.db.execute("SELECT min(next_try) FROM outbox").fetchone()
+        return row[0]
+
+    def __len__(self):
+        return self.db.execute("SELECT count(*) FROM outbox").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+class TokenBucket:
+    """초당 rate개, 최대 capacity개까지 모아 둘 수 있는 토큰"""
+
+    def __init__(self, rate: float = RATE_PER_SEC, capacity: Optional[float] = None, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> float:
+        """토큰을 쓰면 0, 모자라면 기다려야 하는 초"""
+        self._refill()
+        if self.tokens >= 1 - 1e-9:  # 기다린 뒤 부동소수 오차로 1에 살짝 못 미치는 경우
+            self.tokens = max(self.tokens - 1, 0.0)
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def take(self):
+        while (wait := self.try_take()) > 0:
+            await asyncio.sleep(wait)
+
+
+def post_batch(url: str, records: list[dict], timeout: float = 10.0) -> dict:
+    """배치 전송 (블로킹 - 스레드에서 호출). 응답: {"results": [{"key", "ok", "error"}]}"""
+    body = json.dumps({"records": records}, ensure_ascii=False).encode("utf-8")
+    request = urllib.request.Request(url, data=body, method="POST",
+                                     headers={"Content-Type": "application/json; charset=utf-8"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+class AttendanceUploader:
+    """아웃박스 -> 서버 (배치 + 토큰 버킷 + 재시도)"""
+
+    def __init__(self, outbox: Outbox, url: str, rate: float = RATE_PER_SEC,
+                 batch_size: int = BATCH_SIZE, post: Callable = post_batch):
+        self.outbox = outbox
+        self.url = url
+        self.bucket = TokenBucket(rate)
+        self.batch_size = batch_size
+        self.post = post
+        self.uploaded = 0
+        self.failed = 0
+        self.requests = 0
+        self._wake = asyncio.Event()
+        outbox.on_add = self._wake.set
+
+    async def upload_once(self) -> int:
+        """보낼 것 한 배치 전송 (보낸 레코드 수)"""
+        batch = self.outbox.due(time.time(), self.batch_size)
+        if not batch:
+            return 0
+        await self.bucket.take()
+        self.requests += 1
+        records = [{**record, "key": key} for key, record, _ in batch]
+        keys = [key for key, _, _ in batch]
+        try:
+            response = await asyncio.get_running_loop().run_in_executor(None, self.post, self.url, records)
+        except urllib.error.HTTPError as e:
+            retry_after = float(e.headers.get("Retry-After", 0) or 0) if e.code == 429 else None
+            self.outbox.retry(keys, f"HTTP {e.code}", time.time(), retry_after)
+            self.failed += len(keys)
+            log.warning(f"📮 출석 업로드 실패: HTTP {e.code} ({len(keys)}건 재시도 예정)",
+                        extra={"event": "attendance_retry", "count": len(keys)})
+            return 0
+        except (OSError, ValueError) as e:
+            self.outbox.retry(keys, str(e), time.time())
+            self.failed += len(keys)
+            log.warning(f"📮 출석 업로드 실패: {e} ({len(keys)}건 재시도 예정)",
+                        extra={"event": "attendance_retry", "count": len(keys)})
+            return 0
+
+        results = {r.get("key"): r for r in response.get("results", [])}
+        versions = {key: version for key, _, version in batch}
+        done = [(key, versions[key]) for key in keys if results.get(key, {}).get("ok")]
+        failed = [key for key in keys if not results.get(key, {}).get("ok")]
+        self.outbox.ack(done)
+        if failed:
+            self.outbox.retry(failed, "서버 거부", time.time())
+        self.uploaded += len(done)
+        self.failed += len(failed)
+        log.info(f"📮 출석 {len(done)}건 업로드" + (f" / {len(failed)}건 재시도" if failed else ""),
+                 extra={"event": "attendance_upload", "uploaded": len(done), "failed": len(failed)})
+        return len(batch)
+
+    async def run(self):
+        """아웃박스가 빌 때까지 보내고, 새 이벤트나 재시도 시각까지 대기"""
+        while True:
+            self._wake.clear()
+            if await self.upload_once():
+                continue
+            next_due = self.outbox.next_due()
+            timeout = IDLE_POLL if next_due is None else min(IDLE_POLL, max(0.0, next_due - time.time()))
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+def start_uploader(outbox: Outbox, url: Optional[str] = None) -> Optional[asyncio.Task]:
+    """P5S_ATTENDANCE_URL이 있으면 업로더 태스크 시작"""
+    url = url or os.environ.get("P5S_ATTENDANCE_URL")
+    if not url:
+        return None
+    return asyncio.create_task(AttendanceUploader(outbox, url).run(), name="p5s-attendance")
+
+
+# ========== 오프라인 테스트 서버 ==========
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        if self.path.rstrip('/') != "/attendance/batch":
+            self.send_error(404)
+            return
+        with server.lock:
+            wait = server.bucket.try_take()
+        if wait > 0:  # Notion처럼 초과 요청은 429
+            self.send_response(429)
+            self.send_header("Retry-After", f"{wait:.2f}")
+            self.end_headers()
+            server.rejected += 1
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8"))
+        results = []
+        with server.lock:
+            for record in body.get("records", []):
+                ok = random.random() >= server.fail_rate
+                if ok:
+                    server.records[record["key"]] = record
+                results.append({"key": record["key"], "ok": ok, **({} if ok else {"error": "simulated"})})
+        data = json.dumps({"results": results}, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        print(f"{datetime.now():%H:%M:%S}  배치 {len(results)}건 (저장 {len(server.records)}건, 429 {server.rejected}회)")
+
+    def log_message(self, *args):
+        pass
+
+
+def make_server(port: int = 8765, fail_rate: float = 0.0, rate: float = RATE_PER_SEC) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), _StandInHandler)
+    server.lock = threading.Lock()
+    server.bucket = TokenBucket(rate)
+    server.records = {}
+    server.rejected = 0
+    server.fail_rate = fail_rate
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="출석 아웃박스 / 테스트 서버")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="오프라인 테스트 서버")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--fail-rate", type=float, default=0.0, help="레코드별 실패 확률 (재시도 테스트)")
+    sub.add_parser("status", help="아웃박스에 남은 이벤트")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        server = make_server(args.port, args.fail_rate)
+        print(f"📮 테스트 서버: http://127.0.0.1:{args.port}/attendance/batch (초당 {RATE_PER_SEC:g}회 제한)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    else:
+        outbox = Outbox()
+        print(f"📮 {OUTBOX_PATH}: 대기 {len(outbox)}건")
+        for key, record, version in outbox.due(float("inf"), limit=20):
+            print(f"  {key} (v{version}): {record}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,628 @@
+"""
+BLE 트래픽 캡처 / 오프라인 재생
+- P5S_CAPTURE=<폴더> 이면 모든 연결의 write / notify / read / 연결 이벤트를 바이너리 로그로 기록
+  (기기 주소 + 프로세스마다 파일 하나: <폴더>/<주소>-<시각>-<pid>.p5scap)
+- 기록은 미리 늘려 둔 mmap 영역에 struct.pack_into로 바로 씀 -> 전송 경로에 시스템 콜 없음
+  (영역이 차면 1MB씩 늘림, 프로세스가 죽어도 쓴 부분은 파일에 남음)
+- BleakClient를 CaptureClient로 감싸기만 하면 됨 (gatt_cache.connect_cached, p5s_* 스크립트)
+- ReplayClient: 캡처를 BleakClient처럼 재생 (write 비교 + 기록된 응답을 같은 간격으로 돌려줌)
+  P5S_REPLAY=<캡처 파일> 이면 connect_cached가 실제 워치 대신 ReplayClient에 연결
+
+파일 형식 (리틀 엔디언)
+  MAGIC 8바이트, 이후 레코드 반복: 헤더 <dBBH (세션 시작 후 초, 종류, 특성 번호, 길이) + 데이터
+  SESSION: <d 시작 시각(epoch) + 주소 / CHAR: <H 핸들 + UUID (특성 번호 정의)
+  WRITE / NOTIFY / READ: 원본 바이트 / EVENT: UTF-8 텍스트 (connect, disconnect, mtu N, error ...)
+  종류 0 = 파일 끝 (미리 늘려 둔 빈 영역)
+
+사용법: python ble_capture.py index <파일...>
+       python ble_capture.py show <파일> [--kind write,notify] [--char ff03] [--from 초] [--to 초] [--hex 0211]
+       python ble_capture.py replay <파일> [--speed 10]
+"""
+import argparse
+import asyncio
+import atexit
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+MAGIC = b"P5SCAP\x01\n"
+RECORD = struct.Struct("<dBBH")
+SESSION, CHAR, WRITE, NOTIFY, READ, EVENT = 1, 2, 3, 4, 5, 6
+KIND_NAMES = {SESSION: "session", CHAR: "char", WRITE: "write", NOTIFY: "notify", READ: "read", EVENT: "event"}
+ARROWS = {WRITE: "→", NOTIFY: "←", READ: "⇐", EVENT: "•"}
+NO_CHAR = 0xFF
+NO_HANDLE = 0xFFFF
+CHUNK = 1 << 20  # 영역이 차면 이만큼씩 늘림
+SUFFIX = ".p5scap"
+
+log = logging.getLogger("p5s.capture")
+
+
+def capture_dir() -> Optional[str]:
+    path = os.environ.get("P5S_CAPTURE", "")
+    return None if path.lower() in ("", "off") else path
+
+
+def _char_key(char) -> tuple[str, int]:
+    """BleakGATTCharacteristic / UUID 문자열 / 핸들 -> (UUID, 핸들)"""
+    if isinstance(char, int):
+        return f"handle:{char}", char
+    handle = getattr(char, "handle", None)
+    return str(getattr(char, "uuid", char)).lower(), handle if isinstance(handle, int) else NO_HANDLE
+
+
+class Capture:
+    """append-only 캡처 파일 하나 (mmap 영역에 기록)"""
+
+    def __init__(self, path: str, address: str, chunk: int = CHUNK):
+        self.path = path
+        self.chunk = chunk
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        self._map: Optional[mmap.mmap] = None
+        self._size = 0
+        self._pos = 0
+        self._chars: dict = {}
+        self.started = time.perf_counter()
+        self._grow(len(MAGIC))
+        self._map[:len(MAGIC)] = MAGIC
+        self._pos = len(MAGIC)
+        self.record(SESSION, NO_CHAR, struct.pack("<d", time.time()) + address.upper().encode())
+
+    def _grow(self, need: int):
+        size = self._size + max(self.chunk, need)
+        if self._map is not None:
+            self._map.close()
+        os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        self._size = size
+
+    def record(self, kind: int, char: int, data: bytes = b""):
+        data = bytes(data[:0xFFFF])
+        end = self._pos + RECORD.size + len(data)
+        if end > self._size:
+            self._grow(end - self._pos)
+        RECORD.pack_into(self._map, self._pos, time.perf_counter() - self.started, kind, char, len(data))
+        self._map[self._pos + RECORD.size:end] = data
+        self._pos = end
+
+    def event(self, text: str, char: int = NO_CHAR):
+        self.record(EVENT, char, text.encode("utf-8"))
+
+    def char_id(self, char) -> int:
+        """특성 -> 1바이트 번호 (처음 보면 CHAR 레코드로 정의)"""
+        uuid, handle = _char_key(char)
+        cid = self._chars.get(uuid)
+        if cid is None:
+            if len(self._chars) >= NO_CHAR:
+                return NO_CHAR
+            cid = self._chars[uuid] = len(self._chars)
+            self.record(CHAR, cid, struct.pack("<H", handle) + uuid.encode())
+        return cid
+
+    def flush(self):
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self):
+        """쓴 만큼만 남기고 닫기"""
+        if self._map is None:
+            return
+        self._map.close()
+        self._map = None
+        os.ftruncate(self._fd, self._pos)
+        os.close(self._fd)
+
+
+_captures: dict[str, Capture] = {}
+
+
+def capture_for(address: str) -> Optional[Capture]:
+    """P5S_CAPTURE가 켜져 있으면 이 기기의 캡처 파일 (프로세스 안에서 재연결해도 같은 파일)"""
+    folder = capture_dir()
+    if folder is None:
+        return None
+    key = address.upper()
+    capture = _captures.get(key)
+    if capture is None:
+        os.makedirs(folder, exist_ok=True)
+        name = f"{key.replace(':', '')}-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}{SUFFIX}"
+        capture = _captures[key] = Capture(os.path.join(folder, name), key)
+        log.info(f"📼 BLE 캡처: {capture.path}")
+    return capture
+
+
+@atexit.register
+def close_all():
+    for capture in _captures.values():
+        capture.close()
+    _captures.clear()
+
+
+class CaptureClient:
+    """BleakClient 감싸기 - write/notify/read/연결을 기록하고 나머지는 그대로 넘김"""
+
+    def __init__(self, client, capture: Capture):
+        self._client = client
+        self._capture = capture
+        self._mtu = None  # 이 연결에서 기록한 MTU (연결마다 한 번, 바뀌면 다시)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.disconnect()
+
+    async def connect(self, **kwargs):
+        try:
+            result = await self._client.connect(**kwargs)
+        except Exception as e:
+            self._capture.event(f"connect failed {type(e).__name__}: {e}")
+            raise
+        self._mtu = None
+        self._capture.event("connect")
+        return result
+
+    async def disconnect(self):
+        self._capture.event("disconnect")
+        try:
+            return await self._client.disconnect()
+        finally:
+            self._capture.flush()
+
+    @property
+    def mtu_size(self) -> int:
+        mtu = self._client.mtu_size
+        if mtu != self._mtu:
+            self._mtu = mtu
+            self._capture.event(f"mtu {mtu}")
+        return mtu
+
+    async def write_gatt_char(self, char, data, *args, **kwargs):
+        cid = self._capture.char_id(char)
+        self._capture.record(WRITE, cid, data)
+        try:
+            return await self._client.write_gatt_char(char, data, *args, **kwargs)
+        except Exception as e:
+            self._capture.event(f"error {type(e).__name__}: {e}", cid)
+            if not self._client.is_connected:
+                self._capture.event("dropped", cid)
+            raise
+
+    async def read_gatt_char(self, char, *args, **kwargs):
+        data = await self._client.read_gatt_char(char, *args, **kwargs)
+        self._capture.record(READ, self._capture.char_id(char), data)
+        return data
+
+    async def start_notify(self, char, callback, **kwargs):
+        capture = self._capture
+        cid = capture.char_id(char)
+        if asyncio.iscoroutinefunction(callback):
+            async def handler(sender, data):
+                capture.record(NOTIFY, cid, data)
+                await callback(sender, data)
+        else:
+            def handler(sender, data):
+                capture.record(NOTIFY, cid, data)
+                return callback(sender, data)
+        return await self._client.start_notify(char, handler, **kwargs)
+
+
+def capture_client(client, address: str):
+    """캡처가 꺼져 있으면 client 그대로"""
+    capture = capture_for(address)
+    return client if capture is None else CaptureClient(client, capture)
+
+
+# ---- 읽기 / 색인 / 필터 ----
+
+@dataclass(frozen=True)
+class Record:
+    t: float        # 세션 시작 후 초
+    kind: int
+    char: str       # 특성 UUID ("" = 없음)
+    data: bytes
+    offset: int     # 파일 안 위치
+
+    @property
+    def text(self) -> str:
+        return self.data.decode("utf-8", errors="replace")
+
+
+@dataclass
+class CaptureFile:
+    path: str
+    address: str
+    started: datetime
+    records: list[Record]
+    handles: dict[str, int]
+    truncated: bool = False  # 정상 종료 전 끊긴 파일 (미리 늘린 빈 영역이 남음)
+
+    def at(self, record: Record) -> datetime:
+        return datetime.fromtimestamp(self.started.timestamp() + record.t)
+
+
+def read_capture(path: str) -> CaptureFile:
+    with open(path, "rb") as f:
+        blob = f.read()
+    if not blob.startswith(MAGIC):
+        raise ValueError(f"캡처 파일이 아님: {path}")
+    view = memoryview(blob)
+    chars: dict[int, str] = {}
+    handles: dict[str, int] = {}
+    records = []
+    address, started = "", datetime.fromtimestamp(0)
+    pos, truncated = len(MAGIC), False
+    while pos + RECORD.size <= len(blob):
+        t, kind, cid, length = RECORD.unpack_from(blob, pos)
+        start, end = pos + RECORD.size, pos + RECORD.size + length
+        if kind == 0 or end > len(blob):
+            truncated = True
+            break
+        data = bytes(view[start:end])
+        if kind == SESSION:
+            started = datetime.fromtimestamp(struct.unpack_from("<d", data)[0])
+            address = data[8:].decode()
+        elif kind == CHAR:
+            uuid = data[2:].decode()
+            chars[cid] = uuid
+            handles[uuid] = struct.unpack_from("<H", data)[0]
+        else:
+            records.append(Record(t, kind, chars.get(cid, ""), data, pos))
+        pos = end
+    return CaptureFile(path, address, started, records, handles, truncated)
+
+
+def filter_records(records: Iterable[Record], kinds: Optional[set[int]] = None, char: str = "",
+                   start: Optional[float] = None, end: Optional[float] = None,
+                   contains: bytes = b"") -> Iterator[Record]:
+    for record in records:
+        if kinds and record.kind not in kinds:
+            continue
+        if char and char not in record.char:
+            continue
+        if (start is not None and record.t < start) or (end is not None and record.t > end):
+            continue
+        if contains and contains not in record.data:
+            continue
+        yield record
+
+
+class FrameDecoder:
+    """ff02 write 패킷 -> 설명 / 다 모이면 알림 문자열 (frame_layout.build_frame 역변환)"""
+
+    def __init__(self):
+        self._chunks: dict[int, bytes] = {}  # seq -> 데이터 (재전송이면 덮어씀)
+        self._length = 0
+
+    def feed(self, data: bytes) -> tuple[str, Optional[str]]:
+        if data[:2] != b"\x02\x11":
+            return "", None
+        seq = data[2] | data[3] << 8 if len(data) >= 4 else -1
+        if self._chunks and 0 < seq <= len(self._chunks):
+            note = f"{'재전송' if seq in self._chunks else '후속'} #{seq}"
+            self._chunks[seq] = data[4:]
+        elif len(data) >= 13 and data[6] == 0x01 and data[8:12] == b"\x00\x00\x01\x01":
+            self._length = int.from_bytes(data[2:6], "little")
+            self._chunks = {0: data[13:13 + data[12]]}
+            note = f"첫 패킷 type={data[7]} {self._length}B"
+        else:
+            return "?", None
+        if sum(map(len, self._chunks.values())) >= self._length:
+            content = b"".join(self._chunks[i] for i in sorted(self._chunks))
+            self._chunks = {}
+            return note, content[:self._length].decode("utf-8", errors="replace")
+        return note, None
+
+
+def index(capture: CaptureFile) -> dict:
+    """캡처 요약: 종류별 건수/바이트, 특성별 건수, 연결 수, 오류, 알림 메시지 수"""
+    kinds: dict[str, list[int]] = {}
+    chars: dict[str, int] = {}
+    connects = errors = messages = 0
+    decoder = FrameDecoder()
+    for record in capture.records:
+        stats = kinds.setdefault(KIND_NAMES[record.kind], [0, 0])
+        stats[0] += 1
+        stats[1] += len(record.data)
+        if record.char:
+            chars[record.char] = chars.get(record.char, 0) + 1
+        if record.kind == EVENT:
+            connects += record.text == "connect"
+            errors += record.text.startswith(("error", "connect failed"))
+        elif record.kind == WRITE and decoder.feed(record.data)[1] is not None:
+            messages += 1
+    duration = capture.records[-1].t if capture.records else 0.0
+    return {"path": capture.path, "address": capture.address, "started": capture.started.isoformat(" ", "seconds"),
+            "duration": round(duration, 3), "kinds": kinds, "chars": chars, "connects": connects,
+            "errors": errors, "messages": messages, "truncated": capture.truncated}
+
+
+def format_record(record: Record, note: str = "") -> str:
+    if record.kind == EVENT:
+        body = record.text
+    else:
+        body = record.data.hex()
+    char = record.char[4:8] if len(record.char) == 36 else record.char
+    line = f"{record.t:10.3f}  {ARROWS[record.kind]} {char:>4}  {body}"
+    return f"{line}  [{note}]" if note else line
+
+
+# ---- 재생 ----
+
+class _ReplayChar:
+    def __init__(self, uuid: str, handle: int):
+        self.uuid = uuid
+        self.handle = None if handle == NO_HANDLE else handle
+        self.properties: list[str] = []
+        self.descriptors: list = []
+
+
+class _ReplayService:
+    uuid = "replay"
+    handle = 0
+
+    def __init__(self, chars: list[_ReplayChar]):
+        self.characteristics = chars
+
+
+class ReplayServices:
+    """캡처에 나온 특성만 있는 서비스 목록 (gatt_cache.resolve / snapshot_services용)"""
+
+    def __init__(self, handles: dict[str, int]):
+        self._chars = {uuid: _ReplayChar(uuid, handle) for uuid, handle in handles.items()}
+
+    def get_characteristic(self, uuid):
+        return self._chars.get(str(getattr(uuid, "uuid", uuid)).lower())
+
+    def __iter__(self):
+        return iter([_ReplayService(list(self._chars.values()))])
+
+
+class ReplayClient:
+    """
+    캡처를 BleakClient처럼 재생
+    - write: 다음 기록된 write와 비교 (다르면 mismatches에 남김)
+      기록된 오류면 같은 오류를 냄, 그 뒤 끊겼으면 is_connected=False
+    - write 뒤에 온 notify를 원래 간격 / speed로 콜백에 전달
+    - connect: 다음 connect 이벤트로 (기록된 연결 실패면 같은 실패)
+    """
+
+    def __init__(self, capture: CaptureFile, speed: float = 1.0):
+        self.capture = capture
+        self.address = capture.address
+        self.speed = speed
+        self.services = ReplayServices(capture.handles)
+        self.is_connected = False
+        self.mtu_size = 23
+        self.mismatches: list[tuple[int, bytes, bytes]] = []  # (파일 위치, 기록, 실제)
+        self.writes = 0
+        self._records = capture.records
+        self._cursor = 0
+        self._callbacks: dict[str, object] = {}
+        self._pending: set[asyncio.TimerHandle] = set()
+
+    @classmethod
+    def from_file(cls, path: str, speed: float = 1.0) -> "ReplayClient":
+        return cls(read_capture(path), speed)
+
+    @property
+    def finished(self) -> bool:
+        return self._cursor >= len(self._records)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.disconnect()
+
+    def _seek(self, predicate) -> Optional[int]:
+        for i in range(self._cursor, len(self._records)):
+            if predicate(self._records[i]):
+                return i
+        return None
+
+    def _apply_events(self, until: int):
+        """cursor ~ until 사이 mtu 이벤트 반영"""
+        for record in self._records[self._cursor:until]:
+            if record.kind == EVENT and record.text.startswith("mtu "):
+                self.mtu_size = int(record.text[4:])
+
+    async def connect(self, **kwargs):
+        i = self._seek(lambda r: r.kind == EVENT and (r.text == "connect" or r.text.startswith("connect failed")))
+        if i is None:
+            raise ConnectionError("캡처 재생: 더 이상 기록된 연결이 없음")
+        record = self._records[i]
+        self._cursor = i + 1
+        if record.text != "connect":
+            raise ConnectionError(f"캡처 재생: {record.text}")
+        end = self._seek(lambda r: r.kind in (WRITE, READ) or (r.kind == EVENT and r.text == "connect"))
+        self._apply_events(len(self._records) if end is None else end)
+        self.is_connected = True
+        return True
+
+    async def disconnect(self):
+        self.is_connected = False
+        for handle in self._pending:
+            handle.cancel()
+        self._pending.clear()
+        return True
+
+    async def start_notify(self, char, callback, **kwargs):
+        self._callbacks[_char_key(char)[0]] = callback
+
+    async def stop_notify(self, char):
+        self._callbacks.pop(_char_key(char)[0], None)
+
+    async def read_gatt_char(self, char, *args, **kwargs):
+        uuid = _char_key(char)[0]
+        i = self._seek(lambda r: r.kind == READ and r.char == uuid)
+        if i is None:
+            return b""
+        return self._records[i].data
+
+    def _deliver(self, record: Record):
+        callback = self._callbacks.get(record.char)
+        if callback is None or not self.is_connected:
+            return
+        result = callback(self.services.get_characteristic(record.char), bytearray(record.data))
+        if asyncio.iscoroutine(result):
+            asyncio.ensure_future(result)
+
+    async def write_gatt_char(self, char, data, *args, **kwargs):
+        if not self.is_connected:
+            raise ConnectionError("캡처 재생: 연결 안 됨")
+        i = self._seek(lambda r: r.kind == WRITE or (r.kind == EVENT and r.text == "connect"))
+        if i is None or self._records[i].kind != WRITE:
+            self.is_connected = False
+            raise ConnectionError("캡처 재생: 이 연결에서 기록된 write가 더 없음")
+        written = self._records[i]
+        self.writes += 1
+        if bytes(data) != written.data:
+            self.mismatches.append((written.offset, written.data, bytes(data)))
+            log.info(f"📼 write 불일치 @{written.offset}: 기록 {written.data.hex()} / 실제 {bytes(data).hex()}")
+
+        loop = asyncio.get_running_loop()
+        error = None
+        self._cursor = i + 1
+        for record in self._records[i + 1:]:
+            if record.kind == WRITE or (record.kind == EVENT and record.text == "connect"):
+                break
+            self._cursor += 1
+            if record.kind == NOTIFY:
+                delay = max(0.0, (record.t - written.t) / self.speed)
+                handle = loop.call_later(delay, self._deliver, record)
+                self._pending.add(handle)
+            elif record.kind == EVENT:
+                if record.text.startswith("error"):
+                    error = record.text
+                elif record.text.startswith("mtu "):
+                    self.mtu_size = int(record.text[4:])
+                elif record.text == "dropped":
+                    self.is_connected = False
+                    break
+                elif record.text == "disconnect":
+                    break
+        self._pending = {h for h in self._pending if not h.cancelled()}
+        if error is not None:
+            raise OSError(f"캡처 재생: {error}")
+
+
+_replays: dict[str, ReplayClient] = {}
+
+
+def replay_path() -> Optional[str]:
+    return os.environ.get("P5S_REPLAY") or None
+
+
+def replay_client(path: str) -> ReplayClient:
+    """P5S_REPLAY용 - 재연결해도 같은 client로 캡처를 이어서 재생"""
+    client = _replays.get(path)
+    if client is None:
+        client = _replays[path] = ReplayClient.from_file(path, float(os.environ.get("P5S_REPLAY_SPEED", "1")))
+        log.info(f"📼 캡처 재생: {path} ({client.address})")
+    return client
+
+
+async def _replay(path: str, speed: float):
+    """캡처의 write를 그대로 ReplayClient에 다시 보내고 응답 / 불일치 출력"""
+    capture = read_capture(path)
+    client = ReplayClient(capture, speed)
+    decoder = FrameDecoder()
+    start = time.perf_counter()
+
+    def on_notify(sender, data):
+        elapsed = (time.perf_counter() - start) * speed  # 캡처 시간 기준
+        print(f"{elapsed:10.3f}  ← {sender.uuid[4:8]}  {bytes(data).hex()}")
+
+    connects = [i for i, r in enumerate(capture.records) if r.kind == EVENT and r.text == "connect"]
+    for n, first in enumerate(connects):
+        end = connects[n + 1] if n + 1 < len(connects) else len(capture.records)
+        try:
+            await client.connect()
+        except ConnectionError as e:
+            print(f"  ❌ {e}")
+            continue
+        for uuid in {r.char for r in capture.records[first:end] if r.kind == NOTIFY}:
+            await client.start_notify(uuid, on_notify)
+        previous = capture.records[first].t
+        for record in capture.records[first:end]:
+            if record.kind != WRITE:
+                continue
+            await asyncio.sleep(max(0.0, (record.t - previous) / speed))
+            previous = record.t
+            note, message = decoder.feed(record.data)
+            print(format_record(record, note))
+            if message is not None:
+                print(f"{'':10}  💬 {message}")
+            try:
+                await client.write_gatt_char(record.char, record.data, response=True)
+            except Exception as e:
+                print(f"{'':10}  ❌ {e}")
+            if not client.is_connected:
+                break
+        await asyncio.sleep(1.0 / speed)
+        await client.disconnect()
+    print("-" * 40)
+    print(f"write {client.writes}건 / 불일치 {len(client.mismatches)}건")
+
+
+def _parse_kinds(text: str) -> set[int]:
+    names = {name: kind for kind, name in KIND_NAMES.items()}
+    return {names[name.strip()] for name in text.split(",") if name.strip()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="P5S BLE 캡처 색인 / 필터 / 재생")
+    commands = parser.add_subparsers(dest="command", required=True)
+    p_index = commands.add_parser("index", help="캡처 요약")
+    p_index.add_argument("paths", nargs="+")
+    p_show = commands.add_parser("show", help="레코드 출력 (필터)")
+    p_show.add_argument("path")
+    p_show.add_argument("--kind", default="", help="write,notify,read,event")
+    p_show.add_argument("--char", default="", help="특성 UUID 일부 (예: ff03)")
+    p_show.add_argument("--from", dest="start", type=float, help="세션 시작 후 초")
+    p_show.add_argument("--to", dest="end", type=float)
+    p_show.add_argument("--hex", default="", help="데이터에 포함된 바이트 (hex)")
+    p_replay = commands.add_parser("replay", help="ReplayClient로 다시 재생")
+    p_replay.add_argument("path")
+    p_replay.add_argument("--speed", type=float, default=1.0, help="배속")
+    args = parser.parse_args()
+
+    if args.command == "index":
+        for path in args.paths:
+            info = index(read_capture(path))
+            print(f"📼 {info['path']}  {info['address']}  {info['started']}  ({info['duration']:.1f}초)"
+                  + ("  [비정상 종료]" if info["truncated"] else ""))
+            for kind, (count, size) in info["kinds"].items():
+                print(f"   {kind:7} {count:6d}건 {size:8d}B")
+            for char, count in info["chars"].items():
+                print(f"   {char}  {count}건")
+            print(f"   연결 {info['connects']}회 / 오류 {info['errors']}건 / 알림 {info['messages']}건")
+    elif args.command == "show":
+        capture = read_capture(args.path)
+        print(f"📼 {capture.address}  {capture.started.isoformat(' ', 'seconds')}")
+        decoder = FrameDecoder()
+        records = filter_records(capture.records, _parse_kinds(args.kind), args.char.lower(),
+                                 args.start, args.end, bytes.fromhex(args.hex))
+        for record in records:
+            note, message = decoder.feed(record.data) if record.kind == WRITE else ("", None)
+            print(format_record(record, note))
+            if message is not None:
+                print(f"{'':10}  💬 {message}")
+    else:
+        asyncio.run(_replay(args.path, args.speed))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
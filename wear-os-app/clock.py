@@ -0,0 +1,86 @@
+"""
+시계 주입 + 가상 시간 이벤트 루프
+- SystemClock: 실제 시간 (기본값)
+- VirtualTimeLoop: asyncio.sleep이 실제로 기다리지 않고 시간을 건너뜀
+- LoopClock: 이벤트 루프 시간 기준 datetime (가상 루프와 함께 쓰면 시뮬레이션 시계)
+
+같은 타이머 코드를 하루치 시간표로 1초 안에 돌려볼 수 있음 (replay.py)
+"""
+import asyncio
+import selectors
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class SystemClock:
+    """실제 시계"""
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+class LoopClock:
+    """이벤트 루프 시간(loop.time()) 기준 시계"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, start: datetime):
+        self.loop = loop
+        self.start = start
+        self._base = loop.time()
+
+    def now(self) -> datetime:
+        return self.start + timedelta(seconds=self.loop.time() - self._base)
+
+
+class _WarpSelector:
+    """
+    대기할 I/O가 없으면 기다리는 대신 가상 시간을 timeout만큼 앞으로 당김
+    (실제 fd는 매번 0초 timeout으로 확인)
+    """
+
+    def __init__(self, selector: selectors.BaseSelector, loop: "VirtualTimeLoop"):
+        self._selector = selector
+        self._loop = loop
+
+    def select(self, timeout: Optional[float] = None):
+        if timeout is None:  # 예약된 콜백이 없음 -> 실제 I/O를 기다림
+            return self._selector.select(None)
+        events = self._selector.select(0)
+        if not events and timeout > 0:
+            self._loop.advance(timeout)
+        return events
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """가상 시간 이벤트 루프 (sleep/call_later가 즉시 진행)"""
+
+    def __init__(self):
+        super().__init__()
+        self._virtual_time = 0.0
+        self._selector = _WarpSelector(self._selector, self)
+
+    def time(self) -> float:
+        return self._virtual_time
+
+    def advance(self, seconds: float):
+        self._virtual_time += seconds
+
+
+def run_virtual(coro_factory, start: datetime):
+    """
+    가상 시간으로 코루틴 실행
+    coro_factory(clock) -> 코루틴  (clock은 start부터 시작하는 LoopClock)
+    """
+    loop = VirtualTimeLoop()
+    try:
+        asyncio.set_event_loop(loop)
+        clock = LoopClock(loop, start)
+        return loop.run_until_complete(coro_factory(clock))
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
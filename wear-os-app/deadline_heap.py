@@ -0,0 +1,157 @@
+"""
+마감 시각 힙 (TimerManager 스케줄러용)
+- 타이머마다 태스크를 만드는 대신 힙 하나 + 스케줄러 태스크 하나
+- push / 연장: O(log n), 취소: O(1) (지연 삭제 - 힙 맨 앞에 올 때 버림)
+- 전체 이동(shift): 힙에는 '기준 시각'을 넣고 오프셋만 바꿈 -> O(1)
+  (모든 마감이 같은 만큼 움직이니 힙 순서는 그대로)
+- 묶음 이동(shift_group): 항목은 묶음(TimerManager는 태그 조합)별 힙에 들어 있고
+  바깥 힙에는 묶음마다 맨 앞 마감 하나만 -> 묶음 오프셋을 바꾸고 바깥 힙에 다시 넣음, O(log n)
+  (묶음 안의 순서는 그대로라 항목 수와 무관)
+- 버린 항목이 살아 있는 항목보다 많아지면 한 번에 다시 쌓음
+"""
+import heapq
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+
+class _Bucket:
+    """묶음 하나: (기준 시각, 순번, 항목) 힙 + 묶음 오프셋"""
+    __slots__ = ("heap", "offset")
+
+    def __init__(self):
+        self.heap: list = []
+        self.offset = timedelta(0)
+
+
+class DeadlineHeap(Generic[T]):
+    """항목 -> 마감 시각 (항목 하나당 살아 있는 힙 항목은 하나, 항목은 묶음 하나에 속함)"""
+
+    def __init__(self):
+        self._buckets: dict[Hashable, _Bucket] = {}
+        self._heads: list[tuple[datetime, int, Hashable]] = []  # (묶음 맨 앞 기준 시각, 순번, 묶음)
+        self._head_seq: dict[Hashable, int] = {}                 # 묶음 -> 바깥 힙의 살아 있는 순번
+        self._live: dict[T, int] = {}                            # 항목 -> 살아 있는 순번
+        self._base: dict[T, datetime] = {}
+        self._group: dict[T, Hashable] = {}
+        self._seq = count()
+        self._entries = 0
+        self.offset = timedelta(0)
+
+    def push(self, item: T, deadline: datetime, group: Hashable = None):
+        """추가 또는 마감 변경 (이전 힙 항목은 지연 삭제)"""
+        bucket = self._buckets.get(group)
+        if bucket is None:
+            bucket = self._buckets[group] = _Bucket()
+        seq = next(self._seq)
+        base = deadline - self.offset - bucket.offset
+        self._live[item] = seq
+        self._base[item] = base
+        self._group[item] = group
+        heapq.heappush(bucket.heap, (base, seq, item))
+        self._entries += 1
+        if bucket.heap[0][1] == seq:
+            self._index(group)  # 묶음 맨 앞이 바뀜
+        self._compact()
+
+    def discard(self, item: T):
+        self._live.pop(item, None)
+        self._base.pop(item, None)
+        self._group.pop(item, None)
+        self._compact()
+
+    def deadline(self, item: T) -> Optional[datetime]:
+        base = self._base.get(item)
+        return None if base is None else base + self._buckets[self._group[item]].offset + self.offset
+
+    def shift(self, delta: timedelta):
+        """전체 마감을 delta만큼 이동"""
+        self.offset += delta
+
+    def shift_group(self, group: Hashable, delta: timedelta):
+        """묶음 하나의 마감을 delta만큼 이동 (없는 묶음이면 무시)"""
+        bucket = self._buckets.get(group)
+        if bucket is not None:
+            bucket.offset += delta
+            self._index(group)
+
+    @property
+    def groups(self) -> list[Hashable]:
+        """항목이 들어 있을 수 있는 묶음들 (지연 삭제로 빈 묶음이 잠깐 남을 수 있음)"""
+        return list(self._buckets)
+
+    def _stale(self, entry) -> bool:
+        return self._live.get(entry[2]) != entry[1]
+
+    def _index(self, group: Hashable):
+        """묶음 맨 앞의 버린 항목을 치우고 바깥 힙에 맨 앞 마감을 다시 넣음 (빈 묶음은 지움)"""
+        bucket = self._buckets[group]
+        while bucket.heap and self._stale(bucket.heap[0]):
+            heapq.heappop(bucket.heap)
+            self._entries -= 1
+        if not bucket.heap:
+            del self._buckets[group]
+            self._head_seq.pop(group, None)
+            return
+        seq = self._head_seq[group] = next(self._seq)
+        heapq.heappush(self._heads, (bucket.heap[0][0] + bucket.offset, seq, group))
+
+    def _top(self) -> Optional[_Bucket]:
+        """가장 이른 살아 있는 항목이 든 묶음"""
+        while self._heads:
+            _, seq, group = self._heads[0]
+            if self._head_seq.get(group) != seq:
+                heapq.heappop(self._heads)
+                continue
+            bucket = self._buckets[group]
+            if self._stale(bucket.heap[0]):
+                heapq.heappop(self._heads)
+                self._index(group)
+                continue
+            return bucket
+        return None
+
+    def _compact(self):
+        if self._entries + len(self._heads) > 2 * len(self._live) + 16:
+            buckets, self._buckets = self._buckets, {}
+            self._heads, self._head_seq, self._entries = [], {}, 0
+            for group, bucket in buckets.items():
+                bucket.heap = [entry for entry in bucket.heap if not self._stale(entry)]
+                if bucket.heap:
+                    heapq.heapify(bucket.heap)
+                    self._buckets[group] = bucket
+                    self._entries += len(bucket.heap)
+                    self._index(group)
+
+    def peek(self) -> Optional[datetime]:
+        """가장 이른 마감 (없으면 None)"""
+        bucket = self._top()
+        return None if bucket is None else bucket.heap[0][0] + bucket.offset + self.offset
+
+    def pop_due(self, now: datetime) -> list[tuple[datetime, T]]:
+        """now까지 마감된 [(마감 시각, 항목), ...] (마감 순)"""
+        due = []
+        limit = now - self.offset
+        while (bucket := self._top()) is not None and bucket.heap[0][0] + bucket.offset <= limit:
+            base, _, item = heapq.heappop(bucket.heap)
+            self._entries -= 1
+            group = self._group.pop(item)
+            del self._live[item]
+            del self._base[item]
+            due.append((base + bucket.offset + self.offset, item))
+            heapq.heappop(self._heads)
+            self._index(group)
+        return due
+
+    def __contains__(self, item) -> bool:
+        return item in self._live
+
+    def __len__(self):
+        return len(self._live)
+
+    @property
+    def entries(self) -> int:
+        """힙에 실제로 들어 있는 항목 수 (지연 삭제된 것 포함)"""
+        return self._entries
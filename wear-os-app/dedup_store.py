@@ -0,0 +1,86 @@
+"""
+알림 중복 방지 / 쿨다운 공용 저장소 (SQLite WAL)
+- 여러 프로세스(Python 타이머들, Electron -> watch-send.py)가 같은 파일을 같이 사용
+- claim(key, ttl): 키가 없거나 만료됐으면 잡고 True, 아직 살아 있으면 False
+  INSERT ... ON CONFLICT DO UPDATE ... WHERE 만료 한 문장이라 프로세스 간에도 원자적
+- 만료 시각 인덱스로 주기적으로 지난 키 삭제
+- 재시작해도 남아 있음 -> 같은 "5분 전" 알림이 두 번 가지 않음
+
+키 종류
+- 쿨다운: msg:<워치 주소>:<메시지>  (Electron NOTIFICATION_COOLDOWN과 같은 5분)
+- 수업 이벤트: alert:<학생>:<날짜_시간_종류>  (이틀 보관)
+
+파일: ~/.p5s/dedup.sqlite3 (P5S_DEDUP 환경변수로 변경, "off"면 사용 안 함)
+electron-app/watch-send.py의 --dedup-key와 같은 테이블 형식
+"""
+import os
+import sqlite3
+import time
+from typing import Optional
+
+DEDUP_PATH = os.environ.get("P5S_DEDUP", os.path.join(os.path.expanduser("~"), ".p5s", "dedup.sqlite3"))
+
+COOLDOWN_SECONDS = 5 * 60
+ALERT_TTL = 2 * 24 * 3600
+SWEEP_INTERVAL = 60.0
+BUSY_TIMEOUT_MS = 1000
+
+
+def cooldown_key(address: str, message: str) -> str:
+    return f"msg:{address.upper()}:{message}"
+
+
+class DedupStore:
+    """TTL 키 저장소"""
+
+    def __init__(self, path: str = DEDUP_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # isolation_level=None: 문장마다 바로 커밋 (claim 한 번 = 트랜잭션 한 번)
+        self.db = sqlite3.connect(path, isolation_level=None, timeout=BUSY_TIMEOUT_MS / 1000)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS dedup (key TEXT PRIMARY KEY, expires REAL NOT NULL) WITHOUT ROWID")
+        self.db.execute("CREATE INDEX IF NOT EXISTS dedup_expires ON dedup (expires)")
+        self.last_sweep = 0.0
+
+    def claim(self, key: str, ttl: float, now: Optional[float] = None) -> bool:
+        """키를 잡으면 True (이미 누가 잡았고 아직 안 만료됐으면 False)"""
+        now = time.time() if now is None else now
+        if now - self.last_sweep >= SWEEP_INTERVAL:
+            self.sweep(now)
+        cursor = self.db.execute("""
+            INSERT INTO dedup (key, expires) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET expires = excluded.expires WHERE dedup.expires <= ?
+        """, (key, now + ttl, now))
+        return cursor.rowcount == 1
+
+    def release(self, key: str):
+        """전송 실패 등으로 잡은 키를 되돌림"""
+        self.db.execute("DELETE FROM dedup WHERE key = ?", (key,))
+
+    def seen(self, key: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return self.db.execute("SELECT 1 FROM dedup WHERE key = ? AND expires > ?", (key, now)).fetchone() is not None
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """만료된 키 삭제"""
+        now = time.time() if now is None else now
+        self.last_sweep = now
+        return self.db.execute("DELETE FROM dedup WHERE expires <= ?", (now,)).rowcount
+
+    def __len__(self):
+        return self.db.execute("SELECT count(*) FROM dedup").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+def open_store(path: str = DEDUP_PATH) -> Optional[DedupStore]:
+    """P5S_DEDUP=off 이면 None (프로세스 안의 alerted_times만 사용)"""
+    if path == "off":
+        return None
+    try:
+        return DedupStore(path)
+    except sqlite3.Error:
+        return None
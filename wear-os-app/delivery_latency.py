@@ -0,0 +1,106 @@
+"""
+알림 도착 지연 추정 + 미리 보내기
+- 워치별로 최근 전송 N건의 지연(전송 시작 ~ 마지막 패킷 write 완료)을 보관
+  연결 상태(이미 연결됨 / 연결부터) x 패킷 수별로 따로 -> p50 / p95
+- 스케줄러는 마감 시각에서 추정 지연(p50)만큼 먼저 보냄 -> 마지막 패킷이 마감에 맞게 도착
+- 샘플이 부족하면: 같은 연결 상태 전체 -> 그래도 없으면 기본값 (연결 6초 + 패킷당 0.08초)
+- 실제 도착 시각 - 마감 시각 오차도 보관해서 정확도 리포트
+
+기록은 WatchNotifier.send_notification이 (TRACKER 하나를 프로세스 전체가 같이 씀)
+"""
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Optional
+
+from frame_layout import LEGACY, encode_message
+
+WINDOW = 50              # 버킷당 최근 샘플 수
+MIN_SAMPLES = 3          # 이보다 적으면 상위 버킷/기본값 사용
+LEAD_QUANTILE = 0.5      # 이만큼 먼저 보냄 (p50 -> 도착이 마감 앞뒤로 고르게)
+MAX_LEAD = 30.0          # 추정이 튀어도 이 이상 당기지 않음 (초)
+MAX_PACKET_BUCKET = 8    # 패킷 수 버킷 (이상은 하나로)
+
+# 샘플이 없을 때 기본값 (초): 고정 + 패킷당
+PRIOR_WARM = (0.1, 0.08)
+PRIOR_COLD = (6.0, 0.08)   # 스캔 + 연결 + 서비스 조회
+
+
+def quantile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def packet_count(notifier, message: str) -> int:
+    """notifier가 지금 레이아웃으로 보낼 때의 패킷 수 (모르면 기존 7/16 기준)"""
+    count = getattr(notifier, "packet_count", None)
+    return count(message) if count else LEGACY.packet_count(len(encode_message(message)))
+
+
+def _state(connected: bool) -> str:
+    return "warm" if connected else "cold"
+
+
+class LatencyTracker:
+    """워치별 전송 지연 (연결 상태 x 패킷 수) + 도착 오차"""
+
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self.samples: dict[str, dict[tuple, deque]] = defaultdict(dict)  # 주소 -> (상태, 패킷) -> 초
+        self.errors: dict[str, deque] = defaultdict(lambda: deque(maxlen=self.window * 4))
+
+    def record(self, address: str, connected: bool, packets: int, seconds: float):
+        key = (_state(connected), min(packets, MAX_PACKET_BUCKET))
+        buckets = self.samples[address.upper()]
+        buckets.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def _values(self, address: str, connected: bool, packets: Optional[int]) -> list[float]:
+        buckets = self.samples.get(address.upper(), {})
+        state = _state(connected)
+        if packets is not None:
+            exact = buckets.get((state, min(packets, MAX_PACKET_BUCKET)), ())
+            if len(exact) >= MIN_SAMPLES:
+                return list(exact)
+        return [v for (s, _), values in buckets.items() if s == state for v in values]
+
+    def estimate(self, address: str, connected: bool, packets: Optional[int] = None,
+                 q: float = LEAD_QUANTILE) -> float:
+        """보낼 때 예상 지연 (초)"""
+        values = self._values(address, connected, packets)
+        if len(values) >= MIN_SAMPLES:
+            return min(quantile(values, q), MAX_LEAD)
+        base, per_packet = PRIOR_WARM if connected else PRIOR_COLD
+        return min(base + per_packet * (packets or 1), MAX_LEAD)
+
+    def record_arrival(self, address: str, deadline: datetime, arrived: datetime):
+        """실제 도착 - 마감 (양수면 늦음)"""
+        self.errors[address.upper()].append((arrived - deadline).total_seconds())
+
+    def summary(self, address: str) -> dict:
+        address = address.upper()
+        buckets = {f"{state}/{packets}": {"n": len(values), "p50": round(quantile(values, 0.5), 3),
+                                          "p95": round(quantile(values, 0.95), 3)}
+                   for (state, packets), values in sorted(self.samples.get(address, {}).items())}
+        errors = list(self.errors.get(address, ()))
+        accuracy = {}
+        if errors:
+            accuracy = {"n": len(errors), "p50": round(quantile(errors, 0.5), 3),
+                        "p95": round(quantile(errors, 0.95), 3),
+                        "mean_abs": round(sum(abs(e) for e in errors) / len(errors), 3),
+                        "late": sum(e > 0 for e in errors)}
+        return {"latency": buckets, "arrival_error": accuracy}
+
+    def report(self) -> str:
+        lines = ["📶 알림 도착 지연"]
+        for address in sorted(set(self.samples) | set(self.errors)):
+            data = self.summary(address)
+            lines.append(f"  {address}")
+            for bucket, stats in data["latency"].items():
+                lines.append(f"    {bucket}패킷: p50 {stats['p50']:.2f}초 / p95 {stats['p95']:.2f}초 ({stats['n']}건)")
+            acc = data["arrival_error"]
+            if acc:
+                lines.append(f"    도착 오차: p50 {acc['p50']:+.2f}초 / p95 {acc['p95']:+.2f}초"
+                             f" / 평균 |오차| {acc['mean_abs']:.2f}초 / 늦음 {acc['late']}/{acc['n']}건")
+        return "\n".join(lines)
+
+
+TRACKER = LatencyTracker()
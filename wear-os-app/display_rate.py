@@ -0,0 +1,230 @@
+"""
+워치 화면 표시 속도 보정 + 알림 흐름 제어
+- P5S는 알림을 너무 빨리 연달아 받으면 앞의 알림을 덮어쓰거나 버림
+- 보정: 간격을 줄여 가며 시험 알림을 보내고, 다 표시됐는지 확인
+  ff03 응답 수로 확인 (알림마다 응답이 오는 펌웨어) 또는 작업자가 워치를 보고 y/n
+  1) 연속 BURST_FRAMES개가 다 보이는 최소 간격 -> gap
+  2) 그 간격부터 늘려 가며 SUSTAIN_FRAMES개가 다 보이는 간격 -> 지속 속도 rate
+- 결과는 gatt-cache.json의 기기 항목에 펌웨어와 같이 저장 (frame_layout의 프로브 결과처럼)
+  -> 펌웨어가 바뀌면 기본값으로 돌아가고 다시 보정
+- 전송 쪽(WatchNotifier)은 토큰 버킷(최대 burst개, 초당 rate개) + 프레임 사이 최소 gap으로
+  필요한 만큼만 늦춤 (보정 안 된 기기는 DEFAULT_DISPLAY)
+
+P5S_FLOW=off 이면 흐름 제어 안 함
+사용법: python display_rate.py calibrate <MAC주소> [--confirm auto|ff03|operator]
+       python display_rate.py show               (저장된 보정값)
+"""
+import argparse
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from attendance_outbox import TokenBucket
+
+# 보정할 간격 (초, 느린 것부터)
+CALIBRATION_GAPS = (4.0, 2.0, 1.0, 0.5, 0.25, 0.1)
+BURST_FRAMES = 3
+SUSTAIN_FRAMES = 8
+SETTLE = 6.0            # 단계 사이 쉬는 시간 (화면 정리)
+REPLY_WINDOW = 1.5      # 마지막 알림 뒤 ff03 응답을 기다리는 시간
+CALIBRATION_TAG = "📟 보정"
+
+log = logging.getLogger("p5s.flow")
+
+
+@dataclass(frozen=True)
+class DisplayRate:
+    """워치가 놓치지 않고 표시하는 속도"""
+    gap: float = 1.0        # 프레임 사이 최소 간격 (초, 이전 프레임 전송 완료부터)
+    rate: float = 0.5       # 지속 가능한 초당 프레임 수
+    burst: int = 3          # gap 간격으로 연달아 보낼 수 있는 수
+    method: str = "default"  # ff03 / operator / default
+
+    def describe(self) -> str:
+        return f"{self.rate:.2f}/s, 간격 {self.gap:g}s, 연속 {self.burst} ({self.method})"
+
+
+# 보정 안 된 기기: 3개까지 1초 간격, 이후 2초에 하나
+DEFAULT_DISPLAY = DisplayRate()
+
+
+def flow_enabled() -> bool:
+    return os.environ.get("P5S_FLOW", "").lower() != "off"
+
+
+class FlowControl:
+    """워치 하나의 알림 흐름 제어 (토큰 버킷 + 최소 간격, 시계는 이벤트 루프 시간)"""
+
+    def __init__(self, rate: DisplayRate = DEFAULT_DISPLAY):
+        self.rate = rate
+        self.bucket: Optional[TokenBucket] = None
+        self.last_end: Optional[float] = None  # 마지막 프레임 전송이 끝난 시각
+        self.paced = 0          # 기다린 프레임 수
+        self.waited = 0.0       # 기다린 시간 합 (초)
+
+    def configure(self, rate: DisplayRate):
+        """연결된 기기/펌웨어의 보정값으로 (같으면 그대로)"""
+        if rate != self.rate:
+            self.rate = rate
+            self.bucket = None
+
+    async def wait(self):
+        """다음 프레임을 보내도 될 때까지 대기"""
+        loop = asyncio.get_running_loop()
+        if self.bucket is None:
+            self.bucket = TokenBucket(self.rate.rate, self.rate.burst, clock=loop.time)
+        started = loop.time()
+        if self.last_end is not None and (gap := self.last_end + self.rate.gap - started) > 0:
+            await asyncio.sleep(gap)
+        await self.bucket.take()
+        waited = loop.time() - started
+        if waited > 0:
+            self.paced += 1
+            self.waited += waited
+
+    def sent(self):
+        self.last_end = asyncio.get_running_loop().time()
+
+    def summary(self) -> dict:
+        return {"display": self.rate.describe(), "paced": self.paced, "paced_wait": round(self.waited, 1)}
+
+
+# ========== 보정 ==========
+
+class _Judge:
+    """시험 알림이 다 표시됐는지 판정 (ff03 응답 수 또는 작업자 확인)"""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.replies = 0
+        self.per_frame = 0.0  # 알림 하나당 ff03 응답 수 (기준 단계에서 측정)
+
+    def on_reply(self, _sender, _data):
+        self.replies += 1
+
+    async def passed(self, label: str, count: int, replies: int) -> bool:
+        if self.mode == "ff03":
+            return replies >= round(self.per_frame * count)
+        answer = await asyncio.to_thread(input, f"  워치에 '{label} 1/{count}' ~ '{count}/{count}'가 모두 보였나요? [y/N] ")
+        return answer.strip().lower() in ("y", "yes", "ㅛ")
+
+
+async def _step(notifier, judge: _Judge, label: str, count: int, gap: float) -> Optional[bool]:
+    """count개를 gap 간격으로 보내고 판정 (전송 실패면 None)"""
+    before = judge.replies
+    for i in range(1, count + 1):
+        if not await notifier.send_notification(f"{CALIBRATION_TAG} {label} {i}/{count}"):
+            return None
+        if i < count:
+            await asyncio.sleep(gap)
+    await asyncio.sleep(REPLY_WINDOW)
+    ok = await judge.passed(label, count, judge.replies - before)
+    log.info(f"  📟 {label}: {count}개 간격 {gap:g}s -> {'✅' if ok else '❌'} (ff03 응답 {judge.replies - before})",
+             extra={"event": "display_step", "count": count, "gap": gap, "ok": ok})
+    await asyncio.sleep(SETTLE)
+    return ok
+
+
+async def calibrate(notifier, confirm: str = "auto", gaps=CALIBRATION_GAPS) -> Optional[DisplayRate]:
+    """
+    연결된 WatchNotifier로 표시 속도 측정 (흐름 제어는 끄고 보냄)
+    confirm: ff03 / operator / auto (기준 단계에서 알림마다 ff03 응답이 오면 ff03, 아니면 작업자)
+    전송이 실패하면 None (저장하지 않음)
+    """
+    notifier.pacer = None
+    judge = _Judge("operator" if confirm == "operator" else "ff03")
+    await notifier.client.start_notify(notifier.link.notify_char, judge.on_reply)
+
+    slowest = gaps[0]
+    if confirm != "operator":
+        # 기준: 가장 느린 간격으로 2개 -> 알림당 응답 수
+        before = judge.replies
+        for i in (1, 2):
+            if not await notifier.send_notification(f"{CALIBRATION_TAG} 기준 {i}/2"):
+                return None
+            await asyncio.sleep(slowest)
+        judge.per_frame = (judge.replies - before) / 2
+        if judge.per_frame < 1:
+            if confirm == "ff03":
+                log.warning("  ⚠️ ff03 응답이 없음 - --confirm operator로 다시 시도")
+                return None
+            judge.mode = "operator"
+            log.info("  📟 ff03 응답이 없음 -> 작업자 확인으로 보정")
+        await asyncio.sleep(SETTLE)
+
+    min_gap = None
+    for step, gap in enumerate(gaps, 1):
+        ok = await _step(notifier, judge, f"A{step}", BURST_FRAMES, gap)
+        if ok is None:
+            return None
+        if not ok:
+            break
+        min_gap = gap
+    if min_gap is None:
+        log.warning(f"  ⚠️ 가장 느린 간격({slowest:g}s)에서도 누락 - 하나씩 {slowest:g}s 간격으로")
+        return DisplayRate(gap=slowest, rate=1 / slowest, burst=1, method=judge.mode)
+
+    sustain = slowest
+    for step, gap in enumerate(g for g in reversed(gaps) if g >= min_gap):
+        ok = await _step(notifier, judge, f"B{step + 1}", SUSTAIN_FRAMES, gap)
+        if ok is None:
+            return None
+        if ok:
+            sustain = gap
+            break
+    burst = 1 if sustain == min_gap else BURST_FRAMES
+    return DisplayRate(gap=min_gap, rate=1 / sustain, burst=burst, method=judge.mode)
+
+
+async def _calibrate(address: str, confirm: str):
+    from gatt_cache import GattCache
+    from watch_notifier import WatchNotifier
+
+    notifier = WatchNotifier(address)
+    if not await notifier.connect():
+        return
+    try:
+        print(f"펌웨어 {notifier.link.firmware}: 보정 시작 (현재 {notifier.link.display.describe()})")
+        rate = await calibrate(notifier, confirm)
+    finally:
+        await notifier.disconnect()
+    if rate is None:
+        print("❌ 보정 실패 (저장 안 함)")
+        return
+    cache = GattCache()
+    cache.store_display(address, notifier.link.firmware, rate)
+    print(f"✅ {address} / {notifier.link.firmware}: {rate.describe()}")
+
+
+def _show():
+    from gatt_cache import GattCache
+
+    cache = GattCache()
+    for address, entry in cache.entries.items():
+        rate = cache.display(address, entry.get("firmware", ""))
+        print(f"{address}  펌웨어 {entry.get('firmware', '?')}: "
+              f"{rate.describe() if rate else '보정 안 됨 (' + DEFAULT_DISPLAY.describe() + ')'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워치 표시 속도 보정")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cal = sub.add_parser("calibrate", help="시험 알림으로 표시 속도 측정 후 저장")
+    cal.add_argument("address", help="워치 MAC 주소")
+    cal.add_argument("--confirm", choices=("auto", "ff03", "operator"), default="auto",
+                     help="표시 확인 방법 (auto: ff03 응답이 없으면 작업자)")
+    sub.add_parser("show", help="저장된 보정값")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        _show()
+        return
+    from log_pipeline import setup_logging
+    setup_logging()
+    asyncio.run(_calibrate(args.address, args.confirm))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+MTU에 맞춘 알림 프레임 나누기
+- 기존 형식: 첫 패킷 데이터 7바이트 + 후속 패킷 16바이트 (ATT MTU 23 = 페이로드 20바이트 기준)
+- MTU가 더 크게 협상됐으면 패킷 하나에 더 실어서 write 횟수를 줄임
+  첫 패킷: 헤더 13바이트 + 데이터 (데이터 길이 필드가 1바이트라 최대 255)
+  후속 패킷: 02 11 seq&0xFF seq>>8 + 데이터
+- 펌웨어가 큰 패킷을 받는지는 보정 명령(probe)으로 기기/펌웨어별로 한 번만 프로브
+  큰 크기부터 프로브 알림을 보내 보고, write가 거부되면 한 단계 줄임
+  (프로브 알림이 워치에 최대 4번 뜨므로 평소 연결에서는 하지 않음)
+  프로브 중 연결이 끊기면 기존 7/16으로 확정 (같은 펌웨어에는 다시 시도 안 함)
+- 결과는 gatt-cache.json의 기기 항목에 펌웨어/MTU와 같이 저장 (gatt_cache.py)
+  -> 펌웨어나 MTU가 바뀌면 결과를 안 쓰고 기존 7/16 (다시 probe하면 큰 패킷)
+
+P5S_FRAME_PROBE=off  프로브 결과도 안 쓰고 기존 7/16만 사용
+P5S_FRAME_PROBE=on   연결할 때 이 펌웨어/MTU 결과가 없으면 자동 프로브 (예전 동작)
+
+사용법: python frame_layout.py [메시지]          (MTU별 패킷 수 비교)
+       python frame_layout.py probe <MAC주소>   (캐시 무시하고 다시 프로브)
+"""
+import asyncio
+import logging
+import os
+import sys
+from dataclasses import dataclass
+
+LEGACY_MTU = 23
+ATT_OVERHEAD = 3        # ATT write 요청 헤더 (opcode + handle)
+FIRST_HEADER = 13
+NEXT_HEADER = 4
+MAX_FIRST = 255
+MAX_MESSAGE_CHARS = 128
+
+# 프로브할 페이로드 크기 (협상된 MTU 안에 들어가는 것만, 큰 것부터)
+PROBE_PAYLOADS = (244, 182, 128, 64)
+PROBE_PACKET_DELAY = 0.05
+# 가장 긴 알림과 같은 길이 (128자, 3바이트 문자로 채움) -> 실제로 쓰일 패킷 크기를 전부 시험
+PROBE_MESSAGE = ("📶 전송 크기 확인 " + "ㆍ" * MAX_MESSAGE_CHARS)[:MAX_MESSAGE_CHARS]
+
+log = logging.getLogger("p5s.framing")
+
+
+@dataclass(frozen=True)
+class FrameLayout:
+    """패킷당 데이터 바이트 수"""
+    first: int = 7
+    next: int = 16
+
+    @classmethod
+    def for_payload(cls, payload: int) -> "FrameLayout":
+        return cls(min(payload - FIRST_HEADER, MAX_FIRST), payload - NEXT_HEADER)
+
+    @classmethod
+    def for_mtu(cls, mtu: int) -> "FrameLayout":
+        return cls.for_payload(mtu - ATT_OVERHEAD)
+
+    @property
+    def payload(self) -> int:
+        """가장 큰 패킷 크기"""
+        return max(FIRST_HEADER + self.first, NEXT_HEADER + self.next)
+
+    def packet_count(self, length: int) -> int:
+        """데이터 length바이트를 보내는 데 필요한 패킷 수"""
+        return 1 + max(0, -(-(length - self.first) // self.next))
+
+    def describe(self, length: int = len(PROBE_MESSAGE.encode("utf-8"))) -> str:
+        """기존 형식 대비 패킷 수 (기본: 가장 긴 알림)"""
+        return (f"{self.first}/{self.next}B - {length}B 알림 "
+                f"{LEGACY.packet_count(length)} → {self.packet_count(length)}패킷")
+
+
+LEGACY = FrameLayout()
+
+
+def encode_message(message: str) -> bytes:
+    """128자 넘으면 자르고 UTF-8로"""
+    if len(message) > MAX_MESSAGE_CHARS:
+        message = message[:MAX_MESSAGE_CHARS - 3] + "..."
+    return message.encode('utf-8')
+
+
+def build_frame(message: str, notify_type: int = 255, layout: FrameLayout = LEGACY) -> list[bytes]:
+    """알림 패킷 생성"""
+    content = encode_message(message)
+    length = len(content)
+    first_data_len = min(layout.first, length)
+
+    # 첫 번째 패킷
+    packet = bytearray([
+        0x02, 0x11,  # 헤더 + 알림명령
+        length & 0xFF, (length >> 8) & 0xFF,
+        (length >> 16) & 0xFF, (length >> 24) & 0xFF,
+        0x01, notify_type & 0xFF,  # 고정 + 타입
+        0x00, 0x00,  # 시퀀스
+        0x01, 0x01, first_data_len  # 고정 + 데이터길이
+    ])
+    packet.extend(content[:first_data_len])
+    packets = [bytes(packet)]
+
+    # 후속 패킷
+    offset = first_data_len
+    seq = 1
+    while offset < length:
+        packet = bytearray([0x02, 0x11, seq & 0xFF, (seq >> 8) & 0xFF])
+        packet.extend(content[offset:offset + layout.next])
+        packets.append(bytes(packet))
+        offset += layout.next
+        seq += 1
+
+    return packets
+
+
+def probe_mode() -> str:
+    """P5S_FRAME_PROBE -> "off" / "on" / "cached" (기본: 보정해 둔 결과만 사용)"""
+    mode = os.environ.get("P5S_FRAME_PROBE", "").lower()
+    return mode if mode in ("off", "on") else "cached"
+
+
+async def negotiated_mtu(client) -> int:
+    """연결된 client의 ATT MTU (모르면 23)"""
+    # BlueZ 백엔드는 실제 값을 한 번 받아 와야 mtu_size가 맞음
+    acquire = getattr(getattr(client, "_backend", None), "_acquire_mtu", None)
+    if acquire is not None:
+        try:
+            await acquire()
+        except Exception:
+            pass
+    try:
+        return int(client.mtu_size) or LEGACY_MTU
+    except Exception:
+        return LEGACY_MTU
+
+
+def probe_candidates(mtu: int) -> list[FrameLayout]:
+    """MTU에 들어가는 레이아웃 후보 (큰 것부터, 기존 형식 제외)"""
+    payload = mtu - ATT_OVERHEAD
+    sizes = [payload] + [p for p in PROBE_PAYLOADS if p < payload]
+    legacy_payload = LEGACY_MTU - ATT_OVERHEAD
+    return [FrameLayout.for_payload(p) for p in dict.fromkeys(sizes) if p > legacy_payload]
+
+
+async def probe_layout(client, write_char, mtu: int, delay: float = PROBE_PACKET_DELAY) -> FrameLayout:
+    """
+    펌웨어가 받는 가장 큰 레이아웃 찾기 (프로브 알림이 워치에 한 번 뜸)
+    write가 거부되면 다음 후보, 연결이 끊기면 ConnectionError (호출 쪽에서 기존 형식으로 확정)
+    """
+    for layout in probe_candidates(mtu):
+        try:
+            for packet in build_frame(PROBE_MESSAGE, layout=layout):
+                await client.write_gatt_char(write_char, packet, response=True)
+                await asyncio.sleep(delay)
+            log.info(f"  📏 프레임 프로브 성공: {layout.describe()}",
+                     extra={"event": "frame_probe", "first": layout.first, "next": layout.next, "mtu": mtu})
+            return layout
+        except Exception as e:
+            if not client.is_connected:
+                raise ConnectionError(f"프레임 프로브 중 연결 끊김 ({layout.payload}B)") from e
+            log.info(f"  📏 {layout.payload}B 패킷 거부: {e}")
+            await asyncio.sleep(delay)
+    return LEGACY
+
+
+def _compare(message: str):
+    length = len(encode_message(message))
+    print(f"'{message[:20]}' ({length}B)")
+    for mtu in (LEGACY_MTU, 64, 185, 247, 517):
+        print(f"  MTU {mtu:3d}: {FrameLayout.for_mtu(mtu).describe(length)}")
+
+
+async def _probe(address: str):
+    from gatt_cache import GattCache, connect_cached
+
+    cache = GattCache()
+    entry = cache.entry(address)
+    if entry is not None:
+        entry.pop("framing", None)
+    link = await connect_cached(address, cache=cache, probe=True)
+    try:
+        print(f"MTU {link.mtu} / 펌웨어 {link.firmware}: {link.layout.describe()}")
+    finally:
+        await link.client.disconnect()
+
+
+def main():
+    if len(sys.argv) >= 3 and sys.argv[1] == "probe":
+        from log_pipeline import setup_logging
+        setup_logging()
+        asyncio.run(_probe(sys.argv[2]))
+        return
+    _compare(" ".join(sys.argv[1:]) or PROBE_MESSAGE)
+
+
+if __name__ == "__main__":
+    main()
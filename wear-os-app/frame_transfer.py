@@ -0,0 +1,119 @@
+"""
+알림 프레임 이어 보내기
+- 프레임(알림 하나) = 첫 패킷 + 후속 패킷들 (후속 패킷 헤더: 02 11 seq&0xFF seq>>8)
+- 응답 있는 write가 성공한 패킷까지를 '확인됨'으로 기록
+- 중간에 끊기면 재연결 후 확인된 다음 패킷부터 이어서 전송
+- 이어 보낸 첫 패킷을 워치가 거부하면(연결은 살아 있는데 write 실패) 처음부터 다시
+- 알림마다 최종 결과는 delivered / failed 중 딱 한 번, 재전송 바이트 수 기록
+- 패킷 대신 build(layout) 함수를 넘기면 연결된 링크의 프레임 레이아웃(MTU)으로 생성
+  재연결 후 레이아웃이 달라지면 새 레이아웃으로 다시 만들어 처음부터
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+from frame_layout import LEGACY, FrameLayout
+
+DELIVERED = "delivered"
+FAILED = "failed"
+
+
+@dataclass
+class FrameTransfer:
+    """프레임 하나의 전송 상태"""
+    packets: list[bytes]
+    confirmed: int = 0          # 확인된 패킷 수 (다음에 보낼 인덱스)
+    high_water: int = 0         # 한 번이라도 보낸 패킷 수
+    attempts: int = 0
+    restarts: int = 0           # 워치 거부로 처음부터 다시 보낸 횟수
+    retransmitted_bytes: int = 0
+    outcome: Optional[str] = None
+    error: str = ""
+    layout: Optional[FrameLayout] = None  # build 함수로 만든 경우 사용한 레이아웃
+
+    @property
+    def delivered(self) -> bool:
+        return self.outcome == DELIVERED
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(len(p) for p in self.packets)
+
+    def finish(self, outcome: str, error: str = ""):
+        """결과는 한 번만 확정"""
+        if self.outcome is None:
+            self.outcome = outcome
+            self.error = error
+
+    def restart(self):
+        self.confirmed = 0
+        self.restarts += 1
+
+    def summary(self) -> str:
+        text = f"{self.outcome} ({self.confirmed}/{len(self.packets)}패킷, 시도 {self.attempts}"
+        if self.restarts:
+            text += f", 재시작 {self.restarts}"
+        if self.retransmitted_bytes:
+            text += f", 재전송 {self.retransmitted_bytes}B"
+        return text + ")"
+
+
+async def _write_from(notifier, transfer: FrameTransfer, packet_delay: float):
+    client, char = notifier.client, notifier.link.write_char
+    for i in range(transfer.confirmed, len(transfer.packets)):
+        packet = transfer.packets[i]
+        if i < transfer.high_water:
+            transfer.retransmitted_bytes += len(packet)
+        transfer.high_water = max(transfer.high_water, i + 1)
+        await client.write_gatt_char(char, packet, response=True)
+        notifier.link.mark_write()
+        transfer.confirmed = i + 1
+        await asyncio.sleep(packet_delay)
+
+
+def _rebuild(transfer: FrameTransfer, build: Callable[[FrameLayout], list[bytes]], layout: FrameLayout):
+    if layout == transfer.layout:
+        return
+    if transfer.layout is not None and transfer.confirmed:
+        transfer.restart()  # 보낸 패킷과 나누는 위치가 달라짐 -> 처음부터
+    transfer.layout = layout
+    transfer.packets = build(layout)
+
+
+async def transfer_frame(notifier, packets: Union[list[bytes], Callable[[FrameLayout], list[bytes]]],
+                         packet_delay: float = 0.05, max_attempts: int = 3,
+                         retry_delay: float = 1.0) -> FrameTransfer:
+    """
+    notifier: connect() / connected / client / link(write_char, mark_write, layout) 를 가진 WatchNotifier
+    packets: 패킷 리스트, 또는 레이아웃 -> 패킷 리스트 함수
+    실패해도 예외 대신 outcome=failed인 FrameTransfer 반환
+    """
+    build = packets if callable(packets) else None
+    transfer = FrameTransfer([] if build else packets)
+    error = ""
+    while transfer.attempts < max_attempts:
+        transfer.attempts += 1
+        if not notifier.connected and not await notifier.connect():
+            error = "연결 실패"
+            await asyncio.sleep(retry_delay)
+            continue
+
+        if build is not None:
+            _rebuild(transfer, build, getattr(notifier.link, "layout", LEGACY))
+        resume_at = transfer.confirmed
+        try:
+            await _write_from(notifier, transfer, packet_delay)
+            transfer.finish(DELIVERED)
+            return transfer
+        except Exception as e:
+            error = str(e)
+            if notifier.client is not None and notifier.client.is_connected:
+                # 연결은 그대로인데 write가 거부됨
+                if resume_at > 0 and transfer.confirmed == resume_at:
+                    transfer.restart()  # 이어 보내기를 워치가 받지 않음 -> 처음부터
+            else:
+                notifier.connected = False
+                await asyncio.sleep(retry_delay)
+
+    transfer.finish(FAILED, error)
+    return transfer
@@ -0,0 +1,285 @@
+"""
+GATT 서비스 탐색 결과 캐시
+- 연결마다 ff02/ff03 특성을 한 번만 찾아서 BleakGATTCharacteristic 객체로 보관
+  (write_gatt_char에 UUID 문자열을 넘기면 매번 서비스 목록에서 다시 찾음)
+- 서비스 테이블을 기기/펌웨어별로 디스크에 저장
+  -> 다음 연결 때 펌웨어가 같으면 OS 캐시 사용 (Windows WinRT: use_cached_services)
+- 캐시된 핸들로 특성을 못 찾거나 핸들이 다르면 캐시 폐기 후 전체 탐색으로 재연결
+  캐시로 연결해도 펌웨어 버전은 매번 읽어서, 달라졌으면 같은 방식으로 폐기
+  (옛 펌웨어의 프로브/보정 결과를 새 펌웨어에 쓰지 않게)
+- 연결 시작 ~ 첫 write까지 시간을 기록 (캐시 사용 전/후 비교용)
+- 협상된 MTU에 맞는 프레임 레이아웃을 골라 link.layout에 (frame_layout.py)
+  펌웨어/MTU별 프로브 결과를 같은 기기 항목의 "framing"에 저장
+  (프로브는 probe=True로 연결할 때만 - python frame_layout.py probe <MAC>, 또는 P5S_FRAME_PROBE=on)
+- 표시 속도 보정값(display_rate.py)도 같은 기기 항목의 "display"에 (펌웨어가 같을 때만 사용)
+
+- P5S_CAPTURE면 BLE 트래픽 기록, P5S_REPLAY=<캡처 파일>이면 워치 대신 캡처 재생 (ble_capture.py)
+  재생 중에는 디스크 캐시를 읽거나 쓰지 않음
+
+캐시 파일: ~/.p5s/gatt-cache.json (P5S_GATT_CACHE 환경변수로 변경)
+"""
+import json
+import os
+import sys
+import time
+from typing import Optional
+
+from bleak import BleakClient
+
+from ble_capture import capture_client, replay_client, replay_path
+from display_rate import DEFAULT_DISPLAY, DisplayRate
+from frame_layout import LEGACY, LEGACY_MTU, FrameLayout, negotiated_mtu, probe_layout, probe_mode
+
+WRITE_CHAR = "0000ff02-0000-1000-8000-00805f9b34fb"
+NOTIFY_CHAR = "0000ff03-0000-1000-8000-00805f9b34fb"
+FIRMWARE_CHAR = "00002a26-0000-1000-8000-00805f9b34fb"  # Device Information - Firmware Revision
+
+CACHE_PATH = os.environ.get("P5S_GATT_CACHE", os.path.join(os.path.expanduser("~"), ".p5s", "gatt-cache.json"))
+
+
+class GattCache:
+    """기기 주소 -> {firmware, services, saved}"""
+
+    def __init__(self, path: str = CACHE_PATH):
+        """path가 빈 문자열이면 메모리에만 (저장 안 함)"""
+        self.path = path
+        self.entries: dict = {}
+        if not path:
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.entries: dict = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def entry(self, address: str) -> Optional[dict]:
+        return self.entries.get(address.upper())
+
+    def store(self, address: str, firmware: str, services: list[dict]):
+        entry = {"firmware": firmware, "services": services, "saved": time.time()}
+        for key in ("framing", "display"):
+            measured = (self.entry(address) or {}).get(key)
+            if measured and measured.get("firmware") == firmware:
+                entry[key] = measured  # 같은 펌웨어면 프로브/보정 결과 유지
+        self.entries[address.upper()] = entry
+        self._save()
+
+    def layout(self, address: str, firmware: str, mtu: int) -> Optional[FrameLayout]:
+        """같은 펌웨어/MTU로 프로브해 둔 레이아웃"""
+        framing = (self.entry(address) or {}).get("framing")
+        if framing and framing.get("firmware") == firmware and framing.get("mtu") == mtu:
+            return FrameLayout(framing["first"], framing["next"])
+        return None
+
+    def store_layout(self, address: str, firmware: str, mtu: int, layout: FrameLayout):
+        entry = self.entry(address)
+        if entry is None:
+            return
+        entry["framing"] = {"firmware": firmware, "mtu": mtu, "first": layout.first, "next": layout.next}
+        self._save()
+
+    def display(self, address: str, firmware: str) -> Optional[DisplayRate]:
+        """같은 펌웨어로 보정해 둔 표시 속도"""
+        display = (self.entry(address) or {}).get("display")
+        if display and display.get("firmware") == firmware:
+            return DisplayRate(display["gap"], display["rate"], display["burst"], display["method"])
+        return None
+
+    def store_display(self, address: str, firmware: str, rate: DisplayRate):
+        entry = self.entry(address)
+        if entry is None:
+            return
+        entry["display"] = {"firmware": firmware, "gap": rate.gap, "rate": rate.rate, "burst": rate.burst,
+                            "method": rate.method, "saved": time.time()}
+        self._save()
+
+    def invalidate(self, address: str):
+        if self.entries.pop(address.upper(), None) is not None:
+            self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+def snapshot_services(services) -> list[dict]:
+    """BleakGATTServiceCollection -> JSON으로 저장 가능한 테이블"""
+    return [{
+        "uuid": service.uuid,
+        "handle": service.handle,
+        "chars": [{"uuid": c.uuid, "handle": c.handle, "props": c.properties} for c in service.characteristics],
+    } for service in services]
+
+
+def cached_handle(entry: Optional[dict], uuid: str) -> Optional[int]:
+    if not entry:
+        return None
+    for service in entry["services"]:
+        for char in service["chars"]:
+            if char["uuid"] == uuid:
+                return char["handle"]
+    return None
+
+
+async def read_firmware(client: BleakClient) -> str:
+    """펌웨어 버전 (Device Information 서비스가 없으면 "unknown")"""
+    if client.services.get_characteristic(FIRMWARE_CHAR) is None:
+        return "unknown"
+    try:
+        return (await client.read_gatt_char(FIRMWARE_CHAR)).decode("utf-8", errors="replace").strip("\0 ")
+    except Exception:
+        return "unknown"
+
+
+def client_kwargs(use_cache: bool, adapter: Optional[str] = None) -> dict:
+    """BleakClient 생성 인자 (캐시 사용 여부는 WinRT 백엔드만 지원, BlueZ는 자체 캐시)"""
+    kwargs = {"adapter": adapter} if adapter else {}
+    if sys.platform == "win32":
+        kwargs["winrt"] = {"use_cached_services": use_cache}
+    return kwargs
+
+
+def open_client(target, use_cache: bool, adapter: Optional[str] = None, factory=None):
+    """
+    BleakClient (P5S_CAPTURE면 기록용으로 감싸고, P5S_REPLAY면 캡처 재생 client)
+    factory: target -> client (가상 워치 등, 주면 BleakClient 대신)
+    """
+    replay = replay_path()
+    if replay:
+        return replay_client(replay)
+    address = target if isinstance(target, str) else target.address
+    client = factory(target) if factory else BleakClient(target, **client_kwargs(use_cache, adapter))
+    return capture_client(client, address)
+
+
+def resolve(client: BleakClient, uuid: str, expected_handle: Optional[int] = None):
+    """UUID -> BleakGATTCharacteristic (없거나 캐시 핸들과 다르면 LookupError)"""
+    char = client.services.get_characteristic(uuid)
+    if char is None or (expected_handle is not None and char.handle != expected_handle):
+        raise LookupError(f"GATT 특성 조회 실패: {uuid}")
+    return char
+
+
+class GattLink:
+    """연결 하나의 특성 객체 + 타이밍"""
+
+    def __init__(self, client: BleakClient, write_char, notify_char, cached: bool, started: float,
+                 firmware: str = "unknown"):
+        self.client = client
+        self.write_char = write_char
+        self.notify_char = notify_char
+        self.cached = cached  # 디스크 캐시로 탐색을 건너뛰었는지
+        self.started = started
+        self.connect_time = time.perf_counter() - started
+        self.first_write_time: Optional[float] = None
+        self.firmware = firmware
+        self.mtu = LEGACY_MTU
+        self.layout = LEGACY  # build_frame에 넘길 패킷 크기
+        self.display = DEFAULT_DISPLAY  # 워치 표시 속도 (흐름 제어용)
+
+    def mark_write(self):
+        """첫 write 완료 시점 기록"""
+        if self.first_write_time is None:
+            self.first_write_time = time.perf_counter() - self.started
+
+    def timing_str(self) -> str:
+        first = f"{self.first_write_time * 1000:.0f}ms" if self.first_write_time else "-"
+        return (f"연결 {self.connect_time * 1000:.0f}ms / 첫 전송 {first} ({'캐시' if self.cached else '전체 탐색'})"
+                f" / MTU {self.mtu} {self.layout.describe()}")
+
+
+async def choose_layout(link: GattLink, cache: GattCache, address: str, probe: bool = False):
+    """
+    MTU 확인 -> 캐시된 레이아웃, 없으면 기존 형식
+    probe(또는 P5S_FRAME_PROBE=on)면 없을 때 프로브 (프로브 중 끊기면 기존 형식으로 저장 후 ConnectionError)
+    """
+    link.mtu = await negotiated_mtu(link.client)
+    mode = probe_mode()
+    if link.mtu <= LEGACY_MTU or mode == "off":
+        return
+    layout = cache.layout(address, link.firmware, link.mtu)
+    if layout is None and not (probe or mode == "on"):
+        return
+    if layout is None:
+        try:
+            layout = await probe_layout(link.client, link.write_char, link.mtu)
+        except ConnectionError:
+            cache.store_layout(address, link.firmware, link.mtu, LEGACY)
+            raise
+        cache.store_layout(address, link.firmware, link.mtu, layout)
+    link.layout = layout
+
+
+async def _quiet_disconnect(client):
+    try:
+        await client.disconnect()
+    except Exception:
+        pass
+
+
+async def _connect(client):
+    """연결 실패하면 client 정리 후 예외 그대로 (실패한 연결도 백엔드 자원이 남을 수 있음)"""
+    try:
+        await client.connect()
+    except BaseException:
+        await _quiet_disconnect(client)
+        raise
+
+
+async def _finish(link: GattLink, cache: GattCache, address: str, probe: bool = False) -> GattLink:
+    """레이아웃 선택 중 실패하면 client를 닫고 예외 그대로 (재연결 때마다 client가 남지 않게)"""
+    try:
+        await choose_layout(link, cache, address, probe)
+        link.display = cache.display(address, link.firmware) or DEFAULT_DISPLAY
+    except BaseException:
+        await _quiet_disconnect(link.client)
+        raise
+    return link
+
+
+async def connect_cached(target, cache: Optional[GattCache] = None, adapter: Optional[str] = None,
+                         factory=None, probe: bool = False) -> GattLink:
+    """
+    연결 + ff02/ff03 특성 조회
+    target: 주소 문자열 또는 BLEDevice
+    probe: 이 펌웨어/MTU의 프레임 프로브 결과가 없으면 프로브 (보정 명령에서만)
+    """
+    cache = GattCache("") if replay_path() else (cache or GattCache())
+    address = target if isinstance(target, str) else target.address
+    entry = cache.entry(address)
+    started = time.perf_counter()
+
+    client = open_client(target, entry is not None, adapter, factory)
+    await _connect(client)
+
+    if entry is not None:
+        try:
+            write_char = resolve(client, WRITE_CHAR, cached_handle(entry, WRITE_CHAR))
+            notify_char = resolve(client, NOTIFY_CHAR, cached_handle(entry, NOTIFY_CHAR))
+            firmware = await read_firmware(client)
+            if firmware != entry.get("firmware", "unknown"):
+                raise LookupError(f"펌웨어 변경: {entry.get('firmware')} -> {firmware}")
+            link = GattLink(client, write_char, notify_char, True, started, firmware)
+            return await _finish(link, cache, address, probe)
+        except LookupError:
+            # 펌웨어 업데이트 등으로 테이블/버전이 바뀜 -> 캐시 폐기 후 전체 탐색
+            cache.invalidate(address)
+            await client.disconnect()
+            client = open_client(target, False, adapter, factory)
+            await _connect(client)
+
+    try:
+        write_char = resolve(client, WRITE_CHAR)
+        notify_char = resolve(client, NOTIFY_CHAR)
+    except LookupError:
+        await client.disconnect()
+        raise
+    firmware = await read_firmware(client)
+    cache.store(address, firmware, snapshot_services(client.services))
+    link = GattLink(client, write_char, notify_char, False, started, firmware)
+    return await _finish(link, cache, address, probe)
@@ -0,0 +1,178 @@
+"""
+비동기 로그 파이프라인
+- 호출 쪽은 logging.getLogger("p5s.xxx").info(...) -> QueueHandler가 큐에 넣기만 함 (수 µs)
+- 실제 출력은 백그라운드 스레드(QueueListener)가 담당
+  -> Electron spawn 등으로 stdout이 파이프이고 읽는 쪽이 느려도 이벤트 루프는 안 멈춤
+- 큐가 가득 차면 기다리지 않고 버림 (버린 개수는 다음 출력 때 경고로 알림)
+- 출력 형식: 터미널이면 메시지 그대로, 파이프면 JSON 한 줄씩 (extra={...} 필드 포함)
+- 상태 줄(⏰ ... 모니터링 중)은 터미널에서만 그림. 로그 줄이 나오면 지우고 다시 그림
+
+환경변수: P5S_LOG_LEVEL (기본 INFO), P5S_LOG_FORMAT (text / json, 기본 자동)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Optional
+
+LOGGER_NAME = "p5s"
+QUEUE_SIZE = 10000
+SHUTDOWN_TIMEOUT = 2.0  # 종료 시 남은 로그를 쓰려고 기다리는 최대 시간 (초)
+
+_CLEAR_LINE = "\r\x1b[K"
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_status_log = logging.getLogger(LOGGER_NAME + ".status")
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """레코드 하나 -> JSON 한 줄"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                data[key] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 버림 (호출 쪽은 절대 기다리지 않음)"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 포맷은 리스너 스레드에서 (JSON에 extra 필드가 남도록 레코드 그대로 전달)
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """리스너 스레드 전용 출력 (로그 줄 + 터미널 상태 줄)"""
+
+    def __init__(self, stream, json_output: bool, source: Optional[DroppingQueueHandler] = None):
+        super().__init__(stream)
+        self.tty = _isatty(stream)
+        self.source = source
+        self.reported_drops = 0
+        self.status_line = ""
+        self.abandoned = False  # 종료 시 출력이 막혀 있어서 포기함
+        self.setFormatter(JsonFormatter() if json_output else logging.Formatter("%(message)s"))
+
+    def handle(self, record: logging.LogRecord):
+        # 리스너 스레드 하나만 쓰므로 잠금 없이 (쓰기가 막혀도 종료 시 logging.shutdown이 같이 멈추지 않게)
+        if self.filter(record):
+            self.emit(record)
+        return record
+
+    def flush(self):
+        if not self.abandoned:
+            super().flush()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            if getattr(record, "status", False):
+                if self.tty:  # 파이프에는 상태 줄을 쓰지 않음
+                    self.status_line = record.getMessage()
+                    self.stream.write(_CLEAR_LINE + self.status_line)
+                    self.stream.flush()
+                return
+
+            lines = [self.format(record)]
+            if self.source is not None and self.source.dropped > self.reported_drops:
+                dropped = self.source.dropped - self.reported_drops
+                self.reported_drops = self.source.dropped
+                lines.insert(0, self.format(logging.makeLogRecord({
+                    "name": LOGGER_NAME, "levelno": logging.WARNING, "levelname": "WARNING",
+                    "msg": f"⚠️ 로그 {dropped}건 버림 (출력이 느림)", "dropped": dropped})))
+            text = "\n".join(lines) + "\n"
+            if self.tty and self.status_line:
+                text = _CLEAR_LINE + text + self.status_line
+            self.stream.write(text)
+            self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class _Listener(logging.handlers.QueueListener):
+    """종료할 때 큐가 가득 차 있어도 예외 없이 (출력이 막혀 있으면 기다리다 포기)"""
+
+    def __init__(self, log_queue: queue.Queue, handler: ConsoleHandler, source: DroppingQueueHandler):
+        super().__init__(log_queue, handler)
+        self.source = source
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel, timeout=SHUTDOWN_TIMEOUT)
+
+    def stop(self):
+        try:
+            super().stop()
+        except queue.Full:
+            self._thread = None  # 데몬 스레드라 프로세스 종료를 막지 않음
+            for handler in self.handlers:
+                handler.abandoned = True
+
+
+def _isatty(stream) -> bool:
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def setup_logging(level: Optional[str] = None, json_output: Optional[bool] = None,
+                  stream=None) -> _Listener:
+    """p5s 로거에 큐 + 리스너 연결 (여러 번 불러도 한 번만)"""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    stream = stream or sys.stdout
+    level = (level or os.environ.get("P5S_LOG_LEVEL") or "INFO").upper()
+    if json_output is None:
+        fmt = os.environ.get("P5S_LOG_FORMAT", "").lower()
+        json_output = fmt == "json" or (fmt != "text" and not _isatty(stream))
+
+    log_queue = queue.Queue(QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)  # 레벨 미달이면 큐에 넣기 전에 버림
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+
+    _listener = _Listener(log_queue, ConsoleHandler(stream, json_output, queue_handler), queue_handler)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """남은 로그를 다 쓰고 리스너 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        logging.getLogger(LOGGER_NAME).removeHandler(_listener.source)
+        _listener = None
+
+
+def status(text: str):
+    """터미널 상태 줄 갱신 (파이프 출력에서는 무시)"""
+    _status_log.info(text, extra={"status": True})
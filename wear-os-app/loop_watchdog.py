@@ -0,0 +1,225 @@
+"""
+이벤트 루프 지연 감시 + 샘플링 프로파일러
+- 하트비트 태스크가 interval마다 깨어나서 실제로 얼마나 늦게 깨어났는지(lag) 측정
+- 감시 스레드가 하트비트가 threshold 넘게 멈추면 그 순간 루프 스레드의 스택을 떠 둠
+  -> 루프를 막고 있던 코루틴/함수가 그대로 기록됨 (input(), 느린 BLE 백엔드 호출 등)
+- 가장 긴 멈춤 N개를 스택과 함께 보관
+- 샘플링 프로파일러: 별도 스레드가 루프 스레드 스택을 주기적으로 떠서
+  태스크(코루틴)별 / 함수별로 집계 -> 어떤 코루틴이 루프를 썼는지
+  켜는 법: P5S_PROFILE=1, 또는 실행 중 SIGUSR1 (한 번 더 보내면 끄고 결과 출력)
+"""
+import asyncio
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+# 이만큼 넘게 늦으면 멈춤으로 기록 (초)
+LAG_THRESHOLD = 0.1
+HEARTBEAT_INTERVAL = 0.05
+KEEP_STALLS = 5
+SAMPLE_INTERVAL = 0.005
+
+log = logging.getLogger("p5s.watchdog")
+
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)  # 스택에서 asyncio 내부 프레임은 생략
+
+
+def _task_label(task: Optional[asyncio.Task]) -> str:
+    if task is None:
+        return "(루프 콜백)"
+    coro = task.get_coro()
+    return f"{task.get_name()} [{getattr(coro, '__qualname__', coro)}]"
+
+
+def _innermost_coroutine(frame) -> Optional[str]:
+    """스택에서 가장 안쪽 코루틴 함수 (프로파일러 집계용)"""
+    while frame is not None:
+        if frame.f_code.co_flags & (0x80 | 0x200):  # CO_COROUTINE | CO_ASYNC_GENERATOR
+            return frame.f_code.co_qualname if hasattr(frame.f_code, "co_qualname") else frame.f_code.co_name
+        frame = frame.f_back
+    return None
+
+
+@dataclass
+class Stall:
+    """루프가 멈춘 한 번"""
+    lag: float                          # 예정보다 늦게 깨어난 시간 (초)
+    at: float                           # time.time()
+    task: str = ""                      # 멈춘 동안 실행 중이던 태스크
+    stack: list[str] = field(default_factory=list)
+
+    def format(self) -> str:
+        when = time.strftime("%H:%M:%S", time.localtime(self.at))
+        lines = [f"⏳ {when} 루프 {self.lag * 1000:.0f}ms 멈춤 - {self.task or '(스택 없음)'}"]
+        lines.extend("    " + line for entry in self.stack for line in entry.rstrip().splitlines())
+        return "\n".join(lines)
+
+
+class SamplingProfiler:
+    """루프 스레드 스택 샘플링 (태스크/코루틴 단위 집계)"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.loop = loop
+        self.thread_id = thread_id
+        self.interval = interval
+        self.by_task: Counter = Counter()
+        self.by_function: Counter = Counter()
+        self.samples = 0
+        self.started = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, name="p5s-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            task = asyncio.current_task(self.loop)
+            leaf = f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"
+            if task is None and frame.f_code.co_name in ("select", "poll", "epoll", "_run_once"):
+                self.by_task["(대기)"] += 1
+                continue
+            self.by_task[f"{_task_label(task)} @ {_innermost_coroutine(frame) or '-'}"] += 1
+            self.by_function[leaf] += 1
+
+    def report(self, top: int = 10) -> str:
+        elapsed = time.perf_counter() - self.started if self.started else 0
+        lines = [f"📊 프로파일 {elapsed:.1f}초 / 샘플 {self.samples}개 ({self.interval * 1000:.0f}ms 간격)",
+                 "  태스크 @ 코루틴:"]
+        total = max(self.samples, 1)
+        lines.extend(f"    {count * 100 / total:5.1f}%  {name}" for name, count in self.by_task.most_common(top))
+        lines.append("  함수 (대기 제외):")
+        lines.extend(f"    {count * 100 / total:5.1f}%  {name}" for name, count in self.by_function.most_common(top))
+        return "\n".join(lines)
+
+
+class LoopWatchdog:
+    """루프 지연 측정 + 멈춘 코루틴 스택 기록"""
+
+    def __init__(self, threshold: float = LAG_THRESHOLD, interval: float = HEARTBEAT_INTERVAL,
+                 keep: int = KEEP_STALLS):
+        self.threshold = threshold
+        self.interval = interval
+        self.keep = keep
+        self.stalls: list[Stall] = []   # 긴 순서
+        self.max_lag = 0.0
+        self.beats = 0
+        self.profiler: Optional[SamplingProfiler] = None
+        self._beat = time.monotonic()
+        self._captured: Optional[tuple[str, list[str]]] = None  # 감시 스레드가 떠 둔 (태스크, 스택)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def start(self, profile: bool = False):
+        """실행 중인 루프에서 호출"""
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = self._loop.create_task(self._heartbeat(), name="p5s-watchdog")
+        self._monitor = threading.Thread(target=self._watch, name="p5s-watchdog", daemon=True)
+        self._monitor.start()
+        self.profiler = SamplingProfiler(self._loop, self._thread_id)
+        if profile:
+            self.profiler.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self.profiler is not None and self.profiler.running:
+            self.profiler.stop()
+            log.info(self.profiler.report())
+
+    def toggle_profiler(self):
+        """켜져 있으면 끄고 결과 출력, 꺼져 있으면 켬"""
+        if self.profiler.running:
+            self.profiler.stop()
+            log.info(self.profiler.report())
+        else:
+            self.profiler = SamplingProfiler(self._loop, self._thread_id)
+            self.profiler.start()
+            log.info("📊 프로파일러 시작")
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - self._beat - self.interval)
+            self._beat = now
+            self.beats += 1
+            self.max_lag = max(self.max_lag, lag)
+            captured, self._captured = self._captured, None
+            if lag >= self.threshold:
+                self._record(Stall(lag, time.time(), *(captured or ("", []))))
+
+    def _watch(self):
+        """감시 스레드: 하트비트가 멈춘 동안 루프 스레드 스택을 한 번 떠 둠"""
+        while not self._stop.wait(self.interval / 2):
+            if self._captured is not None:
+                continue
+            if time.monotonic() - self._beat < self.interval + self.threshold:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            task = asyncio.current_task(self._loop)
+            stack = [f for f in traceback.extract_stack(frame) if not f.filename.startswith(_ASYNCIO_DIR)]
+            self._captured = (_task_label(task), traceback.format_list(stack[-8:]))
+
+    def _record(self, stall: Stall):
+        self.stalls.append(stall)
+        self.stalls.sort(key=lambda s: s.lag, reverse=True)
+        del self.stalls[self.keep:]
+        log.warning(stall.format(), extra={"event": "loop_stall", "lag_ms": round(stall.lag * 1000),
+                                           "task": stall.task})
+
+    def report(self) -> str:
+        lines = [f"🐶 루프 감시: 최대 지연 {self.max_lag * 1000:.0f}ms / 하트비트 {self.beats}회"]
+        lines.extend(stall.format() for stall in self.stalls)
+        return "\n".join(lines)
+
+
+def install_watchdog(profile: Optional[bool] = None, **options) -> LoopWatchdog:
+    """
+    실행 중인 루프에 감시 설치
+    profile: None이면 P5S_PROFILE 환경변수. SIGUSR1로 실행 중 켜고 끄기 (유닉스만)
+    """
+    if profile is None:
+        profile = os.environ.get("P5S_PROFILE", "") not in ("", "0")
+    watchdog = LoopWatchdog(**options).start(profile=profile)
+    if hasattr(signal, "SIGUSR1"):
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, watchdog.toggle_profiler)
+        except (NotImplementedError, RuntimeError):
+            pass
+    return watchdog
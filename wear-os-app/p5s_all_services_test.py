@@ -4,6 +4,8 @@ P5S 모든 서비스 알림 테스트
 import asyncio
 from bleak import BleakClient
 
+from ble_capture import capture_client
+
 DEVICE_ADDRESS = "01:BC:8D:DB:2C:15"
 
 # 모든 Write/Notify 쌍
@@ -55,7 +57,7 @@ async def main():
     print("  P5S 모든 서비스 테스트")
     print("=" * 60)
 
-    async with BleakClient(DEVICE_ADDRESS) as client:
+    async with capture_client(BleakClient(DEVICE_ADDRESS), DEVICE_ADDRESS) as client:
         print("✅ 연결됨!\n")
 
         for svc in SERVICES:
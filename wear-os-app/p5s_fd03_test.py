@@ -5,6 +5,8 @@ P5S Service 02fd (fd03) 집중 테스트
 import asyncio
 from bleak import BleakClient
 
+from ble_capture import capture_client
+
 DEVICE_ADDRESS = "01:BC:8D:DB:2C:15"
 
 # Service 02fd
@@ -54,7 +56,7 @@ async def main():
     print("\n⚠️ 워치 화면 계속 보세요!")
     print("⚠️ 진동/알림/화면변화 있으면 바로 y 누르세요!\n")
 
-    async with BleakClient(DEVICE_ADDRESS) as client:
+    async with capture_client(BleakClient(DEVICE_ADDRESS), DEVICE_ADDRESS) as client:
         print("✅ 연결됨!\n")
 
         for name, packet in TEST_PACKETS:
@@ -5,6 +5,8 @@ P5S 알림 전송 스크립트
 import asyncio
 from bleak import BleakClient
 
+from ble_capture import capture_client
+
 # P5S 정보
 DEVICE_ADDRESS = "01:BC:8D:DB:2C:15"  # 본인 워치 주소
 
@@ -124,7 +126,7 @@ async def send_notification(address: str, message: str, notify_type: int = Notif
     """알림 전송"""
     print(f"\n🔗 {address} 연결 중...")
 
-    async with BleakClient(address) as client:
+    async with capture_client(BleakClient(address), address) as client:
         print("  ✅ 연결됨!")
 
         # Notify 구독
@@ -4,6 +4,8 @@ P5S 알림 패킷 테스트 스크립트
 import asyncio
 from bleak import BleakClient, BleakScanner
 
+from ble_capture import capture_client
+
 DEVICE_ADDRESS = "01:BC:8D:DB:2C:15"
 
 SERVICE_UUID = "000001ff-3c17-d293-8e48-14fe2e4da212"
@@ -63,7 +65,7 @@ async def main():
 
     print(f"\n🔗 {DEVICE_ADDRESS} 연결 중...")
 
-    async with BleakClient(DEVICE_ADDRESS) as client:
+    async with capture_client(BleakClient(DEVICE_ADDRESS), DEVICE_ADDRESS) as client:
         print("  ✅ 연결됨!")
 
         await client.start_notify(NOTIFY_CHAR, notification_handler)
@@ -4,6 +4,8 @@ P5S 스마트워치 BLE 프로토콜 테스트 스크립트
 import asyncio
 from bleak import BleakClient, BleakScanner
 
+from ble_capture import capture_client
+
 # P5S 정보
 DEVICE_NAME = "P5S_2C15"
 DEVICE_ADDRESS = "01:BC:8D:DB:2C:15"  # 본인 워치 주소로 변경
@@ -43,7 +45,7 @@ async def test_packets(address):
     """패킷 테스트 실행"""
     print(f"\n🔗 {address} 연결 중...")
 
-    async with BleakClient(address) as client:
+    async with capture_client(BleakClient(address), address) as client:
         print(f"  ✅ 연결됨!")
 
         # Notify 구독
@@ -0,0 +1,110 @@
+"""
+학생별 반복 수업 규칙
+- 요일 (월수금 / 화목 ...), 기간 (개강~종강), 휴강일, 보강(일회성 수업)
+- 달력을 미리 펼치지 않고 제너레이터로 다음 수업만 하나씩 계산
+"""
+import heapq
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from itertools import takewhile
+from typing import Iterator, Optional
+
+WEEKDAY_NAMES = "월화수목금토일"
+_EN_WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+EVERY_DAY = frozenset(range(7))
+
+
+def parse_weekdays(value) -> frozenset[int]:
+    """"화목" / "mon,wed,fri" / [0, 2, 4] -> {0=월 ... 6=일}"""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        days = set()
+        for v in value:
+            days |= {v} if isinstance(v, int) else parse_weekdays(v)
+        return frozenset(days)
+
+    text = str(value).strip().lower()
+    if text in ("", "매일", "daily"):
+        return EVERY_DAY
+    if any(c in WEEKDAY_NAMES for c in text):
+        return frozenset(WEEKDAY_NAMES.index(c) for c in text if c in WEEKDAY_NAMES)
+    return frozenset(_EN_WEEKDAYS.index(t.strip()[:3]) for t in text.split(',') if t.strip())
+
+
+def parse_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value).strip())
+
+
+def parse_datetime(value) -> datetime:
+    """"2026-10-20 18:00" / "2026-10-20T18:00" """
+    if isinstance(value, datetime):
+        return value.replace(second=0, microsecond=0)
+    return datetime.fromisoformat(str(value).strip()).replace(second=0, microsecond=0)
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    """수업 반복 규칙 (수업 시각은 Student.schedule에 있음)"""
+    weekdays: frozenset[int] = EVERY_DAY
+    start: Optional[date] = None          # 개강일 (포함)
+    until: Optional[date] = None          # 종강일 (포함)
+    exceptions: frozenset[date] = frozenset()   # 휴강일
+    extra: tuple[datetime, ...] = ()      # 보강 등 일회성 수업
+
+    @property
+    def is_daily(self) -> bool:
+        return (self.weekdays == EVERY_DAY and not self.start and not self.until
+                and not self.exceptions and not self.extra)
+
+    def describe(self) -> str:
+        """"월수금 ~12/20 (휴강 2, 보강 1)" 형태의 짧은 설명"""
+        if self.is_daily:
+            return "매일"
+        parts = ["".join(WEEKDAY_NAMES[d] for d in sorted(self.weekdays)) or "보강만"]
+        if self.start or self.until:
+            parts.append(f"{self.start or ''}~{self.until or ''}")
+        if self.exceptions:
+            parts.append(f"휴강 {len(self.exceptions)}")
+        if self.extra:
+            parts.append(f"보강 {len(self.extra)}")
+        return " ".join(parts)
+
+    def _regular(self, times: list[str], after: datetime) -> Iterator[datetime]:
+        """정규 수업을 날짜 순으로 하나씩 (끝이 없으면 무한)"""
+        if not self.weekdays or not times:
+            return
+        clock = sorted(tuple(map(int, t.split(':'))) for t in times)
+        day = max(after.date(), self.start) if self.start else after.date()
+        while self.until is None or day <= self.until:
+            if day.weekday() in self.weekdays and day not in self.exceptions:
+                for hour, minute in clock:
+                    when = datetime(day.year, day.month, day.day, hour, minute)
+                    if when >= after:
+                        yield when
+            day += timedelta(days=1)
+
+    def occurrences(self, times: list[str], after: datetime) -> Iterator[datetime]:
+        """after 이후의 수업 시각을 순서대로 (정규 + 보강 병합, 지연 계산)"""
+        extra = sorted(t for t in self.extra if t >= after)
+        return heapq.merge(self._regular(times, after), extra)
+
+    def upcoming(self, times: list[str], after: datetime, horizon: timedelta) -> list[datetime]:
+        """after ~ after+horizon 사이의 수업만 (다음 몇 개만 소비)"""
+        end = after + horizon
+        return list(takewhile(lambda t: t <= end, self.occurrences(times, after)))
+
+
+DAILY = Recurrence()
+
+
+def parse_rule(spec: dict) -> Recurrence:
+    """시간표 파일의 학생 항목 -> Recurrence
+    {"weekdays": "월수금", "from": "2026-03-02", "until": "2026-12-20",
+     "except": ["2026-08-03", ...], "extra": ["2026-10-20 18:00", ...]}
+    """
+    return Recurrence(
+        weekdays=parse_weekdays(spec["weekdays"]) if "weekdays" in spec else EVERY_DAY,
+        start=parse_date(spec["from"]) if spec.get("from") else None,
+        until=parse_date(spec["until"]) if spec.get("until") else None,
+        exceptions=frozenset(parse_date(d) for d in spec.get("except", ())),
+        extra=tuple(sorted(parse_datetime(t) for t in spec.get("extra", ()))),
+    )
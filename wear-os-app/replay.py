@@ -0,0 +1,97 @@
+"""
+시간표 하루치 가상 시간 재생 (타임워프)
+- 실제 StudentTimer / TimerManager 코드를 가상 시간 루프에서 그대로 실행
+- 워치 대신 SimulatedNotifier가 보낼 알림을 시각과 함께 기록 (P5S_SINKS 싱크는 안 씀)
+- 24시간을 1초 안에 돌려서 용량 계획 / 회귀 확인용
+
+사용법: python replay.py <시간표파일> [--date 2026-10-20] [--hours 24] [--interval 30] [--timers]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from clock import run_virtual
+from schedule_file import load_schedule
+
+
+class SimulatedNotifier:
+    """워치 대신 알림을 기록만 하는 notifier (WatchNotifier와 같은 인터페이스)"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.connected = False
+        self.sent: list[tuple[datetime, str]] = []
+
+    async def connect(self):
+        self.connected = True
+        return True
+
+    async def disconnect(self):
+        self.connected = False
+
+    async def send(self, message: str) -> bool:
+        self.sent.append((self.clock.now(), message))
+        return True
+
+    send_notification = send
+
+
+async def replay_student_timer(clock, schedule, hours: float, interval: int):
+    """StudentTimer.run()을 hours시간 동안 실행"""
+    from alert_bus import default_bus
+    from timer_core import StudentTimer
+
+    notifier = SimulatedNotifier(clock)
+    timer = StudentTimer(notifier=notifier, clock=clock, bus=default_bus(notifier, clock, sinks=[]))
+    with contextlib.redirect_stdout(io.StringIO()):  # 매 tick 상태 줄 숨김
+        timer.apply_schedule(schedule)
+        asyncio.get_running_loop().call_later(hours * 3600, timer.stop)
+        await timer.run(check_interval=interval)
+    return notifier.sent
+
+
+async def replay_timer_manager(clock, schedule, hours: float):
+    """TimerManager에 시간표를 넣고 hours시간 동안 타이머 종료 알림 기록"""
+    from alert_bus import default_bus
+    from timer_core import TimerManager
+
+    notifier = SimulatedNotifier(clock)
+    manager = TimerManager(notifier=notifier, clock=clock, bus=default_bus(notifier, clock, sinks=[]))
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.apply_schedule(schedule)
+        await asyncio.sleep(hours * 3600)
+        await manager.close()
+    return notifier.sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시간표 가상 시간 재생")
+    parser.add_argument("schedule", help="시간표 파일 (json/csv/toml)")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(), help="재생할 날짜")
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--interval", type=int, default=30, help="StudentTimer 체크 간격(초)")
+    parser.add_argument("--timers", action="store_true", help="TimerManager(카운트다운)로 재생")
+    args = parser.parse_args()
+
+    schedule = load_schedule(args.schedule)
+    start = datetime.combine(args.date, datetime.min.time())
+
+    wall = time.perf_counter()
+    if args.timers:
+        sent = run_virtual(lambda clock: replay_timer_manager(clock, schedule, args.hours), start)
+    else:
+        sent = run_virtual(lambda clock: replay_student_timer(clock, schedule, args.hours, args.interval), start)
+    wall = time.perf_counter() - wall
+
+    for when, message in sent:
+        print(f"{when:%Y-%m-%d %H:%M:%S}  {message}")
+    print("-" * 40, file=sys.stderr)
+    print(f"알림 {len(sent)}건 / 가상 {timedelta(hours=args.hours)} / 실제 {wall:.3f}초", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+하루 시간표 충돌/부하 분석 (하루 시작 전에)
+- 같은 선생님/강의실에 겹치는 수업
+- 동시에 진행되는 수업 수 최대치
+- 분당 알림 수 -> 워치가 1분에 보낼 수 있는 수(표시 속도 보정값 + 전송 지연)를 넘는 분
+- 수업 시작/종료 점을 정렬한 뒤 한 번 훑음 (sort-and-sweep) -> O(n log n)
+  겹침은 수업 쌍이 아니라 선생님/강의실별로 끊김 없이 이어진 구간 단위 (수업마다 최대 2개)
+  알림 분포는 컴파일된 타임라인의 이벤트 시각을 분 단위로 셈
+
+StudentTimer는 타임라인을 컴파일할 때(날짜/시간표가 바뀔 때) 분석해서 문제가 있으면 경고
+사용법: python schedule_analysis.py 시간표파일 [--date 2026-10-20] [--address MAC]
+"""
+import argparse
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+from display_rate import DEFAULT_DISPLAY, DisplayRate
+from session_index import session_end
+from timeline import START, Session, Timeline
+
+MAX_LISTED = 10         # 종류별로 출력할 최대 줄 수
+MAX_NAMES = 4           # 겹침 한 줄에 적는 수업 수
+
+_END, _START = 0, 1     # 같은 시각이면 끝나는 수업을 먼저 (연달아 있는 수업은 충돌 아님)
+
+
+@dataclass(frozen=True)
+class Conflict:
+    """같은 선생님/강의실에 수업이 겹치는 구간 (끊기지 않고 이어진 수업 묶음)"""
+    kind: str           # "teacher" / "room"
+    key: str
+    start: datetime
+    end: datetime
+    sessions: tuple[Session, ...]
+    peak: int           # 구간 안 최대 동시 수업 수
+
+    def describe(self) -> str:
+        label = "선생님" if self.kind == "teacher" else "강의실"
+        names = ", ".join(f"{s.name} {s.start:%H:%M}" for s in self.sessions[:MAX_NAMES])
+        more = f" 외 {len(self.sessions) - MAX_NAMES}개" if len(self.sessions) > MAX_NAMES else ""
+        return f"{label} {self.key} {self.start:%H:%M}~{self.end:%H:%M}: 최대 {self.peak}개 동시 ({names}{more})"
+
+
+@dataclass
+class ScheduleReport:
+    day: date
+    sessions: int = 0
+    conflicts: list[Conflict] = field(default_factory=list)
+    peak: int = 0                               # 최대 동시 수업 수
+    peak_at: Optional[datetime] = None
+    alerts: Counter = field(default_factory=Counter)   # 분 -> 알림 수
+    capacity: float = 0.0                       # 워치가 1분에 보낼 수 있는 알림 수
+    overloaded: list[tuple[datetime, int, int]] = field(default_factory=list)  # (분, 알림 수, 밀린 수)
+
+    @property
+    def problems(self) -> bool:
+        return bool(self.conflicts or self.overloaded)
+
+    def format(self) -> str:
+        busiest = max(self.alerts.items(), key=lambda kv: kv[1], default=None)
+        lines = [f"📊 {self.day} 시간표 분석: 수업 {self.sessions}개, 최대 동시 {self.peak}개"
+                 + (f" ({self.peak_at:%H:%M})" if self.peak_at else "")
+                 + (f", 분당 알림 최대 {busiest[1]}개 ({busiest[0]:%H:%M})" if busiest else "")
+                 + f" / 워치 한도 {self.capacity:.0f}개"]
+        for conflict in self.conflicts[:MAX_LISTED]:
+            lines.append(f"  ⚠️ {conflict.describe()}")
+        if len(self.conflicts) > MAX_LISTED:
+            lines.append(f"  ... 겹침 {len(self.conflicts) - MAX_LISTED}건 더")
+        for minute, count, backlog in self.overloaded[:MAX_LISTED]:
+            lines.append(f"  ⚠️ {minute:%H:%M} 알림 {count}개 > 한도 {self.capacity:.0f} (늦거나 버려질 알림 {backlog}개)")
+        if len(self.overloaded) > MAX_LISTED:
+            lines.append(f"  ... 한도 초과 {len(self.overloaded) - MAX_LISTED}분 더")
+        return "\n".join(lines)
+
+
+def minute_capacity(rate: Optional[DisplayRate], send_seconds: float) -> float:
+    """1분 동안 워치에 보낼 수 있는 알림 수 (흐름 제어 토큰 버킷 + 최소 간격 + 전송 시간)"""
+    send_seconds = max(send_seconds, 1e-3)
+    if rate is None:  # 흐름 제어 끔
+        return 60 / send_seconds
+    return min(rate.burst + rate.rate * 60, 60 / (rate.gap + send_seconds) + 1, 60 / send_seconds)
+
+
+def find_conflicts(sessions: Iterable[Session]) -> tuple[list[Conflict], int, Optional[datetime]]:
+    """시작/종료 점 정렬 후 한 번 훑기 -> (선생님/강의실 겹침 구간, 최대 동시 수업 수, 그 시각)"""
+    sessions = list(sessions)
+    points = [(s.start, _START, i) for i, s in enumerate(sessions)]
+    points += [(session_end(s), _END, i) for i, s in enumerate(sessions)]
+    points.sort()
+
+    # 선생님/강의실별 지금 진행 중인 수 + 이어진 묶음 [시작, 수업들, 최대 동시]
+    active: dict[tuple[str, str], int] = defaultdict(int)
+    groups: dict[tuple[str, str], list] = {}
+    conflicts = []
+    running, peak, peak_at = 0, 0, None
+    for at, kind, i in points:
+        session = sessions[i]
+        running += 1 if kind == _START else -1
+        if running > peak:
+            peak, peak_at = running, at
+        for key in (("teacher", session.teacher), ("room", session.room)):
+            if not key[1]:
+                continue
+            if kind == _START:
+                active[key] += 1
+                group = groups.setdefault(key, [at, [], 0])
+                group[1].append(session)
+                group[2] = max(group[2], active[key])
+                continue
+            active[key] -= 1
+            if active[key] == 0:
+                start, members, most = groups.pop(key)
+                del active[key]
+                if most > 1:
+                    conflicts.append(Conflict(key[0], key[1], start, at, tuple(members), most))
+    conflicts.sort(key=lambda c: (c.start, c.kind, c.key))
+    return conflicts, peak, peak_at
+
+
+def alert_load(timeline: Timeline, capacity: float) -> tuple[Counter, list[tuple[datetime, int, int]]]:
+    """분당 알림 수 + 한도를 넘는 분 (못 보낸 알림은 다음 분으로 밀린다고 보고 누적)"""
+    alerts = Counter()
+    for at, count in Counter(event.at for event in timeline.events).items():
+        alerts[at.replace(second=0, microsecond=0)] += count
+    overloaded = []
+    backlog, previous = 0.0, None
+    for minute in sorted(alerts):
+        if previous is not None and backlog:
+            backlog = max(0.0, backlog - capacity * ((minute - previous) / timedelta(minutes=1) - 1))
+        backlog = max(0.0, backlog + alerts[minute] - capacity)
+        if backlog > 0:
+            overloaded.append((minute, alerts[minute], round(backlog)))
+        previous = minute
+    return alerts, overloaded
+
+
+def analyze_timeline(timeline: Timeline, capacity: float) -> ScheduleReport:
+    """컴파일된 하루 타임라인 -> 분석 (수업은 START 이벤트에서)"""
+    day_start = datetime.combine(timeline.day, datetime.min.time())
+    sessions = [e.session for e in timeline.events if e.kind == START]
+    # 전날 시작해서 오늘까지 이어지는 수업도 겹침 판정에는 포함
+    sessions += {e.session for e in timeline.events if e.session.start < day_start}
+    conflicts, peak, peak_at = find_conflicts(sessions)
+    alerts, overloaded = alert_load(timeline, capacity)
+    return ScheduleReport(timeline.day, len(sessions), conflicts, peak, peak_at, alerts, capacity, overloaded)
+
+
+def notifier_capacity(notifier, latency, connected: bool = True) -> float:
+    """지금 워치 설정 기준 분당 한도 (WatchLink면 안쪽 WatchNotifier의 흐름 제어)"""
+    inner = getattr(notifier, "notifier", notifier)
+    pacer = getattr(inner, "pacer", None)
+    address = getattr(notifier, "address", "")
+    return minute_capacity(pacer.rate if pacer is not None else None, latency.estimate(address, connected))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시간표 충돌/알림 부하 분석")
+    parser.add_argument("schedule", help="시간표 파일 (json/csv/toml)")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(), help="분석할 날짜")
+    parser.add_argument("--address", help="워치 MAC 주소 (보정된 표시 속도 기준, 없으면 기본값)")
+    parser.add_argument("--lead", type=int, default=5, help="수업 몇 분 전 알림")
+    args = parser.parse_args()
+
+    from delivery_latency import TRACKER
+    from gatt_cache import GattCache
+    from timer_core import StudentTimer
+    from timer_runtime import DEVICE_ADDRESS
+    from watch_notifier import WatchNotifier
+
+    notifier = WatchNotifier(args.address or DEVICE_ADDRESS)
+    if notifier.pacer is not None:
+        cache = GattCache()
+        firmware = (cache.entry(notifier.address) or {}).get("firmware", "")
+        notifier.pacer.configure(cache.display(notifier.address, firmware) or DEFAULT_DISPLAY)
+    timer = StudentTimer(notifier)
+    timer.load_schedule(args.schedule)
+    timeline = Timeline.compile(timer.students.values(), args.date, args.lead)
+    print(analyze_timeline(timeline, notifier_capacity(notifier, TRACKER)).format())
+
+
+if __name__ == "__main__":
+    main()
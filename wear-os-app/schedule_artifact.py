@@ -0,0 +1,291 @@
+"""
+컴파일된 시간표 아티팩트 (큰 시간표도 시작 즉시)
+- 시간표 파일(json/csv/toml)을 고정 길이 레코드 + 문자열 테이블 바이너리로 컴파일
+  학생 레코드: 이름/강의실/선생님/달력 규칙 (문자열 테이블 위치) + 수업 길이 + 요일 비트
+  슬롯 레코드: 학생 번호 + 하루 중 분 + 수업 길이 + 플래그 (분 순서로 정렬)
+  달력 규칙(개강/종강/휴강/보강)이 있는 학생만 문자열 테이블에 JSON
+- 헤더에 원본 해시 + 본문 해시(= 아티팩트 버전)
+  -> 원본 해시가 같으면 mmap으로 열어서 바로 Schedule로 (JSON/CSV/TOML 파싱 없음)
+  -> 원본이 바뀌었으면 파싱 후 다시 컴파일 (파일 감시로 다시 로드할 때도)
+- 본문 해시가 안 맞거나(손상) 형식 버전이 다르면 다시 컴파일
+
+파일 구조 (리틀 엔디언)
+  헤더    HEADER  매직 / 형식 버전 / 원본 해시 / 본문 해시 / 학생 수 / 슬롯 수 / 문자열 테이블 길이
+  학생    STUDENT × 학생 수
+  슬롯    SLOT × 슬롯 수
+  문자열  UTF-8
+
+아티팩트 위치: ~/.p5s/schedules/ (P5S_SCHEDULE_CACHE로 변경, "off"면 컴파일 안 하고 매번 파싱)
+사용법: python schedule_artifact.py compile 시간표파일     (컴파일 + 크기/로드 시간 비교)
+       python schedule_artifact.py info 시간표파일|아티팩트
+"""
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Optional
+
+from recurrence import Recurrence, parse_rule
+from schedule_file import Schedule, load_schedule, parse_schedule
+
+ARTIFACT_DIR = os.environ.get("P5S_SCHEDULE_CACHE", os.path.join(os.path.expanduser("~"), ".p5s", "schedules"))
+SUFFIX = ".p5ssched"
+
+MAGIC = b"P5SSCHED"
+FORMAT_VERSION = 1
+HASH_SIZE = 16
+
+HEADER = struct.Struct("<8sHH16s16sIII")     # 매직, 형식 버전, 예약, 원본 해시, 본문 해시, 학생 수, 슬롯 수, 문자열 길이
+STUDENT = struct.Struct("<IIIIHHHHHBx")       # 이름/강의실/선생님/달력 위치, 각 길이, 수업 길이(분), 요일 비트
+SLOT = struct.Struct("<IHHBx")                # 학생 번호, 하루 중 분, 수업 길이(분), 플래그
+
+CALENDAR = 0x80         # 슬롯 플래그: 요일 외 달력 규칙 있음 (하위 7비트 = 요일)
+ALL_DAYS = 0x7F
+
+# 분 -> "HH:MM" (디코딩할 때 문자열을 새로 만들지 않음)
+HHMM = [f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)]
+
+log = logging.getLogger("p5s.schedule")
+
+
+def source_hash(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=HASH_SIZE).digest()
+
+
+def artifact_path(source: str, directory: str = ARTIFACT_DIR) -> str:
+    """원본 경로마다 아티팩트 하나 (이름이 같은 다른 폴더의 파일과 겹치지 않게)"""
+    source = os.path.abspath(source)
+    tag = hashlib.blake2b(source.encode("utf-8"), digest_size=4).hexdigest()
+    return os.path.join(directory, f"{os.path.splitext(os.path.basename(source))[0]}-{tag}{SUFFIX}")
+
+
+def _calendar(rule: Recurrence) -> str:
+    """요일 외 규칙 -> JSON (없으면 빈 문자열)"""
+    spec = {}
+    if rule.start:
+        spec["from"] = rule.start.isoformat()
+    if rule.until:
+        spec["until"] = rule.until.isoformat()
+    if rule.exceptions:
+        spec["except"] = sorted(d.isoformat() for d in rule.exceptions)
+    if rule.extra:
+        spec["extra"] = [f"{t:%Y-%m-%d %H:%M}" for t in rule.extra]
+    return json.dumps(spec, ensure_ascii=False, separators=(",", ":")) if spec else ""
+
+
+def compile_schedule(schedule: Schedule, digest: bytes) -> bytes:
+    """Schedule -> 아티팩트 바이트"""
+    strings = bytearray()
+    offsets: dict[str, tuple[int, int]] = {}
+
+    def intern(text: str) -> tuple[int, int]:
+        if not text:
+            return 0, 0
+        if text not in offsets:
+            data = text.encode("utf-8")
+            offsets[text] = (len(strings), len(data))
+            strings.extend(data)
+        return offsets[text]
+
+    names = sorted(schedule.times.keys() | schedule.rules.keys() | schedule.durations.keys()
+                   | schedule.rooms.keys() | schedule.teachers.keys())
+    students = bytearray()
+    flags = []
+    for name in names:
+        rule = schedule.rule(name)
+        weekdays = sum(1 << d for d in rule.weekdays)
+        calendar = _calendar(rule)
+        fields = [intern(name), intern(schedule.rooms.get(name, "")),
+                  intern(schedule.teachers.get(name, "")), intern(calendar)]
+        students += STUDENT.pack(*(off for off, _ in fields), *(length for _, length in fields),
+                                 schedule.durations.get(name, 0), weekdays)
+        flags.append(weekdays | (CALENDAR if calendar else 0))
+
+    slots = sorted((int(t[:2]) * 60 + int(t[3:]), sid)
+                   for sid, name in enumerate(names) for t in schedule.times.get(name, ()))
+    slot_data = bytearray(SLOT.size * len(slots))
+    for i, (minute, sid) in enumerate(slots):
+        SLOT.pack_into(slot_data, i * SLOT.size, sid, minute, schedule.durations.get(names[sid], 0), flags[sid])
+
+    body = bytes(students) + bytes(slot_data) + bytes(strings)
+    return HEADER.pack(MAGIC, FORMAT_VERSION, 0, digest, source_hash(body),
+                       len(names), len(slots), len(strings)) + body
+
+
+class ScheduleArtifact:
+    """mmap으로 연 아티팩트 (with 문으로 닫음)"""
+
+    def __init__(self, path: str, buf: mmap.mmap):
+        self.path = path
+        self.buf = buf
+        (_, self.format, _, self.source_digest, self.body_digest,
+         self.student_count, self.slot_count, strings_len) = HEADER.unpack_from(buf, 0)
+        self.students_at = HEADER.size
+        self.slots_at = self.students_at + STUDENT.size * self.student_count
+        self.strings_at = self.slots_at + SLOT.size * self.slot_count
+        self.end = self.strings_at + strings_len
+
+    @classmethod
+    def open(cls, path: str) -> Optional["ScheduleArtifact"]:
+        """형식이 맞고 본문 해시가 맞으면 아티팩트, 아니면 None"""
+        try:
+            with open(path, "rb") as f:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # 없음 / 빈 파일
+            return None
+        if len(buf) < HEADER.size or buf[:len(MAGIC)] != MAGIC:
+            buf.close()
+            return None
+        artifact = cls(path, buf)
+        with memoryview(buf) as view:
+            valid = (artifact.format == FORMAT_VERSION and artifact.end == len(buf)
+                     and source_hash(view[HEADER.size:]) == artifact.body_digest)
+        if not valid:
+            artifact.close()
+            return None
+        return artifact
+
+    @property
+    def version(self) -> str:
+        return self.body_digest.hex()[:12]
+
+    def _strings(self):
+        """문자열 테이블 -> (위치, 길이)로 꺼내는 함수 (같은 위치는 같은 str 객체)"""
+        table = self.buf[self.strings_at:self.end]
+        cache: dict[int, str] = {}
+
+        def get(off: int, length: int) -> Optional[str]:
+            if not length:
+                return None
+            text = cache.get(off)
+            if text is None:
+                text = cache[off] = table[off:off + length].decode("utf-8")
+            return text
+        return get
+
+    def schedule(self) -> Schedule:
+        """아티팩트 -> Schedule (파싱/시간 정규화 없이 레코드만 풀어서)"""
+        with memoryview(self.buf) as view:
+            return self._decode(view, self._strings())
+
+    def _decode(self, view: memoryview, get) -> Schedule:
+        schedule = Schedule()
+        names = []
+        weekday_rules: dict[int, Recurrence] = {}
+        for (name_off, room_off, teacher_off, cal_off, name_len, room_len, teacher_len, cal_len,
+             duration, weekdays) in STUDENT.iter_unpack(view[self.students_at:self.slots_at]):
+            name = get(name_off, name_len)
+            names.append(name)
+            schedule.times[name] = []
+            if cal_len:
+                spec = json.loads(get(cal_off, cal_len))
+                spec["weekdays"] = [d for d in range(7) if weekdays >> d & 1]
+                schedule.rules[name] = parse_rule(spec)
+            elif weekdays != ALL_DAYS:
+                rule = weekday_rules.get(weekdays)
+                if rule is None:
+                    rule = weekday_rules[weekdays] = Recurrence(
+                        weekdays=frozenset(d for d in range(7) if weekdays >> d & 1))
+                schedule.rules[name] = rule
+            if duration:
+                schedule.durations[name] = duration
+            if room_len:
+                schedule.rooms[name] = get(room_off, room_len)
+            if teacher_len:
+                schedule.teachers[name] = get(teacher_off, teacher_len)
+
+        times = [schedule.times[name] for name in names]
+        for sid, minute, _, _ in SLOT.iter_unpack(view[self.slots_at:self.strings_at]):
+            times[sid].append(HHMM[minute])  # 분 순서로 저장돼 있어서 학생별로도 정렬됨
+        return schedule
+
+    def close(self):
+        self.buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def describe(self) -> str:
+        return (f"v{self.version} 학생 {self.student_count}명 / 슬롯 {self.slot_count}개 / "
+                f"{self.end / 1024:.0f}KB")
+
+
+def write_artifact(path: str, data: bytes):
+    """임시 파일에 쓰고 교체 (열려 있는 mmap은 이전 파일을 계속 봄)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def load_compiled(path: str, directory: str = ARTIFACT_DIR) -> Schedule:
+    """
+    시간표 파일 -> Schedule
+    아티팩트의 원본 해시가 지금 파일과 같으면 mmap에서, 아니면 파싱 후 다시 컴파일
+    """
+    if directory == "off":
+        return load_schedule(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = source_hash(data)
+    target = artifact_path(path, directory)
+
+    artifact = ScheduleArtifact.open(target)
+    if artifact is not None:
+        with artifact:
+            if artifact.source_digest == digest:
+                return artifact.schedule()
+
+    schedule = parse_schedule(data.decode("utf-8-sig"), path)  # 정렬/중복 제거는 parse_schedule에서 (load_schedule과 같게)
+    try:
+        write_artifact(target, compile_schedule(schedule, digest))
+    except OSError as e:
+        log.warning(f"  ⚠️ 시간표 아티팩트 저장 실패 (다음에도 파싱): {e}")
+    return schedule
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시간표 아티팩트 컴파일/확인")
+    parser.add_argument("command", choices=("compile", "info"))
+    parser.add_argument("path", help="시간표 파일 (info는 아티팩트도 가능)")
+    args = parser.parse_args()
+
+    target = args.path if args.path.endswith(SUFFIX) else artifact_path(args.path)
+    if args.command == "compile":
+        if os.path.exists(target):
+            os.remove(target)
+        _, compile_time = _timed(load_compiled, args.path)
+        parsed, parse_time = _timed(load_schedule, args.path)
+        loaded, load_time = _timed(load_compiled, args.path)
+        assert loaded == parsed, "아티팩트 내용이 원본과 다름"
+        print(f"파싱 {parse_time * 1000:.0f}ms / 컴파일 {compile_time * 1000:.0f}ms / "
+              f"아티팩트 로드 {load_time * 1000:.0f}ms")
+
+    artifact = ScheduleArtifact.open(target)
+    if artifact is None:
+        print(f"❌ 아티팩트 없음 또는 손상: {target}")
+        return
+    with artifact:
+        current = ""
+        if not args.path.endswith(SUFFIX):
+            with open(args.path, "rb") as f:
+                current = " (최신)" if source_hash(f.read()) == artifact.source_digest else " (원본이 바뀜)"
+        print(f"{target}\n  {artifact.describe()}{current}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+워치 앱용 시간표 피드 (로컬 HTTP)
+- StudentTimer가 쓰는 학생 데이터 그대로 -> 슬롯 하나가 한 행
+  [id, 이름, 요일, 시작, 종료, 강의실, 선생님]  (id = "이름@HH:MM")
+- 버전 = 내용 해시, 최근 버전 몇 개를 기억해서 워치가 가진 버전 기준 변경분만 전송
+  (모르는 버전이면 전체, 같은 버전이면 304)
+- gzip 압축 (Accept-Encoding: gzip일 때) -> 보통 새로고침은 수백 바이트
+- 워치가 입실/퇴실을 보내면 출석 아웃박스에 기록 (업로드는 런타임의 업로더가)
+
+요청
+  GET  /schedule?since=버전            (또는 If-None-Match: "버전")
+       -> 304 / {"v", "cols", "rows"} / {"v", "cols", "base", "put", "del"}
+  POST /attendance {"id": "이름@HH:MM", "checkIn": "HH:MM"} 또는 "checkOut"
+
+P5S_FEED=host:port 로 주소 변경 (기본 127.0.0.1:8768, 워치에서 붙으려면 0.0.0.0:8768), "off"면 안 엶
+사용법: python schedule_feed.py 시간표파일           (런타임 없이 피드만)
+        curl --compressed 'http://127.0.0.1:8768/schedule?since=...'
+"""
+import argparse
+import asyncio
+import contextlib
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from attendance_outbox import attendance_event
+from recurrence import WEEKDAY_NAMES
+from session_index import DEFAULT_SESSION_MINUTES
+
+FEED_ENDPOINT = os.environ.get("P5S_FEED", "127.0.0.1:8768")
+
+COLUMNS = ["id", "name", "days", "start", "end", "room", "teacher"]
+HISTORY = 16            # 변경분을 만들 수 있는 이전 버전 수
+GZIP_MIN = 128          # 이보다 작은 응답은 압축 안 함 (gzip 헤더가 더 큼)
+MAX_BODY = 4096         # POST 본문 제한
+READ_TIMEOUT = 10.0
+
+log = logging.getLogger("p5s.feed")
+
+STATUS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+          405: "Method Not Allowed", 413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+def student_rows(students, today) -> dict[str, list]:
+    """학생들 -> {id: 행} (종강한 학생은 빼고)"""
+    rows = {}
+    for student in students:
+        rule = student.rule
+        if rule.until and rule.until < today:
+            continue
+        days = "".join(WEEKDAY_NAMES[d] for d in sorted(rule.weekdays))
+        length = timedelta(minutes=student.duration or DEFAULT_SESSION_MINUTES)
+        for hhmm in student.schedule:
+            end = datetime.strptime(hhmm, "%H:%M") + length
+            row_id = f"{student.name}@{hhmm}"
+            rows[row_id] = [row_id, student.name, days, hhmm, f"{end:%H:%M}",
+                            student.room or "", student.teacher or ""]
+    return rows
+
+
+def version_of(rows: dict[str, list]) -> str:
+    text = json.dumps(sorted(rows.values()), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=6).hexdigest()
+
+
+class ScheduleFeed:
+    """StudentTimer -> 버전별 시간표 스냅샷 + 변경분"""
+
+    def __init__(self, timer, outbox=None, history: int = HISTORY):
+        self.timer = timer
+        self.outbox = outbox if outbox is not None else getattr(timer, "outbox", None)
+        self.history_size = history
+        self.history: OrderedDict[str, dict[str, list]] = OrderedDict()  # 버전 -> 행
+        self.requests = 0
+        self.sent_bytes = 0
+
+    def snapshot(self) -> tuple[str, dict[str, list]]:
+        """지금 시간표 (바뀌었으면 새 버전으로 기억)"""
+        rows = student_rows(self.timer.students.values(), self.timer.clock.now().date())
+        version = version_of(rows)
+        if version in self.history:
+            self.history.move_to_end(version)
+        else:
+            self.history[version] = rows
+            while len(self.history) > self.history_size:
+                self.history.popitem(last=False)
+        return version, self.history[version]
+
+    def changes(self, since: Optional[str]) -> tuple[str, Optional[dict]]:
+        """(현재 버전, 응답 본문) - 본문이 None이면 변경 없음"""
+        version, rows = self.snapshot()
+        if since == version:
+            return version, None
+        base = self.history.get(since) if since else None
+        if base is None:
+            return version, {"v": version, "cols": COLUMNS, "rows": sorted(rows.values())}
+        return version, {
+            "v": version, "cols": COLUMNS, "base": since,
+            "put": sorted(row for key, row in rows.items() if base.get(key) != row),
+            "del": sorted(key for key in base if key not in rows),
+        }
+
+    def record(self, req: dict) -> dict:
+        """워치의 입실/퇴실 -> 출석 아웃박스"""
+        name, _, hhmm = str(req["id"]).rpartition("@")
+        if not name or not (req.get("checkIn") or req.get("checkOut")):
+            raise ValueError("id(이름@HH:MM)와 checkIn/checkOut 필요")
+        today = self.timer.clock.now().date()
+        scheduled = datetime.combine(today, datetime.strptime(hhmm, "%H:%M").time())
+        stamp = {k: datetime.combine(today, datetime.strptime(req[v], "%H:%M").time())
+                 for k, v in (("check_in", "checkIn"), ("check_out", "checkOut")) if req.get(v)}
+        student = self.timer.students.get(name)
+        duration = student.duration if student and "check_out" in stamp else None
+        key, fields = attendance_event(name, scheduled, duration=duration, **stamp)
+        self.outbox.add(key, fields)
+        log.info(f"  ⌚ 워치 출석: {name} {hhmm} {' '.join(f'{k}={v}' for k, v in fields.items() if k.startswith('check'))}")
+        return {"ok": True, "key": key}
+
+    # ========== HTTP ==========
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """요청 하나 처리하고 닫음 (Connection: close)"""
+        try:
+            status, headers, body = await asyncio.wait_for(self._handle(reader), READ_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            writer.close()
+            return
+        head = [f"HTTP/1.1 {status} {STATUS[status]}", f"Content-Length: {len(body)}",
+                "Connection: close", *(f"{k}: {v}" for k, v in headers.items())]
+        try:
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+            self.requests += 1
+            self.sent_bytes += len(body)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, reader: asyncio.StreamReader) -> tuple[int, dict, bytes]:
+        method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        url = urlsplit(target)
+
+        if url.path.rstrip("/") == "/schedule":
+            if method != "GET":
+                return 405, {}, b""
+            since = parse_qs(url.query).get("since", [None])[0] or headers.get("if-none-match", "").strip('"')
+            version, body = self.changes(since or None)
+            etag = {"ETag": f'"{version}"', "Cache-Control": "no-cache"}
+            if body is None:
+                return 304, etag, b""
+            return self._json(200, body, "gzip" in headers.get("accept-encoding", ""), etag)
+
+        if url.path.rstrip("/") == "/attendance":
+            if method != "POST":
+                return 405, {}, b""
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY:
+                return 413, {}, b""
+            if self.outbox is None:
+                return self._json(503, {"ok": False, "error": "출석 아웃박스 없음"})
+            try:
+                return self._json(200, self.record(json.loads(await reader.readexactly(length))))
+            except (ValueError, KeyError, TypeError) as e:
+                return self._json(400, {"ok": False, "error": str(e)})
+
+        return 404, {}, b""
+
+    @staticmethod
+    def _json(status: int, payload: dict, compress: bool = False, headers: Optional[dict] = None):
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8", **(headers or {})}
+        if compress and len(body) >= GZIP_MIN:
+            body = gzip.compress(body, mtime=0)
+            headers["Content-Encoding"] = "gzip"
+        return status, headers, body
+
+    def report(self) -> str:
+        avg = self.sent_bytes / self.requests if self.requests else 0
+        return f"📦 시간표 피드: 요청 {self.requests}회, 평균 {avg:.0f}B (버전 {len(self.history)}개 기억)"
+
+
+async def serve_feed(feed: ScheduleFeed, endpoint: str = FEED_ENDPOINT) -> Optional[asyncio.AbstractServer]:
+    """피드 HTTP 서버 시작 (주소가 "off"거나 못 열면 None)"""
+    from timer_runtime import parse_endpoint
+
+    address = parse_endpoint(endpoint)
+    if address is None:
+        return None
+    try:
+        server = await asyncio.start_server(feed.serve, *address)
+    except OSError as e:
+        log.warning(f"  ⚠️ 시간표 피드를 못 엶 ({e})")
+        return None
+    log.info("  📦 시간표 피드: http://%s:%d/schedule" % address)
+    return server
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="워치 앱용 시간표 피드 (런타임 없이 단독 실행)")
+    parser.add_argument("schedule", help="시간표 파일 (json/csv/toml, 수정하면 자동 반영)")
+    parser.add_argument("--endpoint", default=FEED_ENDPOINT, help="host:port")
+    args = parser.parse_args()
+
+    from attendance_outbox import Outbox
+    from log_pipeline import setup_logging
+    from timer_core import StudentTimer
+
+    setup_logging()
+    timer = StudentTimer(outbox=Outbox())
+    timer.load_schedule(args.schedule)
+    feed = ScheduleFeed(timer)
+    server = await serve_feed(feed, args.endpoint)
+    if server is None:
+        return
+    try:
+        await timer.watch_schedule(args.schedule)
+    finally:
+        server.close()
+        await server.wait_closed()
+        log.info(feed.report())
+
+
+if __name__ == "__main__":
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(main())
@@ -0,0 +1,338 @@
+"""
+학생 시간표 파일 로더 + 변경 감시
+- JSON / CSV / TOML 시간표 파일 로드
+- 이전 내용과 비교해서 바뀐 슬롯(추가/삭제/이동)만 계산
+- inotify로 파일 감시 (지원 안 되면 mtime 폴링)
+
+파일 형식 예시:
+    JSON:  {"김철수": ["15:00", "16:30"], "이영희": ["15:30"]}
+           또는 [{"name": "김철수", "times": ["15:00", "16:30"]}, ...]
+           반복 규칙/수업 길이(분): {"박민수": {"times": ["17:00"], "duration": 90, "weekdays": "월수금",
+                                 "until": "2026-12-20", "except": ["2026-11-02"],
+                                 "extra": ["2026-11-07 14:00"]}}
+           강의실/선생님: {"정수진": {"times": ["16:00"], "room": "A", "teacher": "김선생"}}
+    CSV:   name,time[,weekdays[,duration[,room[,teacher]]]]  (한 줄에 슬롯 하나, 헤더 생략 가능)
+    TOML:  [students]
+           김철수 = ["15:00", "16:30"]
+           박민수 = { times = ["17:00"], weekdays = "화목", duration = 90 }
+"""
+import asyncio
+import csv
+import functools
+import json
+import logging
+import os
+import struct
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from recurrence import DAILY, Recurrence, parse_rule, parse_weekdays
+
+log = logging.getLogger("p5s.schedule")
+
+# 슬롯 = (학생 이름, "HH:MM")
+Slot = tuple[str, str]
+
+
+@dataclass
+class Schedule:
+    """시간표 파일 내용"""
+    times: dict[str, list[str]] = field(default_factory=dict)      # 이름 -> 정렬된 시간 목록
+    rules: dict[str, Recurrence] = field(default_factory=dict)     # 매일이 아닌 학생만
+    durations: dict[str, int] = field(default_factory=dict)        # 수업 길이(분)가 있는 학생만
+    rooms: dict[str, str] = field(default_factory=dict)            # 강의실이 있는 학생만
+    teachers: dict[str, str] = field(default_factory=dict)         # 담당 선생님이 있는 학생만
+
+    def rule(self, name: str) -> Recurrence:
+        return self.rules.get(name, DAILY)
+
+    def __len__(self):
+        return len(self.times)
+
+
+@dataclass
+class ScheduleDiff:
+    """두 시간표 사이의 변경분"""
+    added: list[Slot] = field(default_factory=list)
+    removed: list[Slot] = field(default_factory=list)
+    rules: dict[str, Recurrence] = field(default_factory=dict)     # 반복 규칙이 바뀐 학생
+    durations: dict[str, Optional[int]] = field(default_factory=dict)  # 수업 길이가 바뀐 학생
+    rooms: dict[str, Optional[str]] = field(default_factory=dict)      # 강의실이 바뀐 학생
+    teachers: dict[str, Optional[str]] = field(default_factory=dict)   # 선생님이 바뀐 학생
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.rules or self.durations
+                    or self.rooms or self.teachers)
+
+    @property
+    def names(self) -> set[str]:
+        """뭐라도 바뀐 학생"""
+        return ({n for n, _ in self.added} | {n for n, _ in self.removed} | self.rules.keys()
+                | self.durations.keys() | self.rooms.keys() | self.teachers.keys())
+
+    @property
+    def moved(self) -> set[str]:
+        """슬롯이 추가되고 삭제된 학생 (= 시간 이동)"""
+        return {n for n, _ in self.added} & {n for n, _ in self.removed}
+
+
+@functools.lru_cache(maxsize=2048)  # 하루 1440분이라 전부 캐시됨
+def normalize_time(value: str) -> str:
+    """"9:5" -> "09:05" (잘못된 형식이면 ValueError)"""
+    hour, minute = map(int, str(value).strip().split(':'))
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"잘못된 시간: {value}")
+    return f"{hour:02d}:{minute:02d}"
+
+
+def _from_mapping(data) -> Schedule:
+    """JSON/TOML 공통: dict 또는 list 형식을 Schedule로"""
+    if isinstance(data, dict) and "students" in data:
+        data = data["students"]
+
+    if isinstance(data, dict):
+        items = ((name, spec if isinstance(spec, dict) else {"times": spec})
+                 for name, spec in data.items())
+    else:
+        items = ((row["name"], row) for row in data)
+
+    schedule = Schedule()
+    for name, spec in items:
+        times = spec.get("times") or ([spec["time"]] if "time" in spec else [])
+        if isinstance(times, str):
+            times = times.split(',')
+        schedule.times.setdefault(name, []).extend(normalize_time(t) for t in times)
+        rule = parse_rule(spec)
+        if not rule.is_daily:
+            schedule.rules[name] = rule
+        if spec.get("duration"):
+            schedule.durations[name] = int(spec["duration"])
+        if spec.get("room"):
+            schedule.rooms[name] = str(spec["room"])
+        if spec.get("teacher"):
+            schedule.teachers[name] = str(spec["teacher"])
+    return schedule
+
+
+def _from_csv(text: str) -> Schedule:
+    schedule = Schedule()
+    for row in csv.reader(text.splitlines()):
+        if not row or row[0].startswith('#') or row[0] == "name":  # 빈 줄/주석/헤더
+            continue
+        name = row[0].strip()
+        schedule.times.setdefault(name, []).append(normalize_time(row[1]))
+        if len(row) > 2 and row[2].strip():
+            schedule.rules[name] = Recurrence(weekdays=parse_weekdays(row[2]))
+        if len(row) > 3 and row[3].strip():
+            schedule.durations[name] = int(row[3])
+        if len(row) > 4 and row[4].strip():
+            schedule.rooms[name] = row[4].strip()
+        if len(row) > 5 and row[5].strip():
+            schedule.teachers[name] = row[5].strip()
+    return schedule
+
+
+def _from_toml(text: str) -> Schedule:
+    try:
+        import tomllib
+    except ImportError:  # Python 3.10 이하
+        import tomli as tomllib
+    return _from_mapping(tomllib.loads(text))
+
+
+def load_schedule(path: str) -> Schedule:
+    """시간표 파일 로드"""
+    with open(path, encoding='utf-8-sig') as f:
+        return parse_schedule(f.read(), path)
+
+
+def parse_schedule(text: str, path: str) -> Schedule:
+    """시간표 파일 내용 -> Schedule (형식은 path 확장자로)"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        schedule = _from_csv(text)
+    elif ext == '.toml':
+        schedule = _from_toml(text)
+    elif ext == '.json':
+        schedule = _from_mapping(json.loads(text))
+    else:
+        raise ValueError(f"지원하지 않는 시간표 형식: {ext}")
+
+    schedule.times = {name: sorted(set(times)) for name, times in schedule.times.items()}
+    return schedule
+
+
+def to_slots(schedule: Schedule) -> set[Slot]:
+    return {(name, t) for name, times in schedule.times.items() for t in times}
+
+
+def _changed(old: dict, new: dict) -> dict:
+    """학생별 값 비교 (파일에서 빠진 값은 None)"""
+    return {name: new.get(name) for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+
+
+def diff_schedules(old: Schedule, new: Schedule) -> ScheduleDiff:
+    """슬롯 단위 비교 (집합 연산이라 만 줄도 수 ms)"""
+    old_slots, new_slots = to_slots(old), to_slots(new)
+    rules = {name: new.rule(name) for name in old.rules.keys() | new.rules.keys()
+             if old.rule(name) != new.rule(name)}  # 파일에서 빠진 학생은 DAILY로
+    return ScheduleDiff(
+        added=sorted(new_slots - old_slots),
+        removed=sorted(old_slots - new_slots),
+        rules=rules,
+        durations=_changed(old.durations, new.durations),
+        rooms=_changed(old.rooms, new.rooms),
+        teachers=_changed(old.teachers, new.teachers),
+    )
+
+
+def apply_slot_diff(students: dict, diff: ScheduleDiff,
+                    make_student: Callable, retired: dict[str, set]):
+    """
+    StudentTimer.students에 변경분만 반영
+    - 나머지 학생/슬롯의 alerted_times는 그대로 유지
+    - 슬롯이 모두 빠진 학생은 제거하되 alerted_times를 retired에 보관
+      (같은 날 다시 추가돼도 중복 알림 없음)
+    - 보강만 있는 학생은 정규 슬롯이 없어도 유지
+    """
+    def get_or_create(name):
+        student = students.get(name)
+        if student is None:
+            student = make_student(name=name, schedule=[])
+            student.alerted_times = retired.pop(name, set())
+            students[name] = student
+        return student
+
+    for name, rule in diff.rules.items():
+        if name in students or not rule.is_daily:
+            get_or_create(name).rule = rule
+
+    for attr in ("duration", "room", "teacher"):
+        for name, value in getattr(diff, attr + "s").items():
+            if name in students or value:
+                setattr(get_or_create(name), attr, value)
+
+    for name, time_str in diff.removed:
+        student = students.get(name)
+        if student is not None and time_str in student.schedule:
+            student.schedule.remove(time_str)
+
+    for name, time_str in diff.added:
+        student = get_or_create(name)
+        if time_str not in student.schedule:
+            student.schedule.append(time_str)
+            student.schedule.sort()
+
+    for name in diff.names - {n for n, _ in diff.added}:
+        student = students.get(name)
+        if student is not None and not student.schedule and not student.rule.extra:
+            retired[name] = student.alerted_times
+            del students[name]
+
+
+# ========== 파일 감시 ==========
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _inotify_open(directory: str) -> Optional[int]:
+    """inotify fd 생성 (리눅스 아니거나 실패하면 None)"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+class ScheduleWatcher:
+    """
+    시간표 파일 감시 -> 바뀔 때마다 on_change(새 시간표) 호출
+    - 에디터가 파일을 교체 저장해도 잡히도록 디렉터리를 감시
+    - 연속 이벤트는 debounce초 동안 모아서 한 번만 로드
+    """
+
+    def __init__(self, path: str, on_change: Callable[[Schedule], None],
+                 poll_interval: float = 2.0, debounce: float = 0.05,
+                 loader: Callable[[str], Schedule] = load_schedule):
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.loader = loader  # 경로 -> Schedule (schedule_artifact.load_compiled면 바뀔 때마다 다시 컴파일)
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.use_inotify = True
+        self._stamp = self._file_stamp()
+        self._changed = asyncio.Event()
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def _on_inotify(self, fd: int):
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        target = os.fsencode(os.path.basename(self.path))
+        offset = 0
+        while offset < len(data):
+            _, _, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+            if name == target:
+                self._changed.set()
+
+    def _reload(self):
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return
+        self._stamp = stamp
+        # 구조가 틀린 파일(목록 자리에 숫자 등)은 TypeError/AttributeError도 남 -> 무엇이든 기존 유지하고 계속 감시
+        try:
+            schedule = self.loader(self.path)
+        except Exception as e:
+            log.warning(f"⚠️ 시간표 로드 실패 (기존 유지): {type(e).__name__}: {e}",
+                        extra={"event": "reload_failed", "path": self.path})
+            return
+        try:
+            self.on_change(schedule)
+        except Exception:
+            log.exception("⚠️ 시간표 반영 실패", extra={"event": "reload_failed", "path": self.path})
+
+    async def run(self):
+        """감시 루프 (취소될 때까지)"""
+        loop = asyncio.get_running_loop()
+        fd = _inotify_open(os.path.dirname(self.path)) if self.use_inotify else None
+        if fd is not None:
+            loop.add_reader(fd, self._on_inotify, fd)
+        try:
+            while True:
+                if fd is not None:
+                    await self._changed.wait()
+                    await asyncio.sleep(self.debounce)
+                    self._changed.clear()
+                else:
+                    await asyncio.sleep(self.poll_interval)
+                self._reload()
+        finally:
+            if fd is not None:
+                loop.remove_reader(fd)
+                os.close(fd)
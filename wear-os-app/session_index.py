@@ -0,0 +1,138 @@
+"""
+오늘 수업 구간 인덱스 (대시보드용 조회)
+- 지금 수업 중인 학생 / N분 안에 시작·종료하는 수업 / 강의실·선생님별 빈 시간
+- 시작 시각, 종료 시각으로 정렬된 리스트 + bisect -> 조회는 O(log n + k)
+- '수업 중' 조회는 수업 길이별로 나눈 시작 시각 리스트에서
+  (t - 길이, t] 구간만 잘라냄 (길이 종류는 보통 몇 개뿐)
+- 시간표가 바뀌면 바뀐 학생의 구간만 빼고 다시 넣음
+"""
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+from timeline import Session, sessions_between
+
+# 수업 길이가 없는 학생은 이 길이로 봄
+DEFAULT_SESSION_MINUTES = 50
+
+_TICK = timedelta(microseconds=1)  # datetime 최소 단위 ("초과" 비교용)
+
+
+def session_end(session: Session) -> datetime:
+    return session.start + timedelta(minutes=session.duration or DEFAULT_SESSION_MINUTES)
+
+
+def _span(entries: list, start: datetime, end: datetime) -> list:
+    """(시각, 이름, Session) 정렬 리스트에서 start <= 시각 < end 인 것"""
+    return entries[bisect_left(entries, (start,)):bisect_left(entries, (end,))]
+
+
+def _discard(entries: list, key: tuple):
+    i = bisect_left(entries, key[:2])
+    if i < len(entries) and entries[i][:2] == key[:2]:
+        del entries[i]
+
+
+class SessionIndex:
+    """하루치 수업 구간 (학생 단위로 갱신)"""
+
+    def __init__(self, day: date):
+        self.day = day
+        self.day_start = datetime.combine(day, datetime.min.time())
+        self.day_end = self.day_start + timedelta(days=1)
+        self.by_name: dict[str, list[Session]] = {}
+        self.starts: list[tuple] = []                      # (시작, 이름, Session)
+        self.ends: list[tuple] = []                        # (종료, 이름, Session)
+        self.by_length: dict[int, list[tuple]] = {}        # 길이(분) -> 시작 순 리스트
+        self.by_room: dict[str, list[tuple]] = {}
+        self.by_teacher: dict[str, list[tuple]] = {}
+
+    @classmethod
+    def build(cls, students: Iterable, day: date) -> "SessionIndex":
+        index = cls(day)
+        for session in index._sessions(students):
+            index._add(session, append=True)
+        for entries in (index.starts, index.ends, *index.by_length.values(),
+                        *index.by_room.values(), *index.by_teacher.values()):
+            entries.sort(key=lambda e: e[:2])  # 처음엔 한 번에 정렬
+        return index
+
+    def _sessions(self, students: Iterable) -> list[Session]:
+        """오늘과 겹치는 수업 (전날 늦게 시작해서 오늘까지 이어지는 수업 포함)"""
+        sessions = sessions_between(students, self.day_start - timedelta(days=1), self.day_end)
+        # 보강이 정규 시간과 겹치면 한 번만
+        unique = {(s.name, s.start): s for s in sessions if session_end(s) > self.day_start}
+        return list(unique.values())
+
+    def _add(self, session: Session, append: bool = False):
+        put = list.append if append else insort
+        start, end, name = session.start, session_end(session), session.name
+        self.by_name.setdefault(name, []).append(session)
+        put(self.starts, (start, name, session))
+        put(self.ends, (end, name, session))
+        length = session.duration or DEFAULT_SESSION_MINUTES
+        put(self.by_length.setdefault(length, []), (start, name, session))
+        if session.room:
+            put(self.by_room.setdefault(session.room, []), (start, name, session))
+        if session.teacher:
+            put(self.by_teacher.setdefault(session.teacher, []), (start, name, session))
+
+    def remove(self, name: str):
+        """학생 구간 전부 제거"""
+        for session in self.by_name.pop(name, []):
+            key = (session.start, name)
+            _discard(self.starts, key)
+            _discard(self.ends, (session_end(session), name))
+            _discard(self.by_length[session.duration or DEFAULT_SESSION_MINUTES], key)
+            if session.room:
+                _discard(self.by_room[session.room], key)
+            if session.teacher:
+                _discard(self.by_teacher[session.teacher], key)
+
+    def update(self, name: str, student=None):
+        """학생 한 명 다시 계산 (student가 None이면 제거만)"""
+        self.remove(name)
+        if student is not None:
+            for session in self._sessions([student]):
+                self._add(session)
+
+    # ========== 조회 ==========
+
+    def in_class(self, now: datetime) -> list[Session]:
+        """now에 수업 중 (시작 <= now < 종료)"""
+        found = []
+        for length, entries in self.by_length.items():
+            found.extend(e[2] for e in _span(entries, now - timedelta(minutes=length) + _TICK, now + _TICK))
+        return sorted(found, key=lambda s: (s.start, s.name))
+
+    def starting(self, now: datetime, minutes: int) -> list[Session]:
+        """now ~ now+minutes 사이에 시작"""
+        return [e[2] for e in _span(self.starts, now, now + timedelta(minutes=minutes))]
+
+    def ending(self, now: datetime, minutes: int) -> list[Session]:
+        """now ~ now+minutes 사이에 종료"""
+        return [e[2] for e in _span(self.ends, now, now + timedelta(minutes=minutes))]
+
+    def free_gaps(self, room: Optional[str] = None, teacher: Optional[str] = None,
+                  start: Optional[datetime] = None, end: Optional[datetime] = None,
+                  min_minutes: int = 0) -> list[tuple[datetime, datetime]]:
+        """강의실 또는 선생님의 빈 시간 [(시작, 끝), ...] (기본: 오늘 하루 전체)"""
+        if (room is None) == (teacher is None):
+            raise ValueError("room 또는 teacher 중 하나만 지정")
+        entries = self.by_room.get(room, []) if room is not None else self.by_teacher.get(teacher, [])
+        start = start or self.day_start
+        end = end or self.day_end
+        longest = max(self.by_length, default=0)
+
+        gaps = []
+        cursor = start
+        for _, _, session in _span(entries, start - timedelta(minutes=longest), end):
+            if session.start > cursor:
+                gaps.append((cursor, session.start))
+            cursor = max(cursor, session_end(session))
+        if cursor < end:
+            gaps.append((cursor, end))
+        return [(a, b) for a, b in gaps if b - a >= timedelta(minutes=min_minutes)]
+
+    def __len__(self):
+        return len(self.starts)
@@ -0,0 +1,324 @@
+"""
+장시간 soak 테스트 (가상 시간, 누수 감지)
+- 실제 StudentTimer + TimerManager + WatchLink(감독 연결) + WatchNotifier를 가상 시간 루프에서 며칠치 실행
+- 워치는 SimulatedWatch (BleakClient 대용): 연결/write 지연 + 확률적 끊김 / 연결 실패 + 주기적 재부팅
+- 시간표: 학생 N명이 30분마다 수업 (수업 전/시작/종료 전/종료/초과 알림) -> 하루 수천 건
+- 카운트다운: 매 분 개인 타이머, 10분마다 그룹 타이머, 태그 연장/취소, 6시간마다 전체 이동
+- 가상 H시간마다 스냅숏: tracemalloc, RSS, 태스크 수, 열린 fd, gc 객체 수,
+  alerted_times 키 수, 타이머/힙 항목 수, 정리 안 된 client 수
+- 첫날은 워밍업, 이후 날짜별로 같은 시각 스냅숏끼리 비교 (하루 주기로 늘고 줄어드는 건 무시)
+  대부분의 시각에서 늘었고 하루 증가량이 허용치를 넘으면 실패 (종료 코드 1, tracemalloc 상위 증가 위치 출력)
+
+캐시 파일은 끝나면 지우는 임시 폴더에만 (공용 dedup은 실제 시각 TTL이라 사용 안 함)
+알림 싱크는 워치만 (P5S_SINKS의 데스크톱/소리/로그 싱크는 안 씀)
+사용법: python soak.py [--days 4] [--students 40] [--drop 0.01] [--connect-fail 0.1] [--snapshot-hours 2]
+                      [--seed 1] [--no-tracemalloc]
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from clock import run_virtual
+
+ADDRESS = "50:AC:50:AC:00:01"
+CONNECT_DELAY = 0.8      # 가상 워치 연결 시간 (초)
+WRITE_DELAY = 0.015      # write 한 번 (초)
+REBOOT_EVERY = 6 * 3600  # 워치 재부팅 (모든 연결 끊김) 간격 (초)
+
+# 하루 증가량 허용치 (이보다 적게 늘면 잡음으로 봄)
+SLACK = {
+    "traced_kb": 256, "rss_kb": 4096, "tasks": 2, "fds": 1, "gc_objects": 2000,
+    "alerted_keys": 0, "timers": 5, "heap_entries": 50, "open_clients": 0,
+}
+
+
+class _Char:
+    def __init__(self, uuid: str, handle: int):
+        self.uuid = uuid
+        self.handle = handle
+        self.properties = ["write", "notify"]
+
+
+class _Services:
+    def __init__(self, chars: list[_Char]):
+        self.uuid, self.handle, self.characteristics = "000001ff-3c17-d293-8e48-14fe2e4da212", 1, chars
+
+    def get_characteristic(self, uuid):
+        uuid = str(getattr(uuid, "uuid", uuid))
+        return next((c for c in self.characteristics if c.uuid == uuid), None)
+
+    def __iter__(self):
+        return iter([self])
+
+
+class SimulatedWatch:
+    """가상 워치 - client()가 BleakClient 대용을 만듦 (만든 client 중 disconnect 안 된 것을 셈)"""
+
+    def __init__(self, rng: random.Random, drop: float, connect_fail: float):
+        from gatt_cache import NOTIFY_CHAR, WRITE_CHAR
+
+        self.rng = rng
+        self.drop = drop
+        self.connect_fail = connect_fail
+        self.chars = [_Char(WRITE_CHAR, 0x10), _Char(NOTIFY_CHAR, 0x12)]
+        self.open: set["SimulatedClient"] = set()  # disconnect()가 안 불린 client (백엔드 자원이 남는 것)
+        self.created = 0
+        self.writes = 0
+        self.drops = 0
+
+    def client(self, target) -> "SimulatedClient":
+        self.created += 1
+        return SimulatedClient(self)
+
+    def reboot(self):
+        """워치 재부팅 - 연결된 client 전부 끊김 (정리는 안 됨)"""
+        for client in self.open:
+            client.is_connected = False
+
+
+class SimulatedClient:
+    """BleakClient 대용 (connect / disconnect / write_gatt_char / start_notify / services / mtu_size)"""
+
+    mtu_size = 23
+
+    def __init__(self, watch: SimulatedWatch):
+        self.watch = watch
+        self.is_connected = False
+        self.services = _Services(watch.chars)
+
+    async def connect(self, **kwargs):
+        self.watch.open.add(self)
+        await asyncio.sleep(CONNECT_DELAY)
+        if self.watch.rng.random() < self.watch.connect_fail:
+            raise OSError("가상 워치: 연결 실패")
+        self.is_connected = True
+        return True
+
+    async def disconnect(self):
+        self.is_connected = False
+        self.watch.open.discard(self)
+        return True
+
+    async def start_notify(self, char, callback, **kwargs):
+        pass
+
+    async def stop_notify(self, char):
+        pass
+
+    async def read_gatt_char(self, char, *args, **kwargs):
+        return b"soak"
+
+    async def write_gatt_char(self, char, data, response=None):
+        if not self.is_connected:
+            raise OSError("가상 워치: 연결 안 됨")
+        await asyncio.sleep(WRITE_DELAY)
+        if self.watch.rng.random() < self.watch.drop:
+            self.is_connected = False
+            self.watch.drops += 1
+            raise OSError("가상 워치: 연결 끊김")
+        self.watch.writes += 1
+
+
+@dataclass
+class Snapshot:
+    at: datetime
+    metrics: dict[str, Optional[float]] = field(default_factory=dict)
+
+
+def rss_kb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def open_fds() -> Optional[int]:
+    for path in ("/proc/self/fd", "/dev/fd"):
+        if os.path.isdir(path):
+            return len(os.listdir(path))
+    return None
+
+
+def take_snapshot(clock, timer, manager, watch: SimulatedWatch) -> Snapshot:
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0] / 1024 if tracemalloc.is_tracing() else None
+    alerted = sum(len(s.alerted_times) for s in timer.students.values())
+    alerted += sum(len(keys) for keys in timer.retired_alerts.values())
+    return Snapshot(clock.now(), {
+        "traced_kb": traced, "rss_kb": rss_kb(), "tasks": len(asyncio.all_tasks()), "fds": open_fds(),
+        "gc_objects": len(gc.get_objects()), "alerted_keys": alerted, "timers": len(manager.timers),
+        "heap_entries": manager.heap.entries, "open_clients": len(watch.open),
+    })
+
+
+def detect_growth(snapshots: list[Snapshot], per_day: int) -> list[str]:
+    """첫날(워밍업) 이후 첫날과 마지막 날의 같은 시각 스냅숏 비교 -> 계속 느는 지표 설명"""
+    days = [snapshots[i:i + per_day] for i in range(per_day, len(snapshots), per_day)]
+    days = [day for day in days if len(day) == per_day]
+    if len(days) < 2:
+        return []
+    first, last, span = days[0], days[-1], len(days) - 1
+    problems = []
+    for name, slack in SLACK.items():
+        deltas = [b.metrics[name] - a.metrics[name] for a, b in zip(first, last)
+                  if a.metrics.get(name) is not None and b.metrics.get(name) is not None]
+        if not deltas:
+            continue
+        per_day_growth = statistics.median(deltas) / span
+        rising = sum(d > 0 for d in deltas)
+        if rising >= 0.75 * len(deltas) and per_day_growth > slack:
+            problems.append(f"{name}: 하루 +{per_day_growth:,.1f} (허용 {slack}, {rising}/{len(deltas)}개 시각에서 증가)")
+    return problems
+
+
+def build_students(timer, count: int, rng: random.Random):
+    """학생마다 30분 간격 수업 (시작 분을 흩어서 알림이 몰리지 않게)"""
+    for i in range(count):
+        offset = rng.randrange(0, 30)
+        times = [f"{m // 60:02d}:{m % 60:02d}" for m in range(8 * 60 + offset, 22 * 60, 30)]
+        timer.add_student(f"학생{i:03d}", times, duration=20)
+
+
+async def churn_timers(manager, rng: random.Random):
+    """카운트다운 타이머를 계속 추가/연장/취소"""
+    minute = 0
+    while True:
+        await asyncio.sleep(60)
+        minute += 1
+        manager.add_timer(f"개인{minute % 300}", rng.randint(1, 40), tags=[f"반{minute % 5}"])
+        if minute % 10 == 0:
+            members = [f"학생{rng.randrange(100):03d}" for _ in range(rng.randint(2, 6))]
+            manager.add_group(f"조{minute % 40}", members, rng.randint(5, 50), tags=[f"반{minute % 5}"])
+        if minute % 30 == 0:
+            manager.extend_tag(f"반{rng.randrange(5)}", rng.randint(1, 5))
+        if minute % 45 == 0:
+            manager.cancel_tag(f"반{rng.randrange(5)}")
+        if minute % 360 == 0:
+            manager.shift_all(1)
+
+
+async def reboot_watch(watch: SimulatedWatch):
+    while True:
+        await asyncio.sleep(REBOOT_EVERY)
+        watch.reboot()
+
+
+async def soak(clock, args) -> tuple[list[Snapshot], list[str], dict]:
+    from alert_bus import default_bus
+    from timer_core import StudentTimer, TimerManager
+    from watch_notifier import WatchNotifier
+    from timer_runtime import WatchLink
+
+    rng = random.Random(args.seed)
+    watch = SimulatedWatch(rng, args.drop, args.connect_fail)
+    link = WatchLink(ADDRESS, WatchNotifier(ADDRESS, client_factory=watch.client)).start()
+    bus = default_bus(link, clock, sinks=[])  # P5S_SINKS(개발자 실제 데스크톱/소리/로그 싱크)는 안 씀
+    timer = StudentTimer(notifier=link, clock=clock, bus=bus)
+    manager = TimerManager(notifier=link, clock=clock, bus=bus)
+    build_students(timer, args.students, rng)
+
+    runner = asyncio.create_task(timer.run(check_interval=30), name="soak-schedule")
+    helpers = [asyncio.create_task(churn_timers(manager, rng), name="soak-churn"),
+               asyncio.create_task(reboot_watch(watch), name="soak-reboot")]
+
+    snapshots: list[Snapshot] = []
+    per_day = int(24 / args.snapshot_hours)
+    warm: Optional[tracemalloc.Snapshot] = None
+    for i in range(args.days * per_day + 1):
+        if i:
+            await asyncio.sleep(args.snapshot_hours * 3600)
+        snapshots.append(take_snapshot(clock, timer, manager, watch))
+        if i == per_day and tracemalloc.is_tracing():
+            warm = tracemalloc.take_snapshot()
+        if args.verbose:
+            print(format_snapshot(snapshots[-1]), file=sys.stderr)
+
+    top = []
+    if warm is not None:
+        diff = tracemalloc.take_snapshot().compare_to(warm, "lineno")
+        top = [str(stat) for stat in diff[:10] if stat.size_diff > 0]
+
+    timer.stop()
+    for task in [runner, *helpers]:
+        task.cancel()  # 보내는 중이던 알림은 기다리지 않음
+    await asyncio.gather(runner, *helpers, return_exceptions=True)
+    await manager.close()  # 버스도 같이 닫힘
+    await link.close()
+
+    stats = {"sent": link.sent, "failed": link.failed, "reconnects": link.reconnects,
+             "clients": watch.created, "writes": watch.writes, "drops": watch.drops}
+    return snapshots, top, stats
+
+
+def format_snapshot(snapshot: Snapshot) -> str:
+    parts = [f"{snapshot.at:%m-%d %H:%M}"]
+    for name, value in snapshot.metrics.items():
+        parts.append(f"{name}={'-' if value is None else f'{value:,.0f}'}")
+    return "  ".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 시간 soak 테스트 + 누수 감지")
+    parser.add_argument("--days", type=int, default=4, help="가상 일수 (첫날은 워밍업, 최소 3)")
+    parser.add_argument("--students", type=int, default=40)
+    parser.add_argument("--drop", type=float, default=0.01, help="write마다 연결 끊김 확률")
+    parser.add_argument("--connect-fail", type=float, default=0.1, help="연결 실패 확률")
+    parser.add_argument("--snapshot-hours", type=float, default=2, help="스냅숏 간격 (24의 약수)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-tracemalloc", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="스냅숏마다 출력")
+    args = parser.parse_args()
+    if args.days < 3 or 24 % args.snapshot_hours:
+        parser.error("--days는 3 이상, --snapshot-hours는 24의 약수")
+
+    logging.disable(logging.WARNING)  # 알림/재연결 로그 수천 건 생략
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+
+    start = datetime.combine(date.today(), datetime.min.time())
+    wall = time.perf_counter()
+    # 캐시/프레임 프로브 설정은 import 시점에 읽음 -> 먼저 임시 폴더로 (끝나면 폴더째 지움)
+    with tempfile.TemporaryDirectory(prefix="p5s-soak-") as workdir:
+        os.environ["P5S_GATT_CACHE"] = os.path.join(workdir, "gatt-cache.json")
+        os.environ["P5S_CAPTURE"] = "off"
+        os.environ.pop("P5S_REPLAY", None)
+        with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):  # 상태 줄 / 타이머 출력 버림
+            snapshots, top, stats = run_virtual(lambda clock: soak(clock, args), start)
+    wall = time.perf_counter() - wall
+
+    per_day = int(24 / args.snapshot_hours)
+    for snapshot in snapshots[::per_day]:
+        print(format_snapshot(snapshot))
+    print("-" * 40)
+    print(f"가상 {args.days}일 / 실제 {wall:.1f}초 / 알림 {stats['sent']}건 (실패 {stats['failed']})"
+          f" / write {stats['writes']} / 끊김 {stats['drops']} / 재연결 {stats['reconnects']} / client {stats['clients']}")
+
+    problems = detect_growth(snapshots, per_day)
+    if problems:
+        print("❌ 계속 늘어나는 지표:")
+        for problem in problems:
+            print(f"   {problem}")
+        if top:
+            print("   tracemalloc 증가 상위:")
+            for line in top:
+                print(f"     {line}")
+        return 1
+    print("✅ 증가 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
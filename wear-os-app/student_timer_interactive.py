@@ -3,154 +3,20 @@
 - 실시간 학생 추가/제거
 - 즉시 테스트 알림
 - 타이머 관리
+(스케줄러는 timer_core.StudentTimer - 여기는 메뉴만)
 """
 import asyncio
-import threading
-from datetime import datetime, timedelta
-from dataclasses import dataclass, field
-from typing import Optional
-from bleak import BleakClient
-
-# ========== P5S 워치 설정 ==========
-DEVICE_ADDRESS = "01:BC:8D:DB:2C:15"
-WRITE_CHAR = "0000ff02-0000-1000-8000-00805f9b34fb"
-
-# 알림 몇 분 전에 보낼지
-ALERT_MINUTES_BEFORE = 5
-
-
-@dataclass
-class Student:
-    name: str
-    schedule: list[str]
-    alerted_times: set = field(default_factory=set)
-
-
-class WatchNotifier:
-    def __init__(self, address: str):
-        self.address = address
-        self.client: Optional[BleakClient] = None
-        self.connected = False
-        self.lock = asyncio.Lock()
-
-    async def connect(self):
-        async with self.lock:
-            if self.connected:
-                return True
-            try:
-                print(f"\n🔗 워치 연결 중...")
-                self.client = BleakClient(self.address)
-                await self.client.connect()
-                self.connected = True
-                print("✅ 워치 연결됨!")
-                return True
-            except Exception as e:
-                print(f"❌ 연결 실패: {e}")
-                return False
-
-    async def disconnect(self):
-        if self.client and self.connected:
-            await self.client.disconnect()
-            self.connected = False
-
-    def build_packet(self, message: str) -> list[bytes]:
-        if len(message) > 128:
-            message = message[:125] + "..."
-        content = message.encode('utf-8')
-        length = len(content)
-
-        first_len = min(7, length)
-        packet = bytearray([
-            0x02, 0x11,
-            length & 0xFF, (length >> 8) & 0xFF, 0, 0,
-            0x01, 0xFF, 0, 0, 0x01, 0x01, first_len
-        ])
-        packet.extend(content[:first_len])
-        packets = [bytes(packet)]
-
-        offset, seq = 7, 1
-        while offset < length:
-            p = bytearray([0x02, 0x11, seq & 0xFF, 0])
-            p.extend(content[offset:offset+16])
-            packets.append(bytes(p))
-            offset += 16
-            seq += 1
-        return packets
-
-    async def send(self, message: str) -> bool:
-        if not self.connected:
-            if not await self.connect():
-                return False
-        try:
-            for pkt in self.build_packet(message):
-                await self.client.write_gatt_char(WRITE_CHAR, pkt, response=True)
-                await asyncio.sleep(0.05)
-            return True
-        except Exception as e:
-            print(f"❌ 전송 실패: {e}")
-            self.connected = False
-            return False
-
-
-class StudentTimer:
-    def __init__(self):
-        self.students: dict[str, Student] = {}
-        self.notifier = WatchNotifier(DEVICE_ADDRESS)
-        self.running = False
-        self.alert_minutes = ALERT_MINUTES_BEFORE
-
-    def add(self, name: str, times: list[str]):
-        self.students[name] = Student(name=name, schedule=times)
-
-    def remove(self, name: str):
-        if name in self.students:
-            del self.students[name]
-
-    def list_students(self):
-        print("\n" + "=" * 45)
-        print("📋 등록된 학생 (수업 시간)")
-        print("-" * 45)
-        if not self.students:
-            print("  (없음)")
-        for s in self.students.values():
-            print(f"  {s.name}: {', '.join(s.schedule)}")
-        print("=" * 45)
-
-    def get_alerts(self) -> list[tuple[str, str, int]]:
-        now = datetime.now()
-        alerts = []
-        for s in self.students.values():
-            for t in s.schedule:
-                h, m = map(int, t.split(':'))
-                ct = now.replace(hour=h, minute=m, second=0, microsecond=0)
-                key = f"{now.date()}_{t}"
-                if key in s.alerted_times:
-                    continue
-                diff = (ct - now).total_seconds() / 60
-                if 0 <= diff <= self.alert_minutes:
-                    alerts.append((s.name, t, int(diff)))
-                    s.alerted_times.add(key)
-        return alerts
-
-    async def check(self):
-        for name, t, mins in self.get_alerts():
-            msg = f"{name} {'수업 시작!' if mins == 0 else f'{mins}분 후 수업!'}"
-            print(f"\n🔔 {msg}")
-            await self.notifier.send(msg)
-
-    async def run_loop(self, interval=30):
-        self.running = True
-        await self.notifier.connect()
-        while self.running:
-            await self.check()
-            await asyncio.sleep(interval)
-        await self.notifier.disconnect()
-
-    def stop(self):
-        self.running = False
-
-
-async def send_test_notification(notifier: WatchNotifier, msg: str):
+from datetime import timedelta
+
+from dedup_store import open_store
+from delivery_latency import TRACKER
+from log_pipeline import setup_logging
+from loop_watchdog import install_watchdog
+from timer_core import StudentTimer, now_text, status_text
+from timer_runtime import DEVICE_ADDRESS, TimerRuntime
+
+
+async def send_test_notification(notifier, msg: str):
     """테스트 알림 전송"""
     print(f"\n📤 테스트 알림: {msg}")
     if await notifier.send(msg):
@@ -159,18 +25,24 @@ async def send_test_notification(notifier: WatchNotifier, msg: str):
         print("❌ 전송 실패")
 
 
-async def interactive_menu(timer: StudentTimer):
+async def ainput(prompt: str) -> str:
+    """input()을 스레드에서 (메뉴 대기 중에도 타이머/전송 태스크가 돌도록)"""
+    return (await asyncio.get_running_loop().run_in_executor(None, input, prompt)).strip()
+
+
+async def interactive_menu(timer: StudentTimer, watchdog):
     """인터랙티브 메뉴"""
     print("\n" + "=" * 45)
     print("  학생 수업 타이머 + P5S 워치 알림")
     print("=" * 45)
 
     # 샘플 학생 추가
-    timer.add("김철수", ["15:00", "16:30"])
-    timer.add("이영희", ["15:30"])
-    timer.add("박민수", ["14:00", "17:00"])
+    timer.add_student("김철수", ["15:00", "16:30"])
+    timer.add_student("이영희", ["15:30"])
+    timer.add_student("박민수", ["14:00", "17:00"])
 
     timer_task = None
+    watch_task = None
 
     while True:
         print("\n[메뉴]")
@@ -181,35 +53,40 @@ async def interactive_menu(timer: StudentTimer):
         print("  5. 1분 후 테스트 타이머 추가")
         print("  6. 타이머 시작")
         print("  7. 타이머 중지")
+        print("  8. 시간표 파일 불러오기 (수정 시 자동 반영)")
+        print("  9. 지금 수업 현황")
+        print("  p. 프로파일러 켜기/끄기 (끌 때 결과 출력)")
+        print("  w. 루프 지연 기록")
+        print("  l. 알림 도착 지연 / 정확도")
         print("  q. 종료")
 
         try:
-            choice = input("\n선택: ").strip()
+            choice = await ainput("\n선택: ")
         except EOFError:
             break
 
         if choice == '1':
-            timer.list_students()
+            print(status_text(timer))
 
         elif choice == '2':
-            name = input("학생 이름: ").strip()
-            times = input("수업 시간 (쉼표 구분, 예: 15:00,16:30): ").strip()
+            name = await ainput("학생 이름: ")
+            times = await ainput("수업 시간 (쉼표 구분, 예: 15:00,16:30): ")
             times = [t.strip() for t in times.split(',')]
-            timer.add(name, times)
+            timer.add_student(name, times)
             print(f"✅ {name} 추가됨")
 
         elif choice == '3':
-            name = input("제거할 학생 이름: ").strip()
-            timer.remove(name)
+            name = await ainput("제거할 학생 이름: ")
+            timer.remove_student(name)
             print(f"✅ {name} 제거됨")
 
         elif choice == '4':
-            msg = input("알림 메시지: ").strip() or "테스트 알림!"
+            msg = await ainput("알림 메시지: ") or "테스트 알림!"
             await send_test_notification(timer.notifier, msg)
 
         elif choice == '5':
-            test_time = (datetime.now() + timedelta(minutes=1)).strftime("%H:%M")
-            timer.add("⏰테스트", [test_time])
+            test_time = (timer.clock.now() + timedelta(minutes=1)).strftime("%H:%M")
+            timer.add_student("⏰테스트", [test_time])
             print(f"✅ 1분 후 ({test_time}) 테스트 알림 예약됨")
 
         elif choice == '6':
@@ -217,7 +94,7 @@ async def interactive_menu(timer: StudentTimer):
                 print("⚠️ 이미 실행 중!")
             else:
                 print("🚀 타이머 시작!")
-                timer_task = asyncio.create_task(timer.run_loop(30))
+                timer_task = asyncio.create_task(timer.run(30))
 
         elif choice == '7':
             if timer.running:
@@ -226,17 +103,51 @@ async def interactive_menu(timer: StudentTimer):
             else:
                 print("⚠️ 실행 중이 아님")
 
+        elif choice == '8':
+            path = await ainput("시간표 파일 (json/csv/toml): ")
+            try:
+                timer.load_schedule(path)
+            except Exception as e:  # 구조가 틀린 파일은 TypeError/AttributeError도 남 - 메뉴는 계속
+                print(f"❌ 로드 실패: {type(e).__name__}: {e}")
+                continue
+            if watch_task:
+                watch_task.cancel()
+            watch_task = asyncio.create_task(timer.watch_schedule(path))
+            print(f"✅ {path} 감시 중")
+
+        elif choice == '9':
+            print(now_text(timer))
+
+        elif choice == 'p':
+            watchdog.toggle_profiler()
+
+        elif choice == 'w':
+            print(watchdog.report())
+
+        elif choice == 'l':
+            print(TRACKER.report())
+
         elif choice == 'q':
             timer.stop()
             if timer_task:
                 timer_task.cancel()
+            if watch_task:
+                watch_task.cancel()
             print("👋 종료!")
             break
 
 
 async def main():
-    timer = StudentTimer()
-    await interactive_menu(timer)
+    setup_logging()
+    # 워치 연결은 런타임이 관리 (이미 다른 런타임이 실행 중이면 그쪽으로 전송)
+    runtime = await TimerRuntime().start()
+    timer = StudentTimer(runtime.link(DEVICE_ADDRESS), dedup=open_store())
+    watchdog = install_watchdog()
+    try:
+        await interactive_menu(timer, watchdog)
+    finally:
+        await runtime.close()
+        watchdog.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 모듈들이 wear-os-app/ 바로 아래에 있음 (패키지 아님)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,57 @@
+import asyncio
+from datetime import datetime
+
+from alert_bus import Alert, AlertBus, WatchSink
+from dedup_store import COOLDOWN_SECONDS, DedupStore, cooldown_key
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+class SlowNotifier:
+    address = ADDRESS
+    connected = True
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.sent = []
+
+    async def send(self, message: str) -> bool:
+        await asyncio.sleep(self.delay)
+        self.sent.append(message)
+        return True
+
+
+def alert(message: str) -> Alert:
+    return Alert("김철수", message, datetime.now())
+
+
+def test_close_waits_for_in_flight_delivery(tmp_path):
+    async def scenario():
+        notifier = SlowNotifier(0.05)
+        bus = AlertBus()
+        bus.add(WatchSink(notifier, dedup=DedupStore(str(tmp_path / "dedup.sqlite3"))))
+        bus.publish(alert("15:00 수업"))
+        await asyncio.sleep(0.01)  # 워커가 꺼내서 보내는 중 (큐는 빔)
+        assert bus.workers[0].queue.qsize() == 0
+        await bus.close()
+        return notifier.sent, bus.status()[0]
+
+    sent, status = asyncio.run(scenario())
+    assert sent == ["15:00 수업"] and status["delivered"] == 1
+
+
+def test_cancelled_delivery_releases_cooldown(tmp_path):
+    store = DedupStore(str(tmp_path / "dedup.sqlite3"))
+
+    async def scenario():
+        notifier = SlowNotifier(10)
+        bus = AlertBus()
+        bus.add(WatchSink(notifier, dedup=store))
+        bus.publish(alert("15:00 수업"))
+        await asyncio.sleep(0.01)
+        await bus.close(timeout=0.05)  # 제한 시간이 지나 전송 중에 취소됨
+        return notifier.sent
+
+    assert asyncio.run(scenario()) == []
+    # 다시 시작하면 같은 알림을 보낼 수 있어야 함
+    assert store.claim(cooldown_key(ADDRESS, "15:00 수업"), COOLDOWN_SECONDS)
@@ -0,0 +1,55 @@
+import asyncio
+
+from ble_capture import EVENT, NOTIFY, READ, WRITE, Capture, CaptureClient, read_capture
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+WRITE_CHAR = "0000ff02-0000-1000-8000-00805f9b34fb"
+NOTIFY_CHAR = "0000ff03-0000-1000-8000-00805f9b34fb"
+
+
+class FakeClient:
+    def __init__(self):
+        self.mtu_size = 185
+        self.is_connected = False
+
+    async def connect(self, **kwargs):
+        self.is_connected = True
+        return True
+
+    async def disconnect(self):
+        self.is_connected = False
+
+    async def write_gatt_char(self, char, data, response=None):
+        pass
+
+    async def read_gatt_char(self, char):
+        return b"1.0"
+
+    async def start_notify(self, char, callback, **kwargs):
+        callback(char, b"\x02\x11ok")
+
+
+async def session(client: CaptureClient):
+    await client.connect()
+    for _ in range(3):
+        assert client.mtu_size == 185
+    await client.start_notify(NOTIFY_CHAR, lambda sender, data: None)
+    await client.write_gatt_char(WRITE_CHAR, b"\x02\x11\x00\x00", response=True)
+    await client.read_gatt_char(WRITE_CHAR)
+    await client.disconnect()
+
+
+def test_records_round_trip_and_mtu_once_per_connection(tmp_path):
+    path = str(tmp_path / "watch.p5scap")
+    capture = Capture(path, ADDRESS, chunk=64)  # 작은 영역 -> 늘리는 경로도 거침
+    client = CaptureClient(FakeClient(), capture)
+    asyncio.run(session(client))
+    asyncio.run(session(client))  # 재연결
+    capture.close()
+
+    parsed = read_capture(path)
+    assert parsed.address == ADDRESS and not parsed.truncated
+    events = [r.text for r in parsed.records if r.kind == EVENT]
+    assert events == ["connect", "mtu 185", "disconnect"] * 2
+    assert [(r.kind, r.char) for r in parsed.records if r.kind != EVENT] == [
+        (NOTIFY, NOTIFY_CHAR), (WRITE, WRITE_CHAR), (READ, WRITE_CHAR)] * 2
@@ -0,0 +1,94 @@
+import random
+from datetime import datetime, timedelta
+
+from deadline_heap import DeadlineHeap
+
+T0 = datetime(2026, 10, 20, 9, 0)
+
+
+def at(minutes: float) -> datetime:
+    return T0 + timedelta(minutes=minutes)
+
+
+def test_pop_due_in_deadline_order():
+    heap = DeadlineHeap()
+    for name, minutes in [("c", 30), ("a", 10), ("b", 20)]:
+        heap.push(name, at(minutes))
+    assert heap.peek() == at(10)
+    assert heap.pop_due(at(20)) == [(at(10), "a"), (at(20), "b")]
+    assert len(heap) == 1 and "c" in heap and "a" not in heap
+    assert heap.pop_due(at(25)) == []
+
+
+def test_reschedule_and_discard_are_lazy():
+    heap = DeadlineHeap()
+    heap.push("a", at(10))
+    heap.push("a", at(40))  # 연장 -> 옛 항목은 버림
+    heap.push("b", at(20))
+    heap.discard("b")
+    assert heap.deadline("a") == at(40) and heap.deadline("b") is None
+    assert heap.peek() == at(40)
+    assert heap.pop_due(at(30)) == []
+    assert heap.pop_due(at(40)) == [(at(40), "a")]
+    assert len(heap) == 0 and heap.peek() is None
+
+
+def test_shift_moves_every_deadline():
+    heap = DeadlineHeap()
+    heap.push("a", at(10))
+    heap.push("b", at(20))
+    heap.shift(timedelta(minutes=5))
+    assert heap.deadline("a") == at(15) and heap.peek() == at(15)
+    heap.push("c", at(12))  # 이동 뒤에 넣은 항목은 넣은 시각 그대로
+    assert heap.pop_due(at(15)) == [(at(12), "c"), (at(15), "a")]
+
+
+def test_shift_group_moves_only_that_group():
+    heap = DeadlineHeap()
+    heap.push("a", at(10), group="A반")
+    heap.push("b", at(21), group="A반")
+    heap.push("c", at(15))
+    heap.shift_group("A반", timedelta(minutes=10))
+    assert heap.deadline("a") == at(20) and heap.deadline("c") == at(15)
+    assert heap.peek() == at(15)
+    heap.shift_group("A반", timedelta(minutes=-15))  # 당기면 바로 맨 앞
+    assert heap.peek() == at(5)
+    heap.shift_group("없음", timedelta(minutes=5))
+    assert heap.pop_due(at(16)) == [(at(5), "a"), (at(15), "c"), (at(16), "b")]
+
+
+def test_stale_entries_are_compacted():
+    heap = DeadlineHeap()
+    for i in range(1000):
+        heap.push("a", at(i))
+    assert len(heap) == 1
+    assert heap.entries <= 2 * len(heap) + 17
+
+
+def test_matches_sorted_reference():
+    rng = random.Random(7)
+    heap, reference = DeadlineHeap(), {}
+    for step in range(2000):
+        name = f"t{rng.randrange(50)}"
+        action = rng.random()
+        if action < 0.5:
+            deadline = at(rng.uniform(0, 600))
+            heap.push(name, deadline, group=int(name[1:]) % 4)
+            reference[name] = deadline
+        elif action < 0.6:
+            group, delta = rng.randrange(4), timedelta(minutes=rng.uniform(-30, 30))
+            heap.shift_group(group, delta)
+            reference = {n: d + delta if int(n[1:]) % 4 == group else d for n, d in reference.items()}
+        elif action < 0.8:
+            heap.discard(name)
+            reference.pop(name, None)
+        else:
+            delta = timedelta(minutes=rng.uniform(-5, 5))
+            heap.shift(delta)
+            reference = {n: d + delta for n, d in reference.items()}
+        if step % 100 == 99:
+            now = at(rng.uniform(0, 600))
+            expected = sorted((d, n) for n, d in reference.items() if d <= now)
+            assert heap.pop_due(now) == expected
+            reference = {n: d for n, d in reference.items() if d > now}
+        assert len(heap) == len(reference)
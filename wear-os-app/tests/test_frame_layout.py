@@ -0,0 +1,110 @@
+"""frame_layout: 프레임 나누기 + 프로브는 보정 명령/옵트인일 때만"""
+import asyncio
+
+import pytest
+
+from frame_layout import (LEGACY, MAX_MESSAGE_CHARS, PROBE_MESSAGE, FrameLayout, build_frame, encode_message,
+                          probe_candidates, probe_layout, probe_mode)
+from gatt_cache import GattCache, GattLink, choose_layout
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+def reassemble(packets: list[bytes]) -> bytes:
+    first, rest = packets[0], packets[1:]
+    return first[13:13 + first[12]] + b"".join(p[4:] for p in rest)
+
+
+@pytest.mark.parametrize("layout", [LEGACY, FrameLayout.for_mtu(185), FrameLayout.for_mtu(517)])
+@pytest.mark.parametrize("message", ["", "짧은 알림", "김철수 5분 전! " * 20])
+def test_build_frame_round_trip(layout, message):
+    packets = build_frame(message, layout=layout)
+    content = encode_message(message)
+    assert reassemble(packets) == content
+    assert len(packets) == layout.packet_count(len(content))
+    assert all(len(p) <= layout.payload for p in packets)
+    assert [p[2] | p[3] << 8 for p in packets[1:]] == list(range(1, len(packets)))
+
+
+def test_legacy_layout_matches_mtu_23():
+    assert FrameLayout.for_mtu(23) == LEGACY
+    assert FrameLayout.for_mtu(517).first == 255  # 길이 필드 1바이트
+
+
+def test_long_message_is_truncated():
+    assert len(encode_message("가" * 200).decode()) == MAX_MESSAGE_CHARS
+    assert encode_message("가" * 200).decode().endswith("...")
+
+
+def test_probe_candidates_fit_mtu():
+    assert [c.payload for c in probe_candidates(185)] == [182, 128, 64]
+    assert probe_candidates(23) == []
+
+
+class FakeClient:
+    """payload바이트보다 큰 write는 거부"""
+
+    def __init__(self, mtu: int, accepts: int):
+        self.mtu_size = mtu
+        self.accepts = accepts
+        self.is_connected = True
+        self.writes: list[bytes] = []
+
+    async def write_gatt_char(self, char, data, response=None):
+        if len(data) > self.accepts:
+            raise OSError("write rejected")
+        self.writes.append(data)
+
+
+def test_probe_steps_down_until_accepted():
+    client = FakeClient(247, accepts=128)
+    layout = asyncio.run(probe_layout(client, "ff02", 247, delay=0))
+    assert layout.payload == 128
+    assert reassemble(client.writes) == PROBE_MESSAGE.encode()
+
+
+def link_for(client) -> GattLink:
+    return GattLink(client, "ff02", "ff03", True, 0.0, "1.0")
+
+
+def test_connect_does_not_probe_by_default(monkeypatch):
+    monkeypatch.delenv("P5S_FRAME_PROBE", raising=False)
+    assert probe_mode() == "cached"
+    client = FakeClient(185, accepts=512)
+    link = link_for(client)
+    asyncio.run(choose_layout(link, GattCache(""), ADDRESS))
+    assert link.mtu == 185 and link.layout == LEGACY
+    assert client.writes == []  # 워치에 프로브 알림이 뜨지 않음
+
+
+def test_calibrated_layout_is_used_without_probing(monkeypatch):
+    monkeypatch.delenv("P5S_FRAME_PROBE", raising=False)
+    cache = GattCache("")
+    cache.store(ADDRESS, "1.0", [])
+    cache.store_layout(ADDRESS, "1.0", 185, FrameLayout.for_mtu(185))
+    client = FakeClient(185, accepts=512)
+    link = link_for(client)
+    asyncio.run(choose_layout(link, cache, ADDRESS))
+    assert link.layout == FrameLayout.for_mtu(185) and client.writes == []
+
+
+@pytest.mark.parametrize("env, probe", [("", True), ("on", False)])
+def test_probe_runs_from_calibration_or_opt_in(monkeypatch, env, probe):
+    monkeypatch.setenv("P5S_FRAME_PROBE", env)
+    cache = GattCache("")
+    cache.store(ADDRESS, "1.0", [])
+    client = FakeClient(185, accepts=512)
+    link = link_for(client)
+    asyncio.run(choose_layout(link, cache, ADDRESS, probe=probe))
+    assert link.layout == FrameLayout.for_mtu(185) and client.writes
+    assert cache.layout(ADDRESS, "1.0", 185) == link.layout
+
+
+def test_probe_off_ignores_calibration(monkeypatch):
+    monkeypatch.setenv("P5S_FRAME_PROBE", "off")
+    cache = GattCache("")
+    cache.store(ADDRESS, "1.0", [])
+    cache.store_layout(ADDRESS, "1.0", 185, FrameLayout.for_mtu(185))
+    link = link_for(FakeClient(185, accepts=512))
+    asyncio.run(choose_layout(link, cache, ADDRESS, probe=True))
+    assert link.layout == LEGACY
@@ -0,0 +1,84 @@
+"""gatt_cache.connect_cached: 캐시 경로에서도 펌웨어가 바뀌면 캐시(프로브/보정 결과 포함) 폐기"""
+import asyncio
+
+import pytest
+
+from gatt_cache import FIRMWARE_CHAR, NOTIFY_CHAR, WRITE_CHAR, GattCache, connect_cached, snapshot_services
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+class FakeChar:
+    def __init__(self, uuid: str, handle: int):
+        self.uuid = uuid
+        self.handle = handle
+        self.properties = ["read"]
+
+
+class FakeServices:
+    def __init__(self):
+        self.service = type("Service", (), {"uuid": "0000ff00-0000-1000-8000-00805f9b34fb", "handle": 1,
+                                            "characteristics": [FakeChar(WRITE_CHAR, 2), FakeChar(NOTIFY_CHAR, 4),
+                                                                FakeChar(FIRMWARE_CHAR, 7)]})()
+
+    def get_characteristic(self, uuid):
+        return next((c for c in self.service.characteristics if c.uuid == uuid), None)
+
+    def __iter__(self):
+        return iter([self.service])
+
+
+class FakeClient:
+    def __init__(self, watch):
+        self.watch = watch
+        self.services = FakeServices()
+        self.mtu_size = 23
+
+    async def connect(self, **kwargs):
+        self.watch.connects += 1
+
+    async def disconnect(self):
+        pass
+
+    async def read_gatt_char(self, char, *args, **kwargs):
+        self.watch.reads += 1
+        return self.watch.firmware.encode()
+
+
+class FakeWatch:
+    def __init__(self, firmware: str):
+        self.firmware = firmware
+        self.connects = 0
+        self.reads = 0
+
+    def client(self, target):
+        return FakeClient(self)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setenv("P5S_CAPTURE", "")
+    monkeypatch.delenv("P5S_REPLAY", raising=False)
+    cache = GattCache("")
+    services = snapshot_services(FakeServices())
+    cache.store(ADDRESS, "1.0", services)
+    cache.entries[ADDRESS]["framing"] = {"firmware": "1.0", "mtu": 185, "first": 170, "next": 180}
+    return cache
+
+
+def test_same_firmware_uses_cache(cache):
+    watch = FakeWatch("1.0")
+    link = asyncio.run(connect_cached(ADDRESS, cache, factory=watch.client))
+    assert link.cached and link.firmware == "1.0"
+    assert watch.connects == 1 and watch.reads == 1
+    assert "framing" in cache.entry(ADDRESS)
+
+
+def test_changed_firmware_invalidates_cached_entry(cache):
+    watch = FakeWatch("2.0")
+    link = asyncio.run(connect_cached(ADDRESS, cache, factory=watch.client))
+    assert not link.cached and link.firmware == "2.0"
+    assert watch.connects == 2  # 캐시 폐기 후 전체 탐색으로 다시 연결
+    entry = cache.entry(ADDRESS)
+    assert entry["firmware"] == "2.0"
+    assert "framing" not in entry  # 옛 펌웨어 프로브 결과는 남지 않음
@@ -0,0 +1,97 @@
+import random
+from collections import Counter
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from display_rate import DisplayRate
+from schedule_analysis import alert_load, analyze_timeline, find_conflicts, minute_capacity
+from session_index import session_end
+from timeline import Session, Timeline
+from timer_core import Student
+
+DAY = date(2026, 10, 20)
+
+
+def at(hhmm: str) -> datetime:
+    return datetime.combine(DAY, datetime.strptime(hhmm, "%H:%M").time())
+
+
+def session(name, hhmm, minutes=50, teacher=None, room=None) -> Session:
+    return Session(name, at(hhmm), minutes, room, teacher)
+
+
+def test_overlapping_sessions_form_one_conflict():
+    sessions = [session("a", "15:00", teacher="김", room="A"),
+                session("b", "15:30", teacher="김", room="B"),
+                session("c", "16:10", teacher="김", room="C"),   # b와 겹침 -> 같은 묶음
+                session("d", "17:00", teacher="김", room="A")]   # c 끝(17:00)과 맞닿음 -> 충돌 아님
+    conflicts, peak, peak_at = find_conflicts(sessions)
+    assert [(c.kind, c.key, c.start, c.end, c.peak) for c in conflicts] == [
+        ("teacher", "김", at("15:00"), at("17:00"), 2)]
+    assert [s.name for s in conflicts[0].sessions] == ["a", "b", "c"]
+    assert (peak, peak_at) == (2, at("15:30"))
+
+
+def test_back_to_back_is_not_a_conflict():
+    conflicts, peak, _ = find_conflicts([session("a", "15:00", teacher="김"), session("b", "15:50", teacher="김")])
+    assert conflicts == [] and peak == 1
+
+
+def brute_force(sessions):
+    """선생님별로 겹치는 수업 쌍을 이어 붙인 묶음 + 시각마다 동시 수업 수"""
+    groups = []
+    for teacher in {s.teacher for s in sessions}:
+        mine = sorted((s for s in sessions if s.teacher == teacher), key=lambda s: (s.start, s.name))
+        cluster, end = [], None
+        for s in mine:
+            if cluster and s.start < end:
+                cluster.append(s)
+                end = max(end, session_end(s))
+                continue
+            if len(cluster) > 1:
+                groups.append((teacher, cluster[0].start, end, len(cluster)))
+            cluster, end = [s], session_end(s)
+        if len(cluster) > 1:
+            groups.append((teacher, cluster[0].start, end, len(cluster)))
+    times = {s.start for s in sessions}
+    peak = max(sum(s.start <= t < session_end(s) for s in sessions) for t in times)
+    return sorted(groups), peak
+
+
+def test_sweep_matches_brute_force():
+    rng = random.Random(3)
+    for _ in range(30):
+        sessions = [session(f"s{i}", f"{rng.randrange(9, 20):02d}:{rng.choice((0, 10, 20, 30, 40, 50))}",
+                            rng.choice((30, 50, 90)), teacher=rng.choice("가나다"))
+                    for i in range(rng.randrange(2, 40))]
+        conflicts, peak, _ = find_conflicts(sessions)
+        found = sorted((c.key, c.start, c.end, len(c.sessions)) for c in conflicts if c.kind == "teacher")
+        assert (found, peak) == brute_force(sessions)
+
+
+def timeline_at(*times: str):
+    return SimpleNamespace(events=[SimpleNamespace(at=at(t) + timedelta(seconds=i)) for i, t in enumerate(times)])
+
+
+def test_alert_load_carries_backlog_until_drained():
+    alerts, overloaded = alert_load(timeline_at(*["15:00"] * 5, "15:01", "15:05"), capacity=2)
+    assert alerts == Counter({at("15:00"): 5, at("15:01"): 1, at("15:05"): 1})
+    # 15:00에 3개 밀림 -> 15:01에 1개 더 들어와도 2개 남음 -> 빈 3분 동안 다 보냄
+    assert overloaded == [(at("15:00"), 5, 3), (at("15:01"), 1, 2)]
+
+
+def test_minute_capacity():
+    assert minute_capacity(None, 0.5) == 120
+    rate = DisplayRate(gap=1.0, rate=0.5, burst=3)
+    assert minute_capacity(rate, 0.5) == min(3 + 30, 60 / 1.5 + 1, 120)
+
+
+def test_analyze_compiled_timeline():
+    students = [Student("김철수", ["15:00"], duration=50, teacher="김", room="A"),
+                Student("이영희", ["15:30"], duration=50, teacher="김", room="B"),
+                Student("박민수", ["15:30"], duration=50, teacher="이", room="A")]
+    report = analyze_timeline(Timeline.compile(students, DAY, 5), capacity=30)
+    assert report.sessions == 3 and report.peak == 3
+    assert {(c.kind, c.key) for c in report.conflicts} == {("teacher", "김"), ("room", "A")}
+    assert report.overloaded == [] and report.problems
+    assert "선생님 김 15:00~16:20" in report.format()
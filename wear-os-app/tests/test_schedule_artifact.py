@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import schedule_artifact
+from schedule_artifact import ScheduleArtifact, artifact_path, load_compiled
+from schedule_file import load_schedule
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schedule.example.json")
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "schedule.json"
+    shutil.copy(EXAMPLE, path)
+    return str(path)
+
+
+def no_parse(*args):
+    raise AssertionError("아티팩트가 최신인데 다시 파싱함")
+
+
+def test_artifact_round_trip(source, tmp_path, monkeypatch):
+    cache = str(tmp_path / "cache")
+    parsed = load_compiled(source, cache)
+    assert parsed == load_schedule(source)
+    assert os.path.exists(artifact_path(source, cache))
+
+    monkeypatch.setattr(schedule_artifact, "parse_schedule", no_parse)
+    loaded = load_compiled(source, cache)
+    assert loaded == parsed
+    assert loaded.rule("박민수") == parsed.rule("박민수")  # 달력 규칙(휴강/보강)까지
+
+
+def test_changed_source_is_recompiled(source, tmp_path):
+    cache = str(tmp_path / "cache")
+    load_compiled(source, cache)
+    with open(source, "w", encoding="utf-8") as f:
+        json.dump({"students": {"새학생": ["09:30"]}}, f, ensure_ascii=False)
+    assert load_compiled(source, cache).times == {"새학생": ["09:30"]}
+    assert load_compiled(source, cache).times == {"새학생": ["09:30"]}
+
+
+def test_corrupt_artifact_is_rebuilt(source, tmp_path):
+    cache = str(tmp_path / "cache")
+    expected = load_compiled(source, cache)
+    target = artifact_path(source, cache)
+    with open(target, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    assert ScheduleArtifact.open(target) is None
+    assert load_compiled(source, cache) == expected
+    with ScheduleArtifact.open(target) as artifact:
+        assert artifact.schedule() == expected
+
+
+def test_cache_off_writes_nothing(source, tmp_path):
+    assert load_compiled(source, "off") == load_schedule(source)
+    assert sorted(os.listdir(tmp_path)) == ["schedule.json"]
+
+
+def test_duplicate_slots_load_the_same_on_every_path(tmp_path):
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps({"students": {"김철수": ["16:30", "9:00", "09:00", "16:30"],
+                                             "이영희": {"times": ["15:00", "15:00"], "weekdays": "화목"}}},
+                               ensure_ascii=False), encoding="utf-8")
+    cache = str(tmp_path / "cache")
+    parsed = load_schedule(str(path))
+    assert parsed.times["김철수"] == ["09:00", "16:30"] and parsed.times["이영희"] == ["15:00"]
+    assert load_compiled(str(path), "off") == parsed
+    assert load_compiled(str(path), cache) == parsed  # 컴파일하면서
+    assert load_compiled(str(path), cache) == parsed  # 아티팩트에서
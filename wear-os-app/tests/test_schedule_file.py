@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+from schedule_file import ScheduleWatcher, load_schedule
+
+GOOD = {"students": {"김철수": ["15:00", "16:30"]}}
+
+
+def write(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def test_watcher_survives_structurally_wrong_file(tmp_path):
+    path = tmp_path / "schedule.json"
+    write(path, GOOD)
+    seen = []
+
+    async def scenario():
+        watcher = ScheduleWatcher(str(path), seen.append, poll_interval=0.01)
+        watcher.use_inotify = False
+        task = asyncio.create_task(watcher.run())
+        write(path, {"students": {"김철수": 5}})  # 목록 자리에 숫자 -> TypeError
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        write(path, {"students": {"김철수": ["15:00"], "이영희": ["17:00"]}})
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert len(seen) == 1
+    assert set(seen[0].times) == {"김철수", "이영희"}
+
+
+def test_watcher_keeps_watching_when_apply_fails(tmp_path):
+    path = tmp_path / "schedule.json"
+    write(path, GOOD)
+    calls = []
+
+    def on_change(schedule):
+        calls.append(schedule)
+        if len(calls) == 1:
+            raise RuntimeError("반영 실패")
+
+    async def scenario():
+        watcher = ScheduleWatcher(str(path), on_change, poll_interval=0.01)
+        watcher.use_inotify = False
+        task = asyncio.create_task(watcher.run())
+        for n in range(2):
+            write(path, {"students": {"김철수": [f"1{n}:00", "18:30"]}})
+            await asyncio.sleep(0.05)
+        assert not task.done()
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+
+
+def test_load_schedule_roundtrip(tmp_path):
+    path = tmp_path / "schedule.json"
+    write(path, GOOD)
+    assert load_schedule(str(path)).times["김철수"] == ["15:00", "16:30"]
@@ -0,0 +1,38 @@
+import json
+from datetime import datetime
+
+import student_timer
+import student_timer_interactive
+import student_timer_v2
+import timer_core
+from clock import run_virtual
+from replay import replay_student_timer
+from schedule_file import load_schedule
+
+DAY = datetime(2026, 10, 20)  # 화요일
+
+
+def test_clis_use_the_shared_scheduler():
+    """CLI는 메뉴/인자 처리만 - 스케줄러/notifier 복사본이 다시 생기지 않게"""
+    for cli in (student_timer, student_timer_interactive, student_timer_v2):
+        own = [name for name, value in vars(cli).items()
+               if isinstance(value, type) and value.__module__ == cli.__name__]
+        assert own == [], f"{cli.__name__}: {own}"
+    assert student_timer.StudentTimer is student_timer_interactive.StudentTimer is timer_core.StudentTimer
+    assert student_timer_v2.TimerManager is timer_core.TimerManager
+
+
+def test_student_timer_replay(tmp_path):
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps({"students": {"김철수": ["09:00", "13:00"],
+                                             "이영희": {"times": ["10:00"], "duration": 50}}},
+                               ensure_ascii=False), encoding="utf-8")
+    schedule = load_schedule(str(path))
+    sent = run_virtual(lambda clock: replay_student_timer(clock, schedule, 24, 30), DAY)
+    messages = [msg for _, msg in sent]
+    assert messages == ["김철수 5분 후 수업!", "김철수 수업 시작!",
+                        "이영희 5분 후 수업!", "이영희 수업 시작!", "이영희 5분 전!", "이영희 수업 종료!",
+                        "이영희 수업 종료 +5분!", "이영희 수업 종료 +10분!",
+                        "김철수 5분 후 수업!", "김철수 수업 시작!"]
+    # 예상 지연만큼 먼저 내보내되 마감 1초 안쪽 (매 분 정각 직전)
+    assert all(at.second == 59 for at, _ in sent)
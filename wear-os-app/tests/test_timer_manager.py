@@ -0,0 +1,77 @@
+import asyncio
+import contextlib
+import io
+import json
+from datetime import datetime, timedelta
+
+from attendance_outbox import Outbox
+from clock import run_virtual
+from replay import SimulatedNotifier, replay_timer_manager
+from schedule_file import Schedule, load_schedule
+from timer_core import TimerManager
+
+DAY = datetime(2026, 10, 20)  # 화요일
+
+
+def replay(tmp_path, students, hours=24):
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps({"students": students}, ensure_ascii=False), encoding="utf-8")
+    schedule = load_schedule(str(path))
+    return run_virtual(lambda clock: replay_timer_manager(clock, schedule, hours), DAY)
+
+
+def test_every_slot_of_the_day_fires(tmp_path):
+    sent = replay(tmp_path, {
+        "김철수": ["09:00", "13:00", "18:30"],
+        "이영희": {"times": ["10:00", "15:00"], "weekdays": "화목"},
+        "박민수": {"times": ["11:00"], "weekdays": "월수"},  # 화요일엔 없음
+    })
+    fired = sorted((at.strftime("%H:%M"), msg.split()[1]) for at, msg in sent)
+    assert [name for _, name in fired] == ["김철수", "이영희", "김철수", "이영희", "김철수"]
+    # 예상 지연만큼 먼저 보내므로 각 수업 시각 직전
+    for (hhmm, _), slot in zip(fired, ["09:00", "10:00", "13:00", "15:00", "18:30"]):
+        assert hhmm <= slot
+
+
+def test_rearm_crosses_midnight(tmp_path):
+    sent = replay(tmp_path, {"김철수": ["08:00"]}, hours=48)
+    assert [at.date().day for at, _ in sent] == [20, 21]
+
+
+def test_schedule_countdown_writes_no_attendance():
+    async def scenario(clock):
+        outbox = Outbox(":memory:")
+        notifier = SimulatedNotifier(clock)
+        manager = TimerManager(notifier=notifier, clock=clock, outbox=outbox)
+        manager.apply_schedule(Schedule(times={"김철수": ["15:00"]}))
+        manager.add_timer("이영희", 30)  # 직접 잡은 수업 타이머는 기록
+        await asyncio.sleep(24 * 3600)
+        await manager.close()
+        return notifier.sent, [key for key, _, _ in outbox.due(float("inf"))]
+
+    sent, keys = run_virtual(scenario, DAY)
+    assert [msg.split()[1] for _, msg in sent] == ["이영희", "김철수"]
+    assert keys == ["2026-10-20_이영희_00:00"]
+
+
+def test_tag_extend_and_cancel_move_only_tagged_timers():
+    async def scenario(clock):
+        notifier = SimulatedNotifier(clock)
+        manager = TimerManager(notifier=notifier, clock=clock)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.add_timer("김철수", 10, tags=["A반"])
+            manager.add_timer("이영희", 10, tags=["A반", "심화"])
+            manager.add_timer("박민수", 10)
+            manager.add_timer("최지우", 10, tags=["B반"])
+            manager.extend_tag("#A반", 5)
+            manager.cancel_tag("B반")
+            assert manager.timers["이영희"].minutes == 15 and "최지우" not in manager.timers
+            await asyncio.sleep(3600)
+            await manager.close()
+        return notifier.sent
+
+    sent = run_virtual(scenario, DAY)
+    fired = {msg.split()[1]: at - DAY for at, msg in sent}
+    assert set(fired) == {"김철수", "이영희", "박민수"}
+    for name, minutes in [("박민수", 10), ("김철수", 15), ("이영희", 15)]:
+        assert abs(fired[name] - timedelta(minutes=minutes)) < timedelta(seconds=30)
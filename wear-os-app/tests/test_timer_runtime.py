@@ -0,0 +1,30 @@
+import asyncio
+import sys
+
+import loop_watchdog
+import timer_runtime
+
+
+class FakeWatchdog:
+    stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+    def report(self) -> str:
+        return "watchdog"
+
+
+def test_main_stops_watchdog_when_another_runtime_is_running(monkeypatch):
+    watchdog = FakeWatchdog()
+    monkeypatch.setattr(loop_watchdog, "install_watchdog", lambda: watchdog)
+    monkeypatch.setattr(timer_runtime, "setup_logging", lambda: None)
+    monkeypatch.setattr(sys, "argv", ["timer_runtime.py"])
+
+    async def remote(self):
+        self.remote = True
+        return self
+
+    monkeypatch.setattr(timer_runtime.TimerRuntime, "start", remote)
+    asyncio.run(timer_runtime.main())
+    assert watchdog.stopped
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+import watch_shard
+from timer_runtime import TimerRuntime
+from watch_shard import ShardedNotifier
+
+HUNG = "AA:AA:AA:AA:AA:01"
+OK = "AA:AA:AA:AA:AA:02"
+
+
+class FakeNotifier:
+    """HUNG 주소로 보내면 영원히 멈춤 (워커 프로세스 안에서 실행)"""
+
+    def __init__(self, address, adapter):
+        self.address = address
+        self.connected = False
+
+    async def connect(self):
+        self.connected = self.address != HUNG
+        return self.connected
+
+    async def send_notification(self, message):
+        if self.address == HUNG:
+            await asyncio.Event().wait()
+        self.connected = True
+        return True
+
+    async def disconnect(self):
+        self.connected = False
+
+
+def fake_factory(address, adapter):
+    return FakeNotifier(address, adapter)
+
+
+def pump_threads():
+    return [t for t in threading.enumerate() if t.name.endswith("-pump") and t.is_alive()]
+
+
+def test_worker_restart_fails_all_pending_once(monkeypatch):
+    monkeypatch.setattr(watch_shard, "WORKER_TIMEOUT", 5.0)
+
+    async def scenario():
+        shard = ShardedNotifier(["hci9"], processes=True, factory=fake_factory)
+        try:
+            assert await shard.send(OK, "워밍업")  # 워커 기동
+            backend = shard._backend("hci9")
+            # 워커는 요청을 차례로 처리 -> 첫 요청이 멈추면 뒤의 요청도 전부 대기
+            results = await asyncio.gather(*(shard.send(HUNG, f"알림 {i}") for i in range(4)))
+            assert results == [False] * 4
+            assert backend.restarts == 1  # 남은 요청이 새 워커를 다시 죽이지 않음
+            assert len(pump_threads()) == 1  # 옛 응답 스레드는 끝남
+            assert not shard.is_connected(OK)  # 재시작 후 상태는 모름
+
+            assert await shard.send(OK, "재시작 후")
+            assert backend.restarts == 1
+            assert shard.for_watch(OK).connected
+        finally:
+            await shard.close()
+
+    asyncio.run(scenario())
+
+
+def test_handle_reports_worker_connection_state():
+    async def scenario():
+        shard = ShardedNotifier(["hci0"], factory=fake_factory)
+        handle = shard.for_watch(OK)
+        assert not handle.connected  # 아직 연결 전
+        assert await handle.send("안녕")
+        assert handle.connected
+        await handle.disconnect()
+        assert not handle.connected
+
+    asyncio.run(scenario())
+
+
+def test_runtime_links_are_placed_across_adapters():
+    async def scenario():
+        runtime = await TimerRuntime("off", shard=ShardedNotifier(["hci0", "hci1"], factory=fake_factory)).start()
+        try:
+            links = [runtime.link(f"AA:AA:AA:AA:AA:1{i}") for i in range(4)]
+            assert all(await asyncio.gather(*(link.send("안녕") for link in links)))
+            status = await runtime._handle({"op": "status"}, "test")
+            return dict(runtime.shard.placement), status
+        finally:
+            await runtime.close()
+
+    placement, status = asyncio.run(scenario())
+    assert sorted(placement.values()) == ["hci0", "hci0", "hci1", "hci1"]
+    assert [a["sends"] for a in status["adapters"]] == [2, 2]
+    assert all(link["connected"] for link in status["links"])
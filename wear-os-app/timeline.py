@@ -0,0 +1,153 @@
+"""
+하루치 수업 이벤트 타임라인
+- 수업(시작 + 길이)마다 이벤트를 미리 계산해서 시간순으로 정렬
+  수업 N분 전 / 수업 시작 / 종료 N분 전 / 수업 종료 / 초과 (M분마다 반복)
+- 스케줄러는 커서로 지난 이벤트만 읽음 -> 알림 종류가 늘어도 매 tick 비용은 그대로
+- 날짜가 바뀌거나 시간표가 바뀌면 다시 컴파일
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import takewhile
+from typing import Iterable, Optional
+
+# 이벤트 종류
+PRE_START = "pre"
+START = "start"
+END_WARNING = "warning"
+END = "end"
+OVERTIME = "overtime"
+
+# 기본값 (Electron 앱의 warningMinutes와 같은 5분)
+END_WARNING_MINUTES = 5
+OVERTIME_REPEAT_MINUTES = 5
+OVERTIME_REPEATS = 2
+# 이벤트 시각이 지나고 이 시간 안에는 늦게라도 보냄 ("N분 후 수업"은 시작 전까지)
+LATE_GRACE = timedelta(minutes=1)
+
+
+@dataclass(frozen=True)
+class Session:
+    """수업 한 번"""
+    name: str
+    start: datetime
+    duration: Optional[int] = None  # 분 (None이면 시작 알림만)
+    room: Optional[str] = None
+    teacher: Optional[str] = None
+
+    @property
+    def end(self) -> Optional[datetime]:
+        return self.start + timedelta(minutes=self.duration) if self.duration else None
+
+
+@dataclass(frozen=True)
+class TimelineEvent:
+    at: datetime
+    expires: datetime
+    kind: str
+    session: Session
+    extra: int = 0  # OVERTIME: 초과 분
+
+    @property
+    def key(self) -> str:
+        """alerted_times에 넣는 중복 방지 키"""
+        return f"{self.session.start.date()}_{self.session.start:%H:%M}_{self.kind}{self.extra or ''}"
+
+    def message(self, now: datetime) -> Optional[str]:
+        name = self.session.name
+        if self.kind == PRE_START:
+            minutes = int((self.session.start - now).total_seconds() // 60)
+            return f"{name} {minutes}분 후 수업!" if minutes > 0 else None  # 0분이면 START가 보냄
+        if self.kind == START:
+            return f"{name} 수업 시작!"
+        if self.kind == END_WARNING:
+            return f"{name} {self.extra}분 전!"
+        if self.kind == END:
+            return f"{name} 수업 종료!"
+        return f"{name} 수업 종료 +{self.extra}분!"
+
+
+def session_events(session: Session, lead_minutes: int,
+                   warning_minutes: int = END_WARNING_MINUTES,
+                   overtime_every: int = OVERTIME_REPEAT_MINUTES,
+                   overtime_repeats: int = OVERTIME_REPEATS) -> list[TimelineEvent]:
+    """수업 하나 -> 이벤트 목록"""
+    start = session.start
+    events = [TimelineEvent(start - timedelta(minutes=lead_minutes), start, PRE_START, session),
+              TimelineEvent(start, start + LATE_GRACE, START, session)]
+
+    def add(at: datetime, kind: str, extra: int = 0):
+        events.append(TimelineEvent(at, at + LATE_GRACE, kind, session, extra))
+
+    end = session.end
+    if end is not None:
+        if 0 < warning_minutes < session.duration:
+            add(end - timedelta(minutes=warning_minutes), END_WARNING, warning_minutes)
+        add(end, END)
+        for k in range(1, overtime_repeats + 1):
+            add(end + timedelta(minutes=overtime_every * k), OVERTIME, overtime_every * k)
+    return events
+
+
+def prune_alerted(students: Iterable, retired: dict[str, set], day: date) -> int:
+    """
+    alerted_times에서 day 전 날짜 키 삭제 (키가 수업 날짜로 시작) -> 지운 개수
+    타임라인은 그날 수업만 보니 지난 날짜 키는 다시 쓸 일이 없음 -> 오래 켜 둬도 날마다 쌓이지 않게
+    retired에서 비게 된 학생도 삭제
+    """
+    cutoff = str(day)
+    removed = 0
+    for alerted in [s.alerted_times for s in students] + list(retired.values()):
+        stale = [key for key in alerted if key[:10] < cutoff]
+        alerted.difference_update(stale)
+        removed += len(stale)
+    for name in [name for name, alerted in retired.items() if not alerted]:
+        del retired[name]
+    return removed
+
+
+def sessions_between(students: Iterable, start: datetime, end: datetime) -> list[Session]:
+    """start ~ end 사이에 시작하는 수업 (반복 규칙은 그 구간만 계산)"""
+    sessions = []
+    for student in students:
+        duration = getattr(student, "duration", None)
+        room, teacher = getattr(student, "room", None), getattr(student, "teacher", None)
+        for when in takewhile(lambda t: t < end, student.rule.occurrences(student.schedule, start)):
+            sessions.append(Session(student.name, when, duration, room, teacher))
+    return sessions
+
+
+class Timeline:
+    """하루치 이벤트 (정렬된 리스트 + 커서)"""
+
+    def __init__(self, day: date, events: list[TimelineEvent]):
+        self.day = day
+        self.events = sorted(events, key=lambda e: (e.at, e.kind))
+        self.cursor = 0
+
+    @classmethod
+    def compile(cls, students: Iterable, day: date, lead_minutes: int, **options) -> "Timeline":
+        """day에 일어나는 이벤트 (전날 늦게 끝나는 수업 / 다음날 0시 직후 수업 포함)"""
+        day_start = datetime.combine(day, datetime.min.time())
+        day_end = day_start + timedelta(days=1)
+        sessions = sessions_between(students, day_start - timedelta(days=1), day_end + timedelta(days=1))
+        events = [e for s in sessions for e in session_events(s, lead_minutes, **options)
+                  if day_start <= e.at < day_end]
+        return cls(day, events)
+
+    def due(self, now: datetime, ahead: timedelta = timedelta(0)) -> list[TimelineEvent]:
+        """커서 이후 now(+ahead)까지 도래한 이벤트 (만료된 것은 버림, ahead: 미리 보낼 여유)"""
+        fired = []
+        horizon = now + ahead
+        while self.cursor < len(self.events) and self.events[self.cursor].at <= horizon:
+            event = self.events[self.cursor]
+            self.cursor += 1
+            if now <= event.expires:
+                fired.append(event)
+        return fired
+
+    def next_at(self) -> Optional[datetime]:
+        """커서 다음 이벤트 시각 (없으면 None)"""
+        return self.events[self.cursor].at if self.cursor < len(self.events) else None
+
+    def __len__(self):
+        return len(self.events)
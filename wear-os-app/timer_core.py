@@ -0,0 +1,537 @@
+"""
+스케줄러 두 개 (CLI들과 timer_runtime이 같이 씀)
+- StudentTimer: 시간표 알림 (수업 N분 전 / 시작 / 종료 전 / 종료 / 초과)
+  하루 타임라인을 한 번 컴파일하고 커서만 전진, 예상 도착 지연만큼 먼저 내보냄
+- TimerManager: 카운트다운 타이머 (그룹/태그/전체 이동, 시간표 파일이면 수업마다 다시 잡음)
+  스케줄러 태스크 하나 + 마감 힙 하나
+- 알림은 둘 다 알림 버스로 (alert_bus, 워치 + P5S_SINKS 싱크)
+"""
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from alert_bus import Alert, AlertBus, default_bus
+from attendance_outbox import Outbox, attendance_event
+from clock import SYSTEM_CLOCK
+from deadline_heap import DeadlineHeap
+from dedup_store import ALERT_TTL, DedupStore
+from delivery_latency import MAX_LEAD, TRACKER, LatencyTracker, packet_count
+from log_pipeline import status
+from recurrence import DAILY, Recurrence
+from schedule_analysis import ScheduleReport, analyze_timeline, notifier_capacity
+from schedule_artifact import load_compiled
+from schedule_file import Schedule, ScheduleWatcher, apply_slot_diff, diff_schedules
+from session_index import SessionIndex
+from timeline import END, START, Timeline, prune_alerted
+from timer_runtime import DEVICE_ADDRESS
+from watch_notifier import WatchNotifier
+
+# 알림 몇 분 전에 보낼지
+ALERT_MINUTES_BEFORE = 5
+
+log = logging.getLogger("p5s.timer")
+
+
+@dataclass
+class Student:
+    name: str
+    schedule: list[str]  # ["15:00", "16:30", ...]
+    alerted_times: set = field(default_factory=set)  # 이미 알림 보낸 시간
+    rule: Recurrence = DAILY  # 요일/기간/휴강/보강 (기본: 매일)
+    duration: Optional[int] = None  # 수업 길이(분) - 있으면 종료 전/종료/초과 알림
+    room: Optional[str] = None      # 강의실
+    teacher: Optional[str] = None   # 담당 선생님
+
+
+class StudentTimer:
+    """학생 수업 타이머 관리"""
+
+    def __init__(self, notifier=None, clock=SYSTEM_CLOCK, outbox: Optional[Outbox] = None,
+                 dedup: Optional[DedupStore] = None, latency: LatencyTracker = TRACKER,
+                 bus: Optional[AlertBus] = None):
+        self.students: dict[str, Student] = {}
+        self.notifier = notifier or WatchNotifier(DEVICE_ADDRESS)
+        self.clock = clock  # now()만 있으면 됨 (시뮬레이션 시 LoopClock)
+        self.running = False
+        self.file_schedule = Schedule()  # 마지막으로 로드한 시간표 파일 내용
+        self.retired_alerts: dict[str, set] = {}  # 파일에서 빠진 학생의 alerted_times
+        self.timeline: Optional[Timeline] = None  # 오늘 이벤트 (시간표가 바뀌면 None -> 다시 컴파일)
+        self.index: Optional[SessionIndex] = None  # 오늘 수업 구간 (대시보드 조회용, 학생 단위 갱신)
+        self.outbox = outbox  # 출석 이벤트 (수업 시작/종료) 기록용
+        self.dedup = dedup    # 프로세스/재시작 간 중복 방지 (없으면 alerted_times만)
+        self.latency = latency  # 워치별 도착 지연 추정 -> 그만큼 먼저 보냄
+        self.bus = bus or default_bus(self.notifier, clock, latency, dedup)  # 워치 + 다른 싱크들
+        self.report: Optional[ScheduleReport] = None  # 마지막으로 컴파일한 타임라인의 충돌/부하 분석
+        self.alert_minutes = ALERT_MINUTES_BEFORE
+
+    def add_student(self, name: str, schedule: list[str], rule: Recurrence = DAILY,
+                    duration: Optional[int] = None):
+        """학생 추가"""
+        self.students[name] = Student(name=name, schedule=schedule, rule=rule, duration=duration)
+        self._changed([name])
+        length = f", {duration}분" if duration else ""
+        log.info(f"  👤 {name} 추가: {', '.join(schedule)} ({rule.describe()}{length})")
+
+    def remove_student(self, name: str):
+        """학생 제거"""
+        if name in self.students:
+            del self.students[name]
+            self._changed([name])
+            log.info(f"  ❌ {name} 제거됨")
+
+    def _changed(self, names):
+        """학생이 바뀌면 타임라인은 다시 컴파일, 인덱스는 그 학생만 갱신"""
+        self.timeline = None
+        if self.index is not None:
+            for name in names:
+                self.index.update(name, self.students.get(name))
+
+    def sessions(self) -> SessionIndex:
+        """오늘 수업 구간 인덱스 (날짜가 바뀌면 새로 만듦)"""
+        today = self.clock.now().date()
+        if self.index is None or self.index.day != today:
+            self.index = SessionIndex.build(self.students.values(), today)
+        return self.index
+
+    def apply_schedule(self, schedule: Schedule):
+        """시간표 파일 내용 반영 (이전 파일 대비 바뀐 슬롯만)"""
+        diff = diff_schedules(self.file_schedule, schedule)
+        self.file_schedule = schedule
+        if diff:
+            apply_slot_diff(self.students, diff, Student, self.retired_alerts)
+            self._changed(diff.names)
+            log.info(f"  🔄 시간표 반영: +{len(diff.added)} -{len(diff.removed)} (학생 {len(self.students)}명)",
+                     extra={"event": "reload", "added": len(diff.added), "removed": len(diff.removed)})
+
+    def load_schedule(self, path: str):
+        """시간표 파일 로드"""
+        self.apply_schedule(load_compiled(path))  # 컴파일된 아티팩트가 최신이면 파싱 없이
+
+    async def watch_schedule(self, path: str):
+        """시간표 파일 변경 감시 (바뀌면 자동 반영)"""
+        await ScheduleWatcher(path, self.apply_schedule, loader=load_compiled).run()
+
+    def get_upcoming_alerts(self, ahead: float = 0.0) -> list[tuple[str, str, datetime]]:
+        """지금(~ ahead초 뒤까지) 보낼 알림 [(이름, 메시지, 도착해야 할 시각), ...]"""
+        now = self.clock.now()
+        # 오늘 타임라인은 한 번만 컴파일, 이후에는 커서만 전진
+        if self.timeline is None or self.timeline.day != now.date():
+            prune_alerted(self.students.values(), self.retired_alerts, now.date())
+            self.timeline = Timeline.compile(self.students.values(), now.date(), self.alert_minutes)
+            self._analyze()
+
+        alerts = []
+        for event in self.timeline.due(now, timedelta(seconds=ahead)):
+            student = self.students.get(event.session.name)
+            msg = event.message(max(now, event.at))  # 워치에 도착할 시각 기준 문구
+            # 이미 알림 보냈으면 스킵
+            if student is None or msg is None or event.key in student.alerted_times:
+                continue
+            student.alerted_times.add(event.key)
+            # 다른 프로세스나 이전 실행에서 이미 보낸 이벤트
+            if self.dedup is not None and not self.dedup.claim(f"alert:{student.name}:{event.key}", ALERT_TTL):
+                continue
+            alerts.append((student.name, msg, max(now, event.at)))
+            if self.outbox is not None and event.kind in (START, END):
+                self._record_attendance(event)
+
+        return alerts
+
+    def _analyze(self):
+        """새 타임라인의 선생님/강의실 겹침, 워치 한도를 넘는 분 -> 경고"""
+        self.report = analyze_timeline(self.timeline, notifier_capacity(self.notifier, self.latency))
+        if self.report.problems:
+            log.warning(self.report.format(), extra={"event": "schedule_report", "conflicts": len(self.report.conflicts),
+                                                     "overloaded": len(self.report.overloaded)})
+
+    def _record_attendance(self, event):
+        """수업 시작 -> 체크인, 종료 -> 체크아웃 (업로드는 백그라운드 업로더가)"""
+        session = event.session
+        if event.kind == START:
+            key, fields = attendance_event(session.name, session.start, check_in=event.at)
+        else:
+            key, fields = attendance_event(session.name, session.start, check_out=event.at,
+                                           duration=session.duration)
+        self.outbox.add(key, fields)
+
+    def lead_time(self, message: str) -> float:
+        """이 메시지를 지금 보내면 워치에 도착하기까지 예상 시간 (초)"""
+        return self.latency.estimate(getattr(self.notifier, "address", ""), bool(self.notifier.connected),
+                                     packet_count(self.notifier, message))
+
+    async def check_and_notify(self):
+        """알림 체크 후 버스로 (예상 지연만큼 먼저 내보내서 마감 시각에 도착하게, 전송은 싱크 워커가)"""
+        alerts = self.get_upcoming_alerts(ahead=MAX_LEAD)
+
+        for name, msg, deadline in alerts:
+            wait = (deadline - self.clock.now()).total_seconds() - self.lead_time(msg)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            log.info(f"🔔 {msg}", extra={"event": "alert", "student": name})
+            self.bus.publish(Alert(name, msg, deadline))
+
+    def next_wakeup(self, check_interval: float) -> float:
+        """다음 체크까지 (초): 다음 이벤트를 미리 보낼 여유(MAX_LEAD)를 두고 깸"""
+        next_at = self.timeline.next_at() if self.timeline is not None else None
+        if next_at is None:
+            return check_interval
+        until = (next_at - self.clock.now()).total_seconds() - MAX_LEAD
+        return min(check_interval, max(until, 0.0))
+
+    async def run(self, check_interval: int = 30):
+        """타이머 실행 (check_interval초마다 체크)"""
+        self.running = True
+        log.info(f"🚀 타이머 시작! ({check_interval}초마다 체크)\n   알림: 수업 {self.alert_minutes}분 전\n" + "-" * 40)
+
+        # 워치 연결
+        await self.notifier.connect()
+
+        while self.running:
+            now = self.clock.now().strftime("%H:%M:%S")
+            status(f"⏰ {now} - 학생 {len(self.students)}명 모니터링 중...")
+
+            await self.check_and_notify()
+            await asyncio.sleep(self.next_wakeup(check_interval))
+
+        await self.bus.close()
+        await self.notifier.disconnect()
+
+    def stop(self):
+        """타이머 중지"""
+        self.running = False
+        log.info("⏹️ 타이머 중지됨")
+
+
+def status_text(timer: StudentTimer) -> str:
+    """등록된 학생 목록"""
+    lines = ["=" * 50, "📋 등록된 학생:", "-" * 50]
+    for name, student in timer.students.items():
+        times = ", ".join(student.schedule)
+        length = f", {student.duration}분" if student.duration else ""
+        lines.append(f"  {name}: {times} ({student.rule.describe()}{length})")
+    if not timer.students:
+        lines.append("  (없음)")
+    lines.append("=" * 50)
+    return "\n".join(lines)
+
+
+def now_text(timer: StudentTimer, minutes: int = 10) -> str:
+    """지금 수업 현황 (인덱스 조회라 학생 수와 무관)"""
+    index = timer.sessions()
+    now = timer.clock.now()
+
+    def names(sessions):
+        return ", ".join(f"{s.name}({s.room})" if s.room else s.name for s in sessions) or "-"
+
+    lines = [f"🕐 {now:%H:%M} 현황",
+             f"  수업 중: {names(index.in_class(now))}",
+             f"  {minutes}분 안에 시작: {names(index.starting(now, minutes))}",
+             f"  {minutes}분 안에 종료: {names(index.ending(now, minutes))}"]
+    for room in sorted(index.by_room):
+        gaps = index.free_gaps(room=room, start=now, end=index.day_end, min_minutes=minutes)
+        if gaps:
+            lines.append(f"  {room} 빈 시간: " + ", ".join(f"{a:%H:%M}~{b:%H:%M}" for a, b in gaps[:3]))
+    return "\n".join(lines)
+
+
+def print_status(timer: StudentTimer):
+    """현재 상태 출력"""
+    log.info(status_text(timer))
+
+
+def print_now(timer: StudentTimer, minutes: int = 10):
+    log.info(now_text(timer, minutes))
+
+
+# ========== 카운트다운 타이머 ==========
+
+class Timer:
+    """타이머 하나 (그룹이면 members 전체가 마감 하나를 같이 씀)"""
+    def __init__(self, name: str, minutes: int, heap: DeadlineHeap, end_time: Optional[datetime] = None,
+                 clock=SYSTEM_CLOCK, members: Iterable[str] = (), tags: Iterable[str] = (),
+                 slot: Optional[datetime] = None):
+        self.name = name
+        self.clock = clock
+        self.heap = heap
+        self.members = list(members)
+        self.tags = set(tags)
+        self.group = frozenset(self.tags)  # 힙 묶음 (태그 조합이 같은 타이머끼리 -> 태그 연장은 묶음 단위)
+        self.cancelled = False
+        self.slot = slot  # 시간표 수업 시각 (있으면 끝날 때 다음 수업으로 다시 잡음)
+        self.started = clock.now()
+        self.ended_at = end_time or self.started + timedelta(minutes=minutes)
+        heap.push(self, self.ended_at, self.group)
+
+    @property
+    def end_time(self) -> datetime:
+        """마감 시각 (전체 이동/연장 반영, 끝났으면 끝난 시각)"""
+        deadline = self.heap.deadline(self)
+        return self.ended_at if deadline is None else deadline
+
+    @property
+    def minutes(self) -> int:
+        """시작부터 마감까지 (분, 연장/이동 반영)"""
+        return round((self.end_time - self.started).total_seconds() / 60)
+
+    @property
+    def remaining(self) -> int:
+        """남은 초"""
+        return max(0, int((self.end_time - self.clock.now()).total_seconds()))
+
+    @property
+    def remaining_str(self) -> str:
+        """남은 시간 문자열"""
+        r = self.remaining
+        m, s = divmod(r, 60)
+        return f"{m:02d}:{s:02d}"
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}({len(self.members)}명)" if self.members else self.name
+
+    def extend(self, minutes: int):
+        """마감을 minutes분 늦춤 (음수면 당김)"""
+        self.heap.push(self, self.end_time + timedelta(minutes=minutes), self.group)
+
+    def cancel(self):
+        """타이머 취소"""
+        self.cancelled = True
+        self.ended_at = self.end_time
+        self.heap.discard(self)
+
+
+class TimerManager:
+    """
+    타이머 관리자
+    - 스케줄러 태스크 하나 + 마감 힙 하나 (타이머마다 태스크를 만들지 않음)
+    - 그룹 타이머: 마감 하나에 학생 여러 명 -> 끝나면 알림 한 번
+    - 태그(#A반 등)로 묶어서 취소/연장 (연장은 태그 조합별 힙 묶음 오프셋만), 전체 이동은 힙 오프셋만 바꿈
+    """
+    def __init__(self, notifier=None, clock=SYSTEM_CLOCK, outbox: Optional[Outbox] = None,
+                 dedup: Optional[DedupStore] = None, latency: LatencyTracker = TRACKER,
+                 bus: Optional[AlertBus] = None):
+        self.timers: dict[str, Timer] = {}
+        self.tags: dict[str, set[str]] = {}  # 태그 -> 타이머 이름들
+        self.heap: DeadlineHeap[Timer] = DeadlineHeap()
+        self.notifier = notifier or WatchNotifier(DEVICE_ADDRESS)
+        self.clock = clock
+        self.file_schedule = Schedule()  # 마지막으로 로드한 시간표 파일 내용
+        self.outbox = outbox  # 타이머 종료 = 출석 체크아웃 기록
+        self.dedup = dedup    # 다른 프로세스와 같은 알림 쿨다운 공유
+        self.latency = latency  # 예상 도착 지연만큼 먼저 꺼냄
+        self.bus = bus or default_bus(self.notifier, clock, latency, dedup)  # 종료 알림은 버스로 (워치 + 다른 싱크)
+        self._scheduler: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    # ========== 스케줄러 ==========
+
+    def _wakeup(self):
+        """힙이 바뀜 -> 스케줄러가 다음 마감을 다시 봄 (없으면 시작)"""
+        if self._scheduler is None or self._scheduler.done():
+            self._wake = asyncio.Event()
+            self._scheduler = asyncio.create_task(self._run(), name="p5s-timers")
+        self._wake.set()
+
+    def lead_time(self) -> float:
+        """지금 보내면 워치에 도착하기까지 예상 시간 (초, 연결 상태 기준)"""
+        return self.latency.estimate(getattr(self.notifier, "address", ""), bool(self.notifier.connected))
+
+    async def _run(self):
+        """가장 이른 마감(- 예상 지연)까지 기다렸다가 마감된 타이머를 한 번에 꺼냄"""
+        while True:
+            self._wake.clear()
+            lead = timedelta(seconds=self.lead_time())
+            for end_time, timer in self.heap.pop_due(self.clock.now() + lead):
+                timer.ended_at = end_time
+                self._forget(timer)
+                self.on_timer_end(timer)  # 버스에 넣기만 함 (워치가 멈춰도 스케줄러는 안 기다림)
+
+            head = self.heap.peek()
+            timeout = None if head is None else max(0.0, (head - lead - self.clock.now()).total_seconds())
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self):
+        """스케줄러 정지 + 남은 타이머 취소 (밀린 종료 알림은 잠깐 보내 보고 정지)"""
+        for timer in list(self.timers.values()):
+            self._drop(timer)
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._scheduler
+            self._scheduler = None
+        await self.bus.close()
+
+    def _start(self, timer: Timer) -> Timer:
+        old = self.timers.get(timer.name)
+        if old is not None:
+            self._drop(old)  # 같은 이름의 기존 타이머는 취소
+        self.timers[timer.name] = timer
+        for tag in timer.tags:
+            self.tags.setdefault(tag, set()).add(timer.name)
+        self._wakeup()
+        return timer
+
+    def _forget(self, timer: Timer):
+        if self.timers.get(timer.name) is timer:
+            del self.timers[timer.name]
+            for tag in timer.tags:
+                names = self.tags[tag]
+                names.discard(timer.name)
+                if not names:
+                    del self.tags[tag]
+
+    def _drop(self, timer: Timer):
+        timer.cancel()
+        self._forget(timer)
+
+    def _tagged(self, tag: str) -> list[Timer]:
+        return [self.timers[name] for name in self.tags.get(tag.lstrip("#"), ())]
+
+    # ========== 알림 ==========
+
+    def on_timer_end(self, timer: Timer):
+        """
+        타이머 종료 시 호출 (그룹이면 알림 한 번, 출석 기록은 학생마다)
+        - 시간표 카운트다운(slot)은 수업 시작까지 기다린 것이라 출석 기록 안 함
+        """
+        if timer.members:
+            msg = f"⏰ {timer.name} 시간 종료! ({', '.join(timer.members)})"
+        else:
+            msg = f"⏰ {timer.name} 시간 종료!"
+        log.info(f"🔔 {msg}", extra={"event": "alert", "student": timer.name, "members": len(timer.members)})
+        if self.outbox is not None and timer.slot is None:
+            for name in timer.members or [timer.name]:
+                self.outbox.add(*attendance_event(name, timer.started, check_in=timer.started,
+                                                  check_out=timer.end_time, duration=timer.minutes))
+        self.bus.publish(Alert(timer.name, msg, timer.end_time, source="timer"))
+        self._rearm(timer)
+
+    # ========== 추가 ==========
+
+    def add_timer(self, name: str, minutes: int, tags: Iterable[str] = ()):
+        """타이머 추가"""
+        self._start(Timer(name, minutes, self.heap, clock=self.clock, tags=tags))
+        print(f"✅ {name} - {minutes}분 타이머 시작!")
+
+    def add_timer_at(self, name: str, end_time: datetime, slot: Optional[datetime] = None):
+        """특정 시각까지 타이머 추가 (slot: 시간표 수업이면 그 시각)"""
+        minutes = max(0, int((end_time - self.clock.now()).total_seconds() // 60))
+        self._start(Timer(name, minutes, self.heap, end_time=end_time, clock=self.clock, slot=slot))
+
+    def add_group(self, group: str, members: Iterable[str], minutes: int, tags: Iterable[str] = ()):
+        """그룹 타이머 (마감 하나, 끝나면 알림 한 번)"""
+        timer = self._start(Timer(group, minutes, self.heap, clock=self.clock, members=members, tags=tags))
+        print(f"✅ {timer.label} - {minutes}분 그룹 타이머 시작! ({', '.join(timer.members)})")
+
+    def add_many(self, names: list[str], minutes: int, group: Optional[str] = None, tags: Iterable[str] = ()):
+        """여러 명을 한 번에 (같은 마감 -> 그룹 타이머 하나)"""
+        if len(names) == 1 and group is None:
+            self.add_timer(names[0], minutes, tags)
+        else:
+            self.add_group(group or f"{names[0]} 외 {len(names) - 1}명", names, minutes, tags)
+
+    # ========== 묶음 변경 ==========
+
+    def extend_timer(self, name: str, minutes: int):
+        """타이머(또는 그룹) 연장"""
+        timer = self.timers.get(name)
+        if timer is None:
+            print(f"⚠️ {name} 타이머 없음")
+            return
+        timer.extend(minutes)
+        self._wakeup()
+        print(f"⏩ {timer.label} {minutes:+d}분 -> {timer.remaining_str} 남음")
+
+    def extend_tag(self, tag: str, minutes: int):
+        """
+        태그가 붙은 타이머 전부 연장
+        - 타이머마다가 아니라 그 태그가 든 힙 묶음(태그 조합)마다 오프셋만 -> 묶음 수 x O(log n)
+        """
+        tag = tag.lstrip("#")
+        for group in self.heap.groups:
+            if tag in group:
+                self.heap.shift_group(group, timedelta(minutes=minutes))
+        self._wakeup()
+        print(f"⏩ #{tag} 타이머 {len(self.tags.get(tag, ()))}개 {minutes:+d}분")
+
+    def cancel_tag(self, tag: str):
+        """
+        태그가 붙은 타이머 전부 취소
+        - 힙에서는 지연 삭제라 타이머당 O(1), 이름/태그 목록 정리는 타이머 수만큼
+        """
+        timers = self._tagged(tag)
+        for timer in timers:
+            self._drop(timer)
+        self._wakeup()
+        print(f"❌ #{tag.lstrip('#')} 타이머 {len(timers)}개 취소됨")
+
+    def shift_all(self, minutes: int):
+        """모든 타이머를 minutes분 이동 (힙 오프셋만 바꿈)"""
+        self.heap.shift(timedelta(minutes=minutes))
+        self._wakeup()
+        print(f"⏩ 전체 타이머 {len(self.timers)}개 {minutes:+d}분")
+
+    def apply_schedule(self, schedule: Schedule):
+        """
+        시간표 파일 반영: 학생별로 다음 수업 시각까지 카운트다운
+        - 슬롯/반복 규칙이 바뀐 학생의 타이머만 다시 잡고 나머지는 그대로 둠
+        """
+        diff = diff_schedules(self.file_schedule, schedule)
+        self.file_schedule = schedule
+        now = self.clock.now()
+
+        for name in {n for n, _ in diff.added} | {n for n, _ in diff.removed} | diff.rules.keys():
+            next_class = self._next_class(name, now)
+            current = self.timers.get(name)
+            if next_class is None:
+                if current:
+                    self._drop(current)
+            elif current is None or current.end_time != next_class:
+                self.add_timer_at(name, next_class, slot=next_class)
+
+        if diff:
+            log.info(f"🔄 시간표 반영: +{len(diff.added)} -{len(diff.removed)} (타이머 {len(self.timers)}개)",
+                     extra={"event": "reload", "added": len(diff.added), "removed": len(diff.removed)})
+
+    def _next_class(self, name: str, after: datetime) -> Optional[datetime]:
+        times = self.file_schedule.times.get(name, [])
+        return next(self.file_schedule.rule(name).occurrences(times, after), None)
+
+    def _rearm(self, timer: Timer):
+        """시간표 타이머가 끝나면 그 학생의 다음 수업까지 다시 카운트다운"""
+        if timer.slot is None or timer.name in self.timers:
+            return
+        after = max(timer.slot + timedelta(microseconds=1), self.clock.now())
+        next_class = self._next_class(timer.name, after)
+        if next_class is not None:
+            self.add_timer_at(timer.name, next_class, slot=next_class)
+
+    def load_schedule(self, path: str):
+        """시간표 파일 로드"""
+        self.apply_schedule(load_compiled(path))
+
+    async def watch_schedule(self, path: str):
+        """시간표 파일 변경 감시 (바뀌면 자동 반영)"""
+        await ScheduleWatcher(path, self.apply_schedule, loader=load_compiled).run()
+
+    def cancel_timer(self, name: str):
+        """타이머 취소"""
+        if name in self.timers:
+            self._drop(self.timers[name])
+            print(f"❌ {name} 타이머 취소됨")
+        else:
+            print(f"⚠️ {name} 타이머 없음")
+
+    async def connect(self):
+        """워치 연결"""
+        await self.notifier.connect()
+
+    async def disconnect(self):
+        """워치 연결 해제"""
+        await self.notifier.disconnect()
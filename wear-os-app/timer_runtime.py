@@ -0,0 +1,386 @@
+"""
+타이머 런타임: 시간표 알림(StudentTimer)과 카운트다운(TimerManager, 둘 다 timer_core)을 한 이벤트 루프에서
+- 워치마다 감독되는 연결 하나 (WatchLink)
+  끊기면 백오프로 재연결, 전송이 없을 때도 연결 유지
+- 모든 전송은 워치별 큐 하나를 거쳐 차례대로 (연결/전송이 서로 섞이지 않음)
+- 제어 소켓 (기본 127.0.0.1:8767, JSON 한 줄씩)
+  다른 프로세스(Electron watch-send.py, 두 번째 CLI)는 워치에 직접 붙지 않고 여기로 요청
+  -> P5S가 중앙 장치를 하나만 받아도 서로 연결을 뺏지 않음
+- 이미 다른 프로세스가 런타임을 열고 있으면 그 런타임으로 보내는 RemoteLink 사용
+
+제어 소켓 요청 (응답도 JSON 한 줄)
+  {"op": "send", "address": MAC, "message": "..."}          -> {"ok": true}
+  {"op": "timer", "name": "...", "minutes": 50, "members": [...], "tags": [...]}
+  {"op": "cancel", "name": "..."} / {"op": "cancel", "tag": "..."}
+  {"op": "status"}                                            -> {"links": [...], "sinks": [...], "timers": N, "adapters": [...]}
+
+- 워치 앱용 시간표 피드 (schedule_feed, 기본 127.0.0.1:8768 HTTP)
+- 시간표 알림과 타이머 종료 알림은 알림 버스 하나로 (alert_bus, 워치 + P5S_SINKS 싱크)
+- --adapters hci0,hci1 (auto: 자동 검색)이면 워치를 어댑터 여러 개에 나눠 배치 (watch_shard)
+
+P5S_RUNTIME=host:port 로 주소 변경, "off"면 소켓 없이 (이 프로세스 안에서만)
+사용법: python timer_runtime.py [시간표파일] [--address MAC] [--adapters auto] [--processes]
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from typing import Callable, Optional
+
+from delivery_latency import TRACKER
+from log_pipeline import setup_logging
+from watch_shard import ShardedNotifier, default_notifier
+
+RUNTIME_ENDPOINT = os.environ.get("P5S_RUNTIME", "127.0.0.1:8767")
+DEVICE_ADDRESS = "01:BC:8D:DB:2C:15"
+
+SUPERVISE_INTERVAL = 5.0    # 연결 상태 확인 간격 (초)
+RECONNECT_MIN = 1.0
+RECONNECT_MAX = 60.0
+REMOTE_TIMEOUT = 60.0       # 다른 런타임에 보낸 요청 응답 제한 (초)
+
+log = logging.getLogger("p5s.runtime")
+
+
+def parse_endpoint(endpoint: str) -> Optional[tuple[str, int]]:
+    if not endpoint or endpoint == "off":
+        return None
+    host, _, port = endpoint.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class WatchLink:
+    """워치 하나의 감독되는 연결 + 전송 큐 (WatchNotifier와 같은 인터페이스)"""
+
+    def __init__(self, address: str, notifier):
+        self.address = address
+        self.notifier = notifier
+        self.queue: asyncio.Queue = asyncio.Queue()  # (메시지, 보낸 곳, future)
+        self.sent = 0
+        self.failed = 0
+        self.reconnects = 0
+        self._lock = asyncio.Lock()   # 연결과 전송을 한 번에 하나만
+        self._kick = asyncio.Event()  # 전송 실패 -> 감독자가 바로 확인
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def connected(self) -> bool:
+        client = getattr(self.notifier, "client", None)
+        if client is not None and not client.is_connected:
+            return False
+        return bool(self.notifier.connected)
+
+    def start(self) -> "WatchLink":
+        self._tasks = [asyncio.create_task(self._sender(), name=f"p5s-send-{self.address}"),
+                       asyncio.create_task(self._supervise(), name=f"p5s-link-{self.address}")]
+        return self
+
+    async def connect(self):
+        return True  # 연결은 감독자가 관리
+
+    async def disconnect(self):
+        pass  # 다른 스케줄러도 같은 연결을 씀 -> 런타임 종료 때만 끊음
+
+    async def send(self, message: str, source: str = "local") -> bool:
+        """큐에 넣고 전송 결과를 기다림"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((message, source, future))
+        return await future
+
+    send_notification = send
+
+    async def _sender(self):
+        while True:
+            message, source, future = await self.queue.get()
+            async with self._lock:
+                try:
+                    ok = await self.notifier.send_notification(message)
+                except Exception as e:
+                    log.warning(f"  ❌ 전송 오류: {e}", extra={"event": "send_failed", "address": self.address})
+                    ok = False
+            if ok:
+                self.sent += 1
+            else:
+                self.failed += 1
+                self._kick.set()
+            if source != "local":
+                log.info(f"  📨 {source} 요청 전송: {message}", extra={"event": "remote_send", "ok": ok})
+            if not future.done():
+                future.set_result(ok)
+
+    async def _supervise(self):
+        """끊기면 백오프로 재연결"""
+        delay = RECONNECT_MIN
+        while True:
+            wait = SUPERVISE_INTERVAL
+            if not self.connected:
+                self.notifier.connected = False
+                async with self._lock:
+                    ok = await self.notifier.connect()
+                if ok:
+                    self.reconnects += 1
+                    delay = RECONNECT_MIN
+                else:
+                    wait, delay = delay, min(delay * 2, RECONNECT_MAX)
+            self._kick.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._kick.wait(), wait)
+
+    def packet_count(self, message: str) -> int:
+        count = getattr(self.notifier, "packet_count", None)
+        return count(message) if count else 1
+
+    def status(self) -> dict:
+        return {"address": self.address, "connected": self.connected, "queued": self.queue.qsize(),
+                "sent": self.sent, "failed": self.failed, "reconnects": self.reconnects,
+                **TRACKER.summary(self.address), **self._pacing()}
+
+    def _pacing(self) -> dict:
+        pacer = getattr(self.notifier, "pacer", None)
+        return pacer.summary() if pacer is not None else {}
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await self.notifier.disconnect()
+
+
+class RemoteLink:
+    """다른 프로세스의 런타임을 거쳐 보내는 워치 (WatchNotifier와 같은 인터페이스)"""
+
+    def __init__(self, address: str, endpoint: tuple[str, int]):
+        self.address = address
+        self.endpoint = endpoint
+        self.connected = True
+
+    async def connect(self):
+        return True
+
+    async def disconnect(self):
+        pass
+
+    async def send(self, message: str) -> bool:
+        try:
+            reply = await request(self.endpoint, {"op": "send", "address": self.address, "message": message})
+        except (OSError, ValueError, asyncio.TimeoutError) as e:
+            log.warning(f"  ❌ 런타임 요청 실패: {e}", extra={"event": "send_failed", "address": self.address})
+            return False
+        return bool(reply.get("ok"))
+
+    send_notification = send
+
+    def status(self) -> dict:
+        return {"address": self.address, "remote": "%s:%d" % self.endpoint}
+
+
+async def request(endpoint: tuple[str, int], payload: dict, timeout: float = REMOTE_TIMEOUT) -> dict:
+    """제어 소켓에 요청 하나"""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(*endpoint), 2.0)
+    try:
+        writer.write(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readline(), timeout)
+        return json.loads(line or b"{}")
+    finally:
+        writer.close()
+
+
+class TimerRuntime:
+    """워치 링크 + 호스팅하는 스케줄러들 + 제어 소켓"""
+
+    def __init__(self, endpoint: str = RUNTIME_ENDPOINT, factory: Callable = default_notifier,
+                 shard: Optional[ShardedNotifier] = None):
+        self.endpoint = parse_endpoint(endpoint)
+        self.factory = factory
+        self.shard = shard            # 있으면 워치를 어댑터 여러 개에 배치
+        self.links: dict[str, object] = {}
+        self.remote = False           # 다른 프로세스의 런타임으로 보내는 중
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.schedule = None          # StudentTimer
+        self.timers = None            # TimerManager
+        self.feed = None              # ScheduleFeed
+        self.feed_server: Optional[asyncio.AbstractServer] = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> "TimerRuntime":
+        """제어 소켓 열기 (이미 다른 런타임이 열고 있으면 그쪽으로 보내는 모드)"""
+        if self.endpoint is None:
+            return self
+        try:
+            self.server = await asyncio.start_server(self._serve, *self.endpoint)
+            log.info("  🛰️ 런타임 제어 소켓: %s:%d" % self.endpoint)
+        except OSError as e:
+            try:
+                await request(self.endpoint, {"op": "status"}, timeout=2.0)
+            except (OSError, ValueError, asyncio.TimeoutError):
+                log.warning(f"  ⚠️ 제어 소켓을 못 엶 ({e}) - 이 프로세스 안에서만 전송")
+                return self
+            self.remote = True
+            log.info("  🛰️ 실행 중인 런타임(%s:%d)으로 전송" % self.endpoint)
+        return self
+
+    def link(self, address: str = DEVICE_ADDRESS, adapter: Optional[str] = None):
+        """워치 주소 -> 이 런타임의 링크 (워치마다 하나)"""
+        key = address.upper()
+        link = self.links.get(key)
+        if link is None:
+            if self.remote:
+                link = RemoteLink(address, self.endpoint)
+            else:
+                notifier = self.shard.for_watch(address) if self.shard else self.factory(address, adapter)
+                link = WatchLink(address, notifier).start()
+            self.links[key] = link
+        return link
+
+    def host_schedule(self, timer, check_interval: int = 30) -> asyncio.Task:
+        """StudentTimer 실행 (check_interval초마다 체크)"""
+        self.schedule = timer
+        task = asyncio.create_task(timer.run(check_interval=check_interval), name="p5s-schedule")
+        self._tasks.append(task)
+        return task
+
+    def host_timers(self, manager):
+        """TimerManager 등록 (자체 스케줄러 태스크는 타이머를 넣을 때 시작됨)"""
+        self.timers = manager
+
+    async def host_feed(self, timer, outbox=None):
+        """시간표 피드 HTTP 서버 (워치 앱이 Notion 대신 여기서 받음)"""
+        from schedule_feed import ScheduleFeed, serve_feed
+
+        self.feed = ScheduleFeed(timer, outbox)
+        self.feed_server = await serve_feed(self.feed)
+        return self.feed
+
+    # ========== 제어 소켓 ==========
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername")
+        source = f"{peer[0]}:{peer[1]}" if peer else "socket"
+        try:
+            while line := await reader.readline():
+                try:
+                    reply = await self._handle(json.loads(line), source)
+                except (ValueError, KeyError, TypeError) as e:
+                    reply = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(reply, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, req: dict, source: str) -> dict:
+        op = req.get("op")
+        if op == "send":
+            return {"ok": await self.link(req["address"]).send(str(req["message"]), source=source)}
+        if op == "status":
+            host = self.schedule or self.timers
+            return {"ok": True, "links": [link.status() for link in self.links.values()],
+                    "sinks": host.bus.status() if host is not None else [],
+                    "timers": len(self.timers.timers) if self.timers else 0,
+                    "adapters": self.shard.report() if self.shard else [],
+                    "students": len(self.schedule.students) if self.schedule else 0}
+        if op in ("timer", "cancel") and self.timers is None:
+            return {"ok": False, "error": "TimerManager 없음"}
+        if op == "timer":
+            members, tags = req.get("members") or [], req.get("tags") or []
+            if members:
+                self.timers.add_many(members, int(req["minutes"]), group=req.get("name"), tags=tags)
+            else:
+                self.timers.add_timer(req["name"], int(req["minutes"]), tags)
+            return {"ok": True}
+        if op == "cancel":
+            if req.get("tag"):
+                self.timers.cancel_tag(req["tag"])
+            else:
+                self.timers.cancel_timer(req["name"])
+            return {"ok": True}
+        return {"ok": False, "error": f"알 수 없는 op: {op}"}
+
+    async def close(self):
+        if self.schedule is not None:
+            self.schedule.stop()
+        for task in self._tasks:
+            task.cancel()
+        if self.timers is not None:
+            await self.timers.close()
+        for server in (self.server, self.feed_server):
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+        for link in self.links.values():
+            if isinstance(link, WatchLink):
+                await link.close()
+        if self.shard is not None:
+            await self.shard.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="시간표 알림 + 카운트다운 타이머 런타임 (워치 연결 하나)")
+    parser.add_argument("schedule", nargs="?", help="시간표 파일 (json/csv/toml, 수정하면 자동 반영)")
+    parser.add_argument("--address", default=DEVICE_ADDRESS, help="워치 MAC 주소")
+    parser.add_argument("--interval", type=int, default=30, help="시간표 체크 간격(초)")
+    parser.add_argument("--adapters", help="워치를 나눠 배치할 어댑터 (쉼표 구분, auto: 자동 검색)")
+    parser.add_argument("--processes", action="store_true", help="어댑터마다 워커 프로세스 (--adapters와 함께)")
+    args = parser.parse_args()
+
+    from loop_watchdog import install_watchdog
+
+    setup_logging()
+    watchdog = install_watchdog()
+    try:
+        shard = None
+        if args.adapters:
+            shard = ShardedNotifier(None if args.adapters == "auto" else args.adapters.split(','), args.processes)
+        runtime = await TimerRuntime(shard=shard).start()
+        if runtime.remote:
+            log.warning("⚠️ 이미 런타임이 실행 중 - 종료")
+            return
+        await _host(runtime, args)
+    finally:
+        watchdog.stop()  # 어느 경로로 끝나도 감시 스레드/프로파일러 정지
+        log.info(watchdog.report())
+
+
+async def _host(runtime: TimerRuntime, args):
+    """두 스케줄러 + 피드 + 업로더를 올리고 시간표 태스크가 끝날 때까지 (끝나면 런타임 정리)"""
+    from alert_bus import default_bus
+    from attendance_outbox import Outbox, start_uploader
+    from dedup_store import open_store
+    from timer_core import StudentTimer, TimerManager, print_now, print_status
+
+    outbox, dedup = Outbox(), open_store()
+    link = runtime.link(args.address)
+    bus = default_bus(link, dedup=dedup)  # 두 스케줄러가 같은 싱크들을 씀
+    watch_task = upload_task = None
+    try:
+        timer = StudentTimer(link, outbox=outbox, dedup=dedup, bus=bus)
+        if args.schedule:
+            timer.load_schedule(args.schedule)
+        runtime.host_timers(TimerManager(link, outbox=outbox, dedup=dedup, bus=bus))
+        print_status(timer)
+        print_now(timer)
+
+        schedule_task = runtime.host_schedule(timer, args.interval)
+        await runtime.host_feed(timer, outbox)
+        watch_task = asyncio.create_task(timer.watch_schedule(args.schedule)) if args.schedule else None
+        upload_task = start_uploader(outbox)
+        await schedule_task
+    finally:
+        for task in (watch_task, upload_task):
+            if task:
+                task.cancel()
+        await runtime.close()
+        log.info(TRACKER.report())
+        log.info(bus.report())
+        if runtime.feed is not None:
+            log.info(runtime.feed.report())
+
+if __name__ == "__main__":
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(main())
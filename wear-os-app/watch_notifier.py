@@ -0,0 +1,104 @@
+"""
+P5S 워치 알림 전송 (연결 하나)
+- connect_cached로 연결 (GATT 캐시, MTU별 프레임 레이아웃, 표시 속도 보정값)
+- 끊기면 재연결 후 확인된 패킷 다음부터 이어서 (frame_transfer)
+- 표시 속도에 맞춰 보내는 흐름 제어 (display_rate, P5S_FLOW=off로 끔)
+- 전송 시간을 도착 지연 추정에 기록 (delivery_latency)
+
+런타임(timer_runtime.WatchLink)이 이것을 감싸서 감독/큐잉, 워커 프로세스(watch_shard)도 이것을 씀
+"""
+import logging
+import time
+from typing import Optional
+
+from bleak import BleakClient
+
+from delivery_latency import TRACKER
+from display_rate import FlowControl, flow_enabled
+from frame_layout import LEGACY, FrameLayout, build_frame, encode_message
+from frame_transfer import transfer_frame
+from gatt_cache import GattLink, connect_cached
+
+log = logging.getLogger("p5s.watch")
+
+
+class WatchNotifier:
+    """P5S 워치 알림 전송"""
+
+    def __init__(self, address: str, adapter: Optional[str] = None, client_factory=None):
+        self.address = address
+        self.adapter = adapter  # BlueZ 컨트롤러 (hci0, hci1, ...) - None이면 기본값
+        self.client_factory = client_factory  # 주소 -> BleakClient 대용 (soak.py의 가상 워치)
+        self.client: Optional[BleakClient] = None
+        self.link: Optional[GattLink] = None  # 연결별 ff02/ff03 특성 객체
+        self.connected = False
+        self.pacer = FlowControl() if flow_enabled() else None  # 워치가 놓치지 않는 속도로만 보냄
+
+    async def connect(self):
+        """워치 연결"""
+        if self.connected:
+            return True
+
+        await self._release()
+        try:
+            log.info(f"🔗 워치 연결 중... ({self.address}{f' @ {self.adapter}' if self.adapter else ''})")
+            self.link = await connect_cached(self.address, adapter=self.adapter, factory=self.client_factory)
+            self.client = self.link.client
+            self.connected = True
+            if self.pacer is not None:
+                self.pacer.configure(self.link.display)
+            log.info("  ✅ 워치 연결됨!", extra={"event": "connect", "address": self.address})
+            return True
+        except Exception as e:
+            log.warning(f"  ❌ 연결 실패: {e}", extra={"event": "connect_failed", "address": self.address})
+            self.connected = False
+            return False
+
+    async def disconnect(self):
+        """연결 해제"""
+        if self.client and self.connected:
+            await self.client.disconnect()
+            self.connected = False
+
+    async def _release(self):
+        """끊긴 이전 client 정리 (재연결마다 새 client를 만들므로 백엔드 자원/콜백이 남지 않게)"""
+        client, self.client, self.link = self.client, None, None
+        if client is not None:
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+
+    def build_packet(self, message: str, notify_type: int = 255, layout: FrameLayout = LEGACY) -> list[bytes]:
+        """알림 패킷 생성 (layout: 연결된 링크의 MTU에 맞춘 패킷 크기)"""
+        return build_frame(message, notify_type, layout)
+
+    def packet_count(self, message: str) -> int:
+        """지금 연결의 레이아웃으로 보낼 때 패킷 수 (지연 추정용)"""
+        return len(self.build_packet(message, layout=self.link.layout if self.link else LEGACY))
+
+    async def send_notification(self, message: str) -> bool:
+        """알림 전송 (끊기면 재연결 후 확인된 패킷 다음부터 이어서, 표시 속도에 맞춰 대기)"""
+        if self.pacer is not None:
+            await self.pacer.wait()
+        link = self.link
+        connected = self.connected
+        started = time.perf_counter()
+        transfer = await transfer_frame(self, lambda layout: self.build_packet(message, layout=layout))
+        if self.pacer is not None:
+            self.pacer.sent()
+        if transfer.delivered:
+            # 전송 시작 ~ 마지막 패킷 확인까지 (연결 상태/패킷 수별 지연 추정에 사용)
+            TRACKER.record(self.address, connected, len(transfer.packets), time.perf_counter() - started)
+            log.info(f"  📤 알림 전송: {message}", extra={
+                "event": "sent", "address": self.address, "packets": len(transfer.packets),
+                "legacy_packets": LEGACY.packet_count(len(encode_message(message)))})
+            if self.link is not link:  # 이번 전송 중에 새로 연결됨
+                log.info(f"  ⏱️ {self.link.timing_str()}")
+        else:
+            log.warning(f"  ❌ 전송 실패: {transfer.error}", extra={"event": "send_failed", "address": self.address})
+        if transfer.attempts > 1:
+            log.info(f"  🔁 {transfer.summary()}", extra={"event": "retry", "attempts": transfer.attempts})
+        return transfer.delivered
+
+    send = send_notification
@@ -0,0 +1,383 @@
+"""
+여러 BLE 어댑터(hci0, hci1, ...)에 워치 연결 분산
+- 컨트롤러 하나는 동시 LE 연결 수가 적고 연결 설정을 직렬로 처리함
+- 배치 정책: 연결 수가 적고 최근 지연이 짧은 어댑터에 새 워치 배정
+- 옵션: 어댑터마다 별도 워커 프로세스 (한 컨트롤러가 멈춰도 다른 어댑터는 정상)
+- 어댑터별 연결 수 / 전송 수 / 실패 / 지연(EWMA, 최대) 리포트
+
+사용법: python watch_shard.py [--adapters hci0,hci1] [--processes] <MAC> [<MAC> ...] -m <메시지>
+"""
+import argparse
+import asyncio
+import glob
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from log_pipeline import setup_logging
+
+# 지연 EWMA 가중치 (최근 값 비중)
+LATENCY_ALPHA = 0.3
+# 워커 프로세스 응답 제한 (초) - 넘으면 그 어댑터는 멈춘 것으로 보고 재시작
+WORKER_TIMEOUT = 30.0
+PUMP_POLL = 0.5   # 응답 스레드가 재시작/종료를 확인하는 간격 (초)
+
+log = logging.getLogger("p5s.shard")
+
+
+def list_adapters() -> list[str]:
+    """로컬 BlueZ 컨트롤러 목록 (리눅스 외에는 기본 어댑터 하나)"""
+    found = sorted(os.path.basename(p) for p in glob.glob("/sys/class/bluetooth/hci*"))
+    return [name for name in found if ':' not in name] or ["hci0"]
+
+
+def default_notifier(address: str, adapter: Optional[str]):
+    """기본 notifier: watch_notifier.WatchNotifier (워커 프로세스에서도 import 가능)"""
+    from watch_notifier import WatchNotifier
+    return WatchNotifier(address, adapter=adapter)
+
+
+@dataclass
+class AdapterStats:
+    """어댑터별 부하/지연"""
+    name: str
+    watches: int = 0          # 배정된 워치 수
+    connected: int = 0        # 현재 연결된 워치 수
+    sends: int = 0
+    failures: int = 0
+    latency_ewma: float = 0.0  # 초
+    latency_max: float = 0.0
+
+    def record(self, ok: bool, latency: float):
+        self.sends += 1
+        if not ok:
+            self.failures += 1
+        self.latency_ewma = latency if self.sends == 1 else (
+            LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency_ewma)
+        self.latency_max = max(self.latency_max, latency)
+
+
+class PlacementPolicy:
+    """연결 수 우선, 같으면 관측 지연이 짧은 어댑터"""
+
+    def __init__(self, latency_weight: float = 1.0):
+        # 지연 1초 = 워치 latency_weight개 만큼의 부하로 취급
+        self.latency_weight = latency_weight
+
+    def score(self, stats: AdapterStats) -> float:
+        return stats.watches + stats.latency_ewma * self.latency_weight
+
+    def choose(self, adapters: list[AdapterStats]) -> AdapterStats:
+        return min(adapters, key=self.score)
+
+
+class _InProcessAdapter:
+    """같은 이벤트 루프에서 notifier를 직접 실행"""
+
+    def __init__(self, name: str, factory: Callable):
+        self.name = name
+        self.factory = factory
+        self.notifiers = {}
+
+    def _notifier(self, address: str):
+        notifier = self.notifiers.get(address)
+        if notifier is None:
+            notifier = self.notifiers[address] = self.factory(address, self.name)
+        return notifier
+
+    def _connected(self) -> int:
+        return sum(bool(n.connected) for n in self.notifiers.values())
+
+    async def connect(self, address: str) -> tuple[bool, int]:
+        ok = await self._notifier(address).connect()
+        return bool(ok), self._connected()
+
+    async def send(self, address: str, message: str) -> tuple[bool, int]:
+        ok = await self._notifier(address).send_notification(message)
+        return ok, self._connected()
+
+    def is_connected(self, address: str) -> bool:
+        notifier = self.notifiers.get(address)
+        return bool(notifier is not None and notifier.connected)
+
+    async def release(self, address: str):
+        notifier = self.notifiers.pop(address, None)
+        if notifier:
+            await notifier.disconnect()
+
+    async def close(self):
+        for address in list(self.notifiers):
+            await self.release(address)
+
+
+def _worker_main(name: str, factory: Callable, requests, responses):
+    """워커 프로세스: 어댑터 하나의 notifier들을 자체 이벤트 루프에서 실행"""
+    setup_logging()  # 워커도 로그는 자체 리스너 스레드로
+    adapter = _InProcessAdapter(name, factory)
+
+    async def serve():
+        loop = asyncio.get_running_loop()
+        while True:
+            req_id, op, address, message = await loop.run_in_executor(None, requests.get)
+            if op == "stop":
+                await adapter.close()
+                return
+            if op == "release":
+                await adapter.release(address)
+                responses.put((req_id, True, 0, False))
+                continue
+            try:
+                if op == "connect":
+                    ok, connected = await adapter.connect(address)
+                else:
+                    ok, connected = await adapter.send(address, message)
+            except Exception:
+                ok, connected = False, 0
+            responses.put((req_id, ok, connected, adapter.is_connected(address)))
+
+    asyncio.run(serve())
+
+
+class _ProcessAdapter:
+    """어댑터 전용 워커 프로세스 (멈추면 타임아웃 후 재시작)"""
+
+    def __init__(self, name: str, factory: Callable):
+        self.name = name
+        self.factory = factory
+        self.restarts = 0
+        self.watch_connected: dict[str, bool] = {}  # 워커가 마지막으로 알려 준 워치별 연결 상태
+        self._ids = iter(range(1, 1 << 62))
+        self._pending: dict[int, asyncio.Future] = {}
+        self._restarting: Optional[asyncio.Task] = None
+        self._start()
+
+    def _start(self):
+        ctx = multiprocessing.get_context("spawn")
+        self.requests = ctx.Queue()
+        self.responses = ctx.Queue()
+        self.process = ctx.Process(target=_worker_main, daemon=True, name=f"watch-{self.name}",
+                                   args=(self.name, self.factory, self.requests, self.responses))
+        self.process.start()
+        self._loop = asyncio.get_running_loop()
+        self._stopped = threading.Event()
+        self._pump_thread = threading.Thread(target=self._pump, args=(self.responses, self._stopped),
+                                             daemon=True, name=f"watch-{self.name}-pump")
+        self._pump_thread.start()
+
+    def _pump(self, responses, stopped: threading.Event):
+        """응답 큐 -> 이벤트 루프의 future (재시작되면 stopped가 켜지고 끝남)"""
+        while not stopped.is_set():
+            try:
+                req_id, ok, connected, watch = responses.get(timeout=PUMP_POLL)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError, ValueError):
+                return
+            self._loop.call_soon_threadsafe(self._resolve, req_id, (ok, connected, watch))
+
+    def _resolve(self, req_id: int, result):
+        future = self._pending.pop(req_id, None)
+        if future and not future.done():
+            future.set_result(result)
+
+    def _fail_pending(self):
+        """기다리던 요청은 전부 실패로 끝냄 (각자 타임아웃 나서 새 워커를 또 죽이지 않게)"""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_result((False, 0, False))
+        self.watch_connected.clear()
+        return len(pending)
+
+    async def _restart(self):
+        """멈춘 워커 교체: 옛 프로세스/응답 스레드/큐를 정리한 뒤 새로 시작"""
+        process, pump, stopped = self.process, self._pump_thread, self._stopped
+        old_queues = (self.requests, self.responses)
+        stopped.set()
+        process.kill()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, process.join)
+        await loop.run_in_executor(None, pump.join)
+        for q in old_queues:
+            q.close()
+            q.cancel_join_thread()  # 죽은 워커로 못 보낸 요청은 버림
+        process.close()
+        self._start()
+
+    async def _call(self, op: str, address: str, message: str = ""):
+        if self._restarting is not None:
+            await asyncio.shield(self._restarting)
+        req_id = next(self._ids)
+        future = self._pending[req_id] = self._loop.create_future()
+        self.requests.put((req_id, op, address, message))
+        try:
+            ok, connected, watch = await asyncio.wait_for(asyncio.shield(future), WORKER_TIMEOUT)
+        except asyncio.TimeoutError:
+            # 같은 순간에 타임아웃 난 요청이 여럿이어도 재시작은 한 번
+            if self._restarting is None and self._pending.get(req_id) is future:
+                failed = self._fail_pending()
+                self.restarts += 1
+                log.warning(f"  ⚠️ {self.name} 응답 없음 -> 워커 재시작 (대기 중 요청 {failed}개 실패 처리)",
+                            extra={"event": "worker_restart", "adapter": self.name})
+                self._restarting = asyncio.create_task(self._restart())
+                self._restarting.add_done_callback(lambda _: setattr(self, "_restarting", None))
+            if self._restarting is not None:
+                await asyncio.shield(self._restarting)
+            return False, 0
+        self.watch_connected[address] = watch
+        return ok, connected
+
+    async def connect(self, address: str) -> tuple[bool, int]:
+        return await self._call("connect", address)
+
+    async def send(self, address: str, message: str) -> tuple[bool, int]:
+        return await self._call("send", address, message)
+
+    async def release(self, address: str):
+        await self._call("release", address)
+        self.watch_connected.pop(address, None)
+
+    def is_connected(self, address: str) -> bool:
+        return self.watch_connected.get(address, False)
+
+    async def close(self):
+        self.requests.put((0, "stop", "", ""))
+        await asyncio.get_running_loop().run_in_executor(None, self.process.join, 5)
+        if self.process.is_alive():
+            self.process.kill()
+        self._stopped.set()
+
+
+class ShardedNotifier:
+    """여러 어댑터에 워치를 나눠 배치하고 전송"""
+
+    def __init__(self, adapters: Optional[list[str]] = None, processes: bool = False,
+                 policy: Optional[PlacementPolicy] = None, factory: Callable = default_notifier):
+        self.adapter_names = adapters or list_adapters()
+        self.processes = processes
+        self.policy = policy or PlacementPolicy()
+        self.factory = factory
+        self.stats = {name: AdapterStats(name) for name in self.adapter_names}
+        self.placement: dict[str, str] = {}  # 워치 주소 -> 어댑터
+        self._backends = {}
+
+    def _backend(self, name: str):
+        backend = self._backends.get(name)
+        if backend is None:
+            cls = _ProcessAdapter if self.processes else _InProcessAdapter
+            backend = self._backends[name] = cls(name, self.factory)
+        return backend
+
+    def place(self, address: str) -> str:
+        """워치 주소 -> 어댑터 (처음 보는 워치만 정책으로 배정)"""
+        name = self.placement.get(address)
+        if name is None:
+            stats = self.policy.choose(list(self.stats.values()))
+            stats.watches += 1
+            name = self.placement[address] = stats.name
+        return name
+
+    async def move(self, address: str):
+        """워치를 현재 어댑터에서 빼고 다시 배정 (연속 실패 시)"""
+        name = self.placement.pop(address, None)
+        if name:
+            self.stats[name].watches -= 1
+            await self._backend(name).release(address)
+
+    async def connect(self, address: str) -> bool:
+        """배정된 어댑터에서 워치 연결 (WatchLink 감독자가 재연결할 때)"""
+        name = self.place(address)
+        ok, self.stats[name].connected = await self._backend(name).connect(address)
+        if not ok and len(self.stats) > 1:
+            await self.move(address)
+        return ok
+
+    async def send(self, address: str, message: str) -> bool:
+        name = self.place(address)
+        stats = self.stats[name]
+        start = time.perf_counter()
+        ok, connected = await self._backend(name).send(address, message)
+        stats.record(ok, time.perf_counter() - start)
+        stats.connected = connected
+        if not ok and len(self.stats) > 1:
+            await self.move(address)  # 다음 전송은 다른 어댑터로 배정될 수 있음
+        return ok
+
+    def is_connected(self, address: str) -> bool:
+        """워커가 알려 준 이 워치의 실제 연결 상태 (배정 전이면 False)"""
+        name = self.placement.get(address)
+        return name is not None and name in self._backends and self._backends[name].is_connected(address)
+
+    def for_watch(self, address: str) -> "_WatchHandle":
+        """StudentTimer/TimerManager에 넣을 수 있는 워치 하나용 notifier"""
+        return _WatchHandle(self, address)
+
+    def report(self) -> list[dict]:
+        return [vars(s).copy() for s in self.stats.values()]
+
+    def print_report(self):
+        print("\n" + "=" * 60)
+        print("📡 어댑터별 부하")
+        print("-" * 60)
+        for s in self.stats.values():
+            print(f"  {s.name}: 워치 {s.watches} / 연결 {s.connected} / 전송 {s.sends}"
+                  f" (실패 {s.failures}) / 지연 {s.latency_ewma * 1000:.0f}ms"
+                  f" (최대 {s.latency_max * 1000:.0f}ms)")
+        print("=" * 60)
+
+    async def close(self):
+        for backend in self._backends.values():
+            await backend.close()
+
+
+class _WatchHandle:
+    """ShardedNotifier의 워치 하나 (WatchNotifier와 같은 인터페이스)"""
+
+    def __init__(self, shard: ShardedNotifier, address: str):
+        self.shard = shard
+        self.address = address
+
+    @property
+    def connected(self) -> bool:
+        return self.shard.is_connected(self.address)
+
+    @connected.setter
+    def connected(self, _value: bool):
+        pass  # WatchLink가 끊김으로 표시해도 실제 상태는 워커가 알려 준 값
+
+    async def connect(self):
+        return await self.shard.connect(self.address)
+
+    async def disconnect(self):
+        await self.shard.move(self.address)
+
+    async def send(self, message: str) -> bool:
+        return await self.shard.send(self.address, message)
+
+    send_notification = send
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="여러 어댑터로 워치 알림 분산 전송")
+    parser.add_argument("addresses", nargs="+", help="워치 MAC 주소")
+    parser.add_argument("-m", "--message", default="테스트 알림!")
+    parser.add_argument("--adapters", help="쉼표 구분 (기본: 자동 검색)")
+    parser.add_argument("--processes", action="store_true", help="어댑터마다 워커 프로세스")
+    args = parser.parse_args()
+
+    setup_logging()
+    shard = ShardedNotifier(args.adapters.split(',') if args.adapters else None, args.processes)
+    results = await asyncio.gather(*(shard.send(a, args.message) for a in args.addresses))
+    for address, ok in zip(args.addresses, results):
+        print(f"  {'✅' if ok else '❌'} {address} @ {shard.placement.get(address, '-')}")
+    shard.print_report()
+    await shard.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())